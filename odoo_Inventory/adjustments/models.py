@@ -1,10 +1,11 @@
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from products.models import Product
 from warehouse.models import Location, StockQuant
 from stock_ledger.models import StockMovement
+from monitoring.metrics import timed_validation
 
 
 class AdjustmentEntry(models.Model):
@@ -68,6 +69,8 @@ class AdjustmentEntry(models.Model):
             self.adjustment_quantity = self.counted_quantity - self.system_quantity
         super().save(*args, **kwargs)
     
+    @timed_validation('ADJUSTMENT')
+    @transaction.atomic
     def validate(self, user):
         """Validate adjustment and create stock movement"""
         if self.status == 'DONE':
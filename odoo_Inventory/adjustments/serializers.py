@@ -23,6 +23,7 @@ class AdjustmentEntrySerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'validated_at'
         ]
         read_only_fields = ['id', 'adjustment_quantity', 'created_at', 'updated_at', 'validated_at', 'validated_by']
+        expandable_fields = {'location': LocationSerializer}
 
 
 class AdjustmentCreateSerializer(serializers.ModelSerializer):
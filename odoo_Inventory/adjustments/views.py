@@ -2,16 +2,16 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from idempotency.decorators import idempotent
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
 from .models import AdjustmentEntry
 from .serializers import AdjustmentEntrySerializer, AdjustmentCreateSerializer
 
 
-class AdjustmentEntryViewSet(viewsets.ModelViewSet):
+class AdjustmentEntryViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for AdjustmentEntry model"""
     
-    queryset = AdjustmentEntry.objects.select_related(
-        'location', 'product', 'created_by', 'validated_by'
-    ).all()
+    queryset = AdjustmentEntry.objects.all()
     serializer_class = AdjustmentEntrySerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'location', 'product', 'reason', 'created_by']
@@ -24,10 +24,15 @@ class AdjustmentEntryViewSet(viewsets.ModelViewSet):
             return AdjustmentCreateSerializer
         return AdjustmentEntrySerializer
     
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def validate_adjustment(self, request, pk=None):
         """Validate adjustment and create stock movement"""
         adjustment = self.get_object()
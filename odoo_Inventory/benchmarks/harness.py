@@ -0,0 +1,62 @@
+import json
+import time
+from pathlib import Path
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+BASELINES_PATH = Path(__file__).resolve().parent / 'baselines.json'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def run_scenario(client, user, scenario, repeat=1, warmup=True):
+    """Call one scenario repeat times and return its query count and latencies.
+
+    The query count is the maximum seen across runs, so budgets hold for
+    every call rather than on average.
+    """
+    method, target = scenario
+    call = getattr(client, method)
+
+    if warmup and method == 'get':
+        url = target(user) if callable(target) else target
+        call(url)
+
+    latencies = []
+    queries = 0
+    for _ in range(repeat):
+        url = target(user) if callable(target) else target
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = call(url)
+            elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            raise AssertionError(f"{method.upper()} {url} returned {response.status_code}: {response.content[:200]!r}")
+        latencies.append(elapsed * 1000)
+        queries = max(queries, len(captured.captured_queries))
+
+    return {
+        'queries': queries,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+    }
+
+
+def load_baselines():
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH) as fh:
+        return json.load(fh)
+
+
+def save_baselines(baselines):
+    with open(BASELINES_PATH, 'w') as fh:
+        json.dump(baselines, fh, indent=2, sort_keys=True)
+        fh.write('\n')
@@ -0,0 +1,89 @@
+"""
+Management command to compare JSON rendering and parsing throughput
+Run with: python manage.py benchmark_json --rows 10000
+"""
+import io
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from odoo_Inventory import fast_json
+from odoo_Inventory.fast_json import FastJSONRenderer, FastJSONParser
+from benchmarks.harness import percentile
+
+
+def movement_rows(count):
+    """Rows shaped like a /api/movements/ page, plus raw Decimal and datetime values"""
+    now = timezone.now()
+    return [
+        {
+            'id': i,
+            'movement_type': 'RECEIPT',
+            'product': i % 500,
+            'product_sku': f'LD-{i % 500:07d}',
+            'product_name': f'Load Product {i % 500}',
+            'quantity': f'{i % 97}.250',
+            'source_location': None,
+            'source_location_code': None,
+            'destination_location': i % 20,
+            'destination_location_code': f'BIN-{i % 20:03d}',
+            'document_reference': f'WH/IN/{i:06d}',
+            'document_type': 'RECEIPT',
+            'created_by': 1,
+            'created_by_username': 'loader',
+            'notes': 'Receipt from Load Supplier – cold room',
+            'created_at': (now - timedelta(minutes=i)).isoformat(),
+            'unit_value': Decimal(i) / Decimal('7.000'),
+            'posted_at': now - timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compare DRF JSONRenderer/JSONParser with the orjson-based FastJSONRenderer/FastJSONParser'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if fast_json.orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; the fast classes fall back to the stdlib'))
+
+        payload = {'count': options['rows'], 'next': None, 'previous': None, 'results': movement_rows(options['rows'])}
+        implementations = {
+            'drf': (JSONRenderer(), JSONParser()),
+            'fast': (FastJSONRenderer(), FastJSONParser()),
+        }
+        results = {label: {'render': [], 'parse': []} for label in implementations}
+        outputs = {}
+        # Alternate implementations so warm-up and noise affect both equally
+        for _ in range(options['repeat']):
+            for label, (renderer, parser) in implementations.items():
+                started = time.perf_counter()
+                content = renderer.render(payload)
+                results[label]['render'].append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                parser.parse(io.BytesIO(content))
+                results[label]['parse'].append((time.perf_counter() - started) * 1000)
+                outputs[label] = content
+
+        if outputs['drf'] != outputs['fast']:
+            raise AssertionError('FastJSONRenderer output differs from JSONRenderer')
+
+        size_mb = len(outputs['drf']) / 1024 / 1024
+        self.stdout.write(f"{options['rows']} rows, {size_mb:.2f} MB per payload")
+        self.stdout.write(f"{'impl':<6}{'step':<8}{'p50 ms':>10}{'p95 ms':>10}{'MB/s':>10}{'rows/s':>12}")
+        for label, steps in results.items():
+            for step, values in steps.items():
+                p50 = percentile(values, 50)
+                self.stdout.write(
+                    f"{label:<6}{step:<8}{p50:>10.2f}{percentile(values, 95):>10.2f}"
+                    f"{size_mb / (p50 / 1000):>10.1f}{options['rows'] / (p50 / 1000):>12.0f}"
+                )
+        speedup = percentile(results['drf']['render'], 50) / percentile(results['fast']['render'], 50)
+        self.stdout.write(self.style.SUCCESS(f'✓ Identical output; fast renderer is {speedup:.1f}x faster'))
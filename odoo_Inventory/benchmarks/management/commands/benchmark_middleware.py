@@ -0,0 +1,69 @@
+"""
+Management command to measure middleware overhead of token-authenticated API calls
+Run with: python manage.py benchmark_middleware --repeat 500
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from rest_framework.authtoken.models import Token
+from users.models import User
+from benchmarks.harness import percentile
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request overhead of token API calls with the full and the lean middleware stack'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=300)
+        parser.add_argument('--url', default='/api/users/me/', help='Cheap endpoint so middleware cost dominates')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(username='bench', password='bench12345', role='ADMIN')
+            token = Token.objects.create(user=user)
+
+            clients = {}
+            for label, lean in (('full stack', False), ('lean stack', True)):
+                with override_settings(LEAN_API_MIDDLEWARE=lean):
+                    # The middleware chain is built on the first request, under the overridden setting
+                    clients[label] = Client(HTTP_AUTHORIZATION=f'Token {token.key}')
+                    clients[label].get(options['url'])
+            results = self.measure(clients, options['url'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'stack':<14}{'queries':>9}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+        for label, result in results.items():
+            self.stdout.write(
+                f"{label:<14}{result['queries']:>9}{result['p50_ms']:>10}{result['p95_ms']:>10}{result['mean_ms']:>10}"
+            )
+        saved = results['full stack']['mean_ms'] - results['lean stack']['mean_ms']
+        self.stdout.write(self.style.SUCCESS(f'✓ Lean stack saves {saved:.3f} ms per request on average'))
+
+    def measure(self, clients, url, repeat):
+        """Alternate between the stacks so warm-up and noise affect both equally"""
+        latencies = {label: [] for label in clients}
+        queries = {label: 0 for label in clients}
+        for _ in range(repeat):
+            for label, client in clients.items():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    latencies[label].append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    raise AssertionError(f"GET {url} returned {response.status_code}")
+                queries[label] = max(queries[label], len(captured.captured_queries))
+        return {
+            label: {
+                'queries': queries[label],
+                'p50_ms': round(percentile(values, 50), 3),
+                'p95_ms': round(percentile(values, 95), 3),
+                'mean_ms': round(sum(values) / len(values), 3),
+            }
+            for label, values in latencies.items()
+        }
@@ -0,0 +1,271 @@
+"""
+Management command to hammer validate() concurrently on shared stock quants
+Run with: python manage.py load_test_validation --threads 8 --duration 30
+
+It writes real documents and stock, so it refuses to run unless DEBUG is on
+or --i-know-this-writes is passed, and it removes everything it posted when
+it finishes.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from decimal import Decimal
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, close_old_connections, transaction
+from users.models import User
+from products.models import Product
+from warehouse.models import Location
+from receipts.models import Receipt, ReceiptLine
+from deliveries.models import DeliveryOrder, DeliveryLine
+from transfers.models import TransferOrder, TransferLine
+from stock_ledger.models import StockMovement
+from stock_ledger.reconcile import find_change_mismatches, ledger_totals, quant_totals
+from warehouse.models import StockQuant
+
+
+PREFIX = 'LT'
+
+
+class Stats:
+    """Counters shared by all worker threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.validated = {'RECEIPT': 0, 'DELIVERY': 0, 'TRANSFER': 0}
+        self.rejected = 0
+        self.errors = []
+        self.validate_seconds = 0.0
+        self.lock_wait_seconds = None
+
+    def record(self, kind, elapsed):
+        with self.lock:
+            self.validated[kind] += 1
+            self.validate_seconds += elapsed
+
+
+class Command(BaseCommand):
+    help = 'Run concurrent receipts, deliveries and transfers against shared quants and check the ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=20.0, help='Seconds to run')
+        parser.add_argument('--products', type=int, default=5, help='Number of shared hot products')
+        parser.add_argument('--lines', type=int, default=3, help='Lines per document')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--i-know-this-writes', action='store_true',
+            help='Allow running with DEBUG off; documents and stock are written to the configured database'
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep the documents and stock changes of the run')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['i_know_this_writes']:
+            raise CommandError(
+                'This creates and validates real documents. Run it with DEBUG=True '
+                'or pass --i-know-this-writes'
+            )
+        user = User.objects.filter(is_active=True).order_by('id').first()
+        products = list(Product.objects.filter(is_active=True).order_by('id')[:options['products']])
+        locations = list(Location.objects.filter(is_active=True).order_by('id')[:2])
+        if not user or len(products) < options['lines'] or len(locations) < 2:
+            raise CommandError('Need a user, enough products and two locations (run load_sample_data first)')
+
+        self.user = user
+        self.products = products
+        self.locations = locations
+        self.options = options
+        self.run_id = f"{PREFIX}{int(time.time())}"
+        self.tag = f"load_test_validation run {self.run_id}"
+        self.counter = 0
+        self.counter_lock = threading.Lock()
+        stats = Stats()
+        # The run is checked against what changed from here, not all-time totals
+        self.product_ids = [p.pk for p in products]
+        self.quants_before = quant_totals(self.product_ids)
+        self.ledger_before = ledger_totals(self.product_ids)
+        # Quants the run creates are deleted again by cleanup()
+        self.existing_quants = set(StockQuant.objects.filter(
+            product__in=products, location__in=locations
+        ).values_list('product_id', 'location_id'))
+
+        try:
+            mismatches = self.run(stats)
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+        if mismatches:
+            raise CommandError(f'Ledger and quant changes disagree for {len(mismatches)} product/location pairs')
+        self.stdout.write(self.style.SUCCESS('✓ Ledger matches stock quants'))
+
+    def run(self, stats):
+        """Seed stock, run the workers and return where the quant and ledger changes disagree"""
+        options = self.options
+        products = self.products
+        locations = self.locations
+
+        # Seed stock so deliveries and transfers have something to consume
+        self.make_receipt(random.Random(options['seed']), quantity=Decimal('1000')).validate(self.user)
+        connection.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Running {options['threads']} threads for {options['duration']}s on "
+            f"{len(products)} products at {locations[0].code} / {locations[1].code}"
+        ))
+
+        stop = threading.Event()
+        monitor = threading.Thread(target=self.monitor_locks, args=(stop, stats))
+        monitor.start()
+        deadline = time.monotonic() + options['duration']
+        workers = [
+            threading.Thread(target=self.worker, args=(options['seed'] + i, deadline, stats))
+            for i in range(options['threads'])
+        ]
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.monotonic() - started
+        stop.set()
+        monitor.join()
+
+        self.report(stats, elapsed)
+
+        mismatches = find_change_mismatches(self.quants_before, self.ledger_before, self.product_ids)
+        for mismatch in mismatches[:20]:
+            self.stdout.write(self.style.ERROR(f"  {mismatch}"))
+        return mismatches
+
+    def cleanup(self):
+        """Reverse the stock the run posted, then delete its movements and documents"""
+        prefix = f"{self.run_id}-"
+        movements = StockMovement.objects.filter(document_reference__startswith=prefix)
+        net = defaultdict(Decimal)
+        for product_id, source_id, destination_id, quantity in movements.values_list(
+            'product_id', 'source_location_id', 'destination_location_id', 'quantity'
+        ):
+            if destination_id:
+                net[(product_id, destination_id)] += quantity
+            if source_id:
+                net[(product_id, source_id)] -= quantity
+
+        documents = [
+            Receipt.objects.filter(receipt_number__startswith=prefix),
+            DeliveryOrder.objects.filter(delivery_number__startswith=prefix),
+            TransferOrder.objects.filter(transfer_number__startswith=prefix),
+        ]
+        with transaction.atomic():
+            # Saved one by one so sync clients and cached lists see the reversal
+            quants = StockQuant.objects.select_for_update().filter(
+                product__in=self.products, location__in=self.locations
+            )
+            for quant in quants:
+                if (quant.product_id, quant.location_id) not in self.existing_quants:
+                    quant.delete()
+                    continue
+                change = net.get((quant.product_id, quant.location_id))
+                if change:
+                    quant.update_quantity(-change)
+            removed_movements, _ = movements.delete()
+            removed_documents = 0
+            for queryset in documents:
+                removed_documents += queryset.count()
+                queryset.delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Removed {removed_documents} load test documents and {removed_movements} movements, stock restored'
+        ))
+
+    def next_number(self, kind):
+        with self.counter_lock:
+            self.counter += 1
+            return f"{self.run_id}-{kind}-{self.counter:06d}"
+
+    def make_receipt(self, rng, quantity=None):
+        receipt = Receipt.objects.create(
+            receipt_number=self.next_number('RCP'), supplier_name='Load Test', notes=self.tag,
+            destination_location=self.locations[0], created_by=self.user
+        )
+        for product in rng.sample(self.products, self.options['lines']) if quantity is None else self.products:
+            ReceiptLine.objects.create(receipt=receipt, product=product, quantity=quantity or rng.randint(5, 20))
+        return receipt
+
+    def make_delivery(self, rng):
+        delivery = DeliveryOrder.objects.create(
+            delivery_number=self.next_number('DEL'), customer_name='Load Test', notes=self.tag,
+            source_location=self.locations[0], created_by=self.user
+        )
+        for product in rng.sample(self.products, self.options['lines']):
+            DeliveryLine.objects.create(delivery=delivery, product=product, quantity=rng.randint(1, 10))
+        return delivery
+
+    def make_transfer(self, rng):
+        source, destination = rng.sample(self.locations, 2)
+        transfer = TransferOrder.objects.create(
+            transfer_number=self.next_number('TRF'), source_location=source, notes=self.tag,
+            destination_location=destination, created_by=self.user
+        )
+        for product in rng.sample(self.products, self.options['lines']):
+            TransferLine.objects.create(transfer=transfer, product=product, quantity=rng.randint(1, 10))
+        return transfer
+
+    def worker(self, seed, deadline, stats):
+        rng = random.Random(seed)
+        builders = {'RECEIPT': self.make_receipt, 'DELIVERY': self.make_delivery, 'TRANSFER': self.make_transfer}
+        try:
+            while time.monotonic() < deadline:
+                kind = rng.choice(list(builders))
+                try:
+                    document = builders[kind](rng)
+                    started = time.monotonic()
+                    document.validate(self.user)
+                    stats.record(kind, time.monotonic() - started)
+                except ValueError:
+                    # Insufficient stock is an expected business rejection
+                    with stats.lock:
+                        stats.rejected += 1
+                except Exception as e:
+                    with stats.lock:
+                        stats.errors.append(f"{kind}: {e}")
+        finally:
+            close_old_connections()
+            connection.close()
+
+    def monitor_locks(self, stop, stats, interval=0.01):
+        """Estimate lock-wait time by sampling backends blocked on locks (PostgreSQL only)"""
+        if connection.vendor != 'postgresql':
+            connection.close()
+            return
+        waited = 0.0
+        try:
+            with connection.cursor() as cursor:
+                while not stop.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND wait_event_type = 'Lock'"
+                    )
+                    waited += cursor.fetchone()[0] * interval
+                    time.sleep(interval)
+        finally:
+            connection.close()
+        stats.lock_wait_seconds = waited
+
+    def report(self, stats, elapsed):
+        total = sum(stats.validated.values())
+        self.stdout.write(f"Validated documents: {total} in {elapsed:.1f}s ({total / elapsed:.1f}/s)")
+        for kind, count in stats.validated.items():
+            self.stdout.write(f"  {kind:<9} {count}")
+        self.stdout.write(f"Rejected (insufficient stock): {stats.rejected}")
+        if total:
+            self.stdout.write(f"Mean validate() time: {stats.validate_seconds / total * 1000:.1f} ms")
+        if stats.lock_wait_seconds is None:
+            self.stdout.write('Lock wait: n/a (PostgreSQL only)')
+        else:
+            self.stdout.write(f"Lock wait (sampled): {stats.lock_wait_seconds:.2f}s "
+                              f"({stats.lock_wait_seconds / elapsed * 100:.1f}% of wall time)")
+        if stats.errors:
+            self.stdout.write(self.style.ERROR(f"Errors: {len(stats.errors)}"))
+            for error in stats.errors[:10]:
+                self.stdout.write(self.style.ERROR(f"  {error}"))
@@ -0,0 +1,75 @@
+"""
+Management command to benchmark hot API endpoints at several data scales
+Run with: python manage.py run_benchmarks --scales tiny,small --repeat 20
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.test import APIClient
+from users.models import User
+from benchmarks.harness import run_scenario, load_baselines, save_baselines
+from benchmarks.scenarios import SCALES, SCENARIOS, load_scale
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles and SQL query counts of hot endpoints in a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='tiny,small', help=f"Comma separated, from: {', '.join(SCALES)}")
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--only', help='Comma separated scenario names')
+        parser.add_argument('--update-baselines', action='store_true', help='Write results to benchmarks/baselines.json')
+
+    def handle(self, *args, **options):
+        scales = options['scales'].split(',')
+        unknown = [scale for scale in scales if scale not in SCALES]
+        if unknown:
+            raise CommandError(f"Unknown scales: {', '.join(unknown)}")
+        names = options['only'].split(',') if options['only'] else list(SCENARIOS)
+
+        baselines = load_baselines()
+        results = {}
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for scale in scales:
+                call_command('flush', interactive=False, verbosity=0)
+                self.stdout.write(self.style.SUCCESS(f'Loading {scale} scale: {SCALES[scale]}'))
+                load_scale(scale)
+                user = User.objects.create_user(username='bench', password='bench12345', role='ADMIN')
+                client = APIClient()
+                client.force_authenticate(user)
+
+                results[scale] = {}
+                for name in names:
+                    results[scale][name] = run_scenario(client, user, SCENARIOS[name], repeat=options['repeat'])
+                self.report(
+                    scale, results[scale], baselines.get('scales', {}).get(scale, {}),
+                    baselines.get('accepted_debt', {})
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['update_baselines']:
+            baselines.setdefault('scales', {})
+            for scale, scale_results in results.items():
+                baselines['scales'].setdefault(scale, {}).update(scale_results)
+            baselines['recorded_with'] = connection.vendor
+            save_baselines(baselines)
+            self.stdout.write(self.style.SUCCESS('✓ Baselines updated'))
+
+    def report(self, scale, results, baseline, debt):
+        self.stdout.write(f"{'scenario':<36}{'queries':>9}{'budget':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, result in results.items():
+            budget = baseline.get(name, {}).get('queries')
+            line = (f"{name:<36}{result['queries']:>9}{budget if budget is not None else '-':>8}"
+                    f"{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}")
+            if budget is not None and result['queries'] > budget:
+                self.stdout.write(self.style.ERROR(line + '  over budget'))
+            elif name in debt:
+                self.stdout.write(self.style.WARNING(line + '  accepted debt'))
+            else:
+                self.stdout.write(line)
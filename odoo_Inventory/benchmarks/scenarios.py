@@ -0,0 +1,112 @@
+"""
+Hot API endpoints measured by the benchmark suite and the data scales they run at
+"""
+import itertools
+from django.core.management import call_command
+from products.models import Product
+from warehouse.models import StockQuant
+from receipts.models import Receipt, ReceiptLine
+from deliveries.models import DeliveryOrder, DeliveryLine
+from transfers.models import TransferOrder, TransferLine
+from adjustments.models import AdjustmentEntry
+
+
+# generate_load_data arguments per scale. tiny keeps list pages below the
+# page size so per-row queries show up as growth between scales.
+SCALES = {
+    'tiny': {'products': 10, 'locations': 4, 'movements': 100, 'users': 2},
+    'small': {'products': 200, 'locations': 20, 'movements': 2000, 'users': 3},
+    'medium': {'products': 5000, 'locations': 200, 'movements': 100000, 'users': 10},
+}
+
+DOCUMENT_LINES = 5
+
+_sequence = itertools.count(1)
+
+
+def load_scale(scale):
+    call_command('generate_load_data', seed=42, verbosity=0, stdout=_Null(), **SCALES[scale])
+
+
+class _Null:
+    def write(self, *args, **kwargs):
+        pass
+
+    def flush(self):
+        pass
+
+
+def _stocked_location():
+    """Location holding the most products with stock, and those products"""
+    quant = StockQuant.objects.filter(quantity__gte=1).order_by('-quantity', 'id').first()
+    products = list(StockQuant.objects.filter(
+        location_id=quant.location_id, quantity__gte=1
+    ).order_by('product_id').values_list('product_id', flat=True)[:DOCUMENT_LINES])
+    return quant.location, products
+
+
+def _first_product():
+    return Product.objects.order_by('id').first()
+
+
+def prepare_receipt(user):
+    location, _ = _stocked_location()
+    receipt = Receipt.objects.create(
+        receipt_number=f'BENCH-RCP-{next(_sequence)}', supplier_name='Bench Supplier',
+        destination_location=location, created_by=user
+    )
+    for product in Product.objects.order_by('id')[:DOCUMENT_LINES]:
+        ReceiptLine.objects.create(receipt=receipt, product=product, quantity=5, unit_price=1)
+    return f'/api/receipts/{receipt.pk}/validate_receipt/'
+
+
+def prepare_delivery(user):
+    location, products = _stocked_location()
+    delivery = DeliveryOrder.objects.create(
+        delivery_number=f'BENCH-DEL-{next(_sequence)}', customer_name='Bench Customer',
+        source_location=location, created_by=user
+    )
+    for product_id in products:
+        DeliveryLine.objects.create(delivery=delivery, product_id=product_id, quantity=1, unit_price=1)
+    return f'/api/deliveries/{delivery.pk}/validate_delivery/'
+
+
+def prepare_transfer(user):
+    location, products = _stocked_location()
+    destination = StockQuant.objects.exclude(location=location).order_by('id').first().location
+    transfer = TransferOrder.objects.create(
+        transfer_number=f'BENCH-TRF-{next(_sequence)}', source_location=location,
+        destination_location=destination, created_by=user
+    )
+    for product_id in products:
+        TransferLine.objects.create(transfer=transfer, product_id=product_id, quantity=1)
+    return f'/api/transfers/{transfer.pk}/validate_transfer/'
+
+
+def prepare_adjustment(user):
+    quant = StockQuant.objects.order_by('id').first()
+    adjustment = AdjustmentEntry.objects.create(
+        adjustment_number=f'BENCH-ADJ-{next(_sequence)}', location=quant.location, product=quant.product,
+        system_quantity=quant.quantity, counted_quantity=quant.quantity + 1, reason='PHYSICAL_COUNT',
+        created_by=user
+    )
+    return f'/api/adjustments/{adjustment.pk}/validate_adjustment/'
+
+
+# name -> (method, url or callable(user) returning the url)
+SCENARIOS = {
+    'products-list': ('get', '/api/products/'),
+    'products-detail': ('get', lambda user: f'/api/products/{_first_product().pk}/'),
+    'stock-quants-list': ('get', '/api/stock-quants/'),
+    'movements-list': ('get', '/api/movements/'),
+    'dashboard-kpis': ('get', '/api/dashboard/kpis/'),
+    'dashboard-recent-movements': ('get', '/api/dashboard/recent-movements/'),
+    'dashboard-stock-levels': ('get', '/api/dashboard/stock-levels/'),
+    'dashboard-movement-trends': ('get', '/api/dashboard/movement-trends/'),
+    'dashboard-top-products': ('get', '/api/dashboard/top-products/'),
+    'dashboard-stock-value-by-category': ('get', '/api/dashboard/stock-value-by-category/'),
+    'validate-receipt': ('post', prepare_receipt),
+    'validate-delivery': ('post', prepare_delivery),
+    'validate-transfer': ('post', prepare_transfer),
+    'validate-adjustment': ('post', prepare_adjustment),
+}
@@ -0,0 +1,140 @@
+import io
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from django.db.models import F
+from rest_framework.test import APIClient
+from deliveries.models import DeliveryOrder
+from products.models import Product
+from receipts.models import Receipt
+from stock_ledger.models import StockMovement
+from transfers.models import TransferOrder
+from users.models import User
+from warehouse.models import StockQuant
+from .harness import run_scenario, load_baselines
+from .scenarios import SCENARIOS, load_scale
+
+
+# Validations commit their own transaction; measured inside a TestCase they
+# would borrow the test's atomic block and skip BEGIN/COMMIT and savepoints.
+WRITE_SCENARIOS = [name for name, (method, _) in SCENARIOS.items() if method != 'get']
+READ_SCENARIOS = [name for name in SCENARIOS if name not in WRITE_SCENARIOS]
+
+
+class QueryBudgetMixin:
+    """Fail when an endpoint issues more SQL queries than its recorded baseline.
+
+    Budgets live in benchmarks/baselines.json per scale. An endpoint whose
+    query count does not grow between scales has the same budget at both,
+    so a new N+1 pattern shows up as the larger scale exceeding it. Budgets
+    listed under "accepted_debt" grow between scales for a recorded reason,
+    such as a known N+1 pattern or quants created while posting, and are
+    ceilings, not targets.
+    Refresh with: python manage.py run_benchmarks --update-baselines
+    """
+
+    scale = None
+    scenarios = ()
+
+    @classmethod
+    def load_fixtures(cls):
+        load_scale(cls.scale)
+        cls.user = User.objects.create_user(username='bench', password='bench12345', role='ADMIN')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_query_budgets(self):
+        budgets = load_baselines().get('scales', {}).get(self.scale, {})
+        for name in self.scenarios:
+            with self.subTest(scenario=name):
+                self.assertIn(name, budgets, f"No baseline recorded for {name} at {self.scale} scale")
+                result = run_scenario(self.client, self.user, SCENARIOS[name])
+                self.assertLessEqual(
+                    result['queries'], budgets[name]['queries'],
+                    f"{name} ran {result['queries']} queries at {self.scale} scale, "
+                    f"budget is {budgets[name]['queries']}"
+                )
+
+
+class ReadQueryBudgetMixin(QueryBudgetMixin):
+    """Read scenarios share one scale load per class"""
+
+    scenarios = READ_SCENARIOS
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.load_fixtures()
+
+
+class WriteQueryBudgetMixin(QueryBudgetMixin):
+    """Write scenarios run in autocommit, as they do in production"""
+
+    scenarios = WRITE_SCENARIOS
+
+    def setUp(self):
+        self.load_fixtures()
+        super().setUp()
+
+
+class TinyScaleQueryBudgetTests(ReadQueryBudgetMixin, TestCase):
+    scale = 'tiny'
+
+
+class SmallScaleQueryBudgetTests(ReadQueryBudgetMixin, TestCase):
+    scale = 'small'
+
+
+class TinyScaleWriteQueryBudgetTests(WriteQueryBudgetMixin, TransactionTestCase):
+    scale = 'tiny'
+
+
+class SmallScaleWriteQueryBudgetTests(WriteQueryBudgetMixin, TransactionTestCase):
+    scale = 'small'
+
+
+class AcceptedDebtTests(TestCase):
+    def test_accepted_debt_names_known_scenarios(self):
+        debt = load_baselines().get('accepted_debt', {})
+        self.assertEqual(sorted(set(debt) - set(SCENARIOS)), [])
+
+
+class LoadTestValidationTests(TransactionTestCase):
+    """The validation load test needs an explicit opt-in and leaves no trace"""
+
+    def setUp(self):
+        load_scale('tiny')
+
+    def snapshot(self):
+        return (
+            sorted(StockQuant.objects.values_list('product_id', 'location_id', 'quantity')),
+            StockMovement.objects.count(),
+            Receipt.objects.count() + DeliveryOrder.objects.count() + TransferOrder.objects.count(),
+        )
+
+    def test_refuses_without_flag(self):
+        with self.assertRaisesMessage(CommandError, '--i-know-this-writes'):
+            call_command('load_test_validation', stdout=io.StringIO())
+
+    def test_removes_documents_and_restores_stock(self):
+        before = self.snapshot()
+        out = io.StringIO()
+        call_command(
+            'load_test_validation', threads=1, duration=0.3, products=3, lines=2,
+            i_know_this_writes=True, stdout=out
+        )
+        self.assertIn('✓ Ledger matches stock quants', out.getvalue())
+        self.assertRegex(out.getvalue(), r'Removed [1-9]\d* load test documents')
+        self.assertEqual(self.snapshot(), before)
+
+    def test_ignores_differences_from_before_the_run(self):
+        # Seeded stock that no movement explains, on the first hot product
+        product = Product.objects.filter(is_active=True).order_by('id').first()
+        StockQuant.objects.filter(product=product).update(quantity=F('quantity') + 7)
+        out = io.StringIO()
+        call_command(
+            'load_test_validation', threads=1, duration=0.3, products=3, lines=2,
+            i_know_this_writes=True, stdout=out
+        )
+        self.assertIn('✓ Ledger matches stock quants', out.getvalue())
@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import ModelVersion
+
+
+@admin.register(ModelVersion)
+class ModelVersionAdmin(admin.ModelAdmin):
+    list_display = ['label', 'version']
+    readonly_fields = ['label', 'version']
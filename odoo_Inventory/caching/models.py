@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class ModelVersion(models.Model):
+    """Version counter per model, bumped after every committed write to it"""
+    
+    label = models.CharField(max_length=100, unique=True, help_text="Model label, e.g. products.product")
+    version = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'model_versions'
+        ordering = ['label']
+    
+    def __str__(self):
+        return f"{self.label} v{self.version}"
@@ -0,0 +1,123 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from odoo_Inventory.db_routers import read_database
+from monitoring import metrics
+from .versions import get_versions
+
+
+class ResponseCache:
+    """Rendered responses in a per-process LRU, backed by an optional shared cache.
+
+    Keys contain the versions of every model a response was built from, so
+    entries are never invalidated in place; a write moves readers to new
+    keys and old entries age out. Local and shared entries both expire after
+    RESPONSE_CACHE_TTL seconds.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _shared(self):
+        alias = getattr(settings, 'RESPONSE_CACHE_SHARED_CACHE', None)
+        return caches[alias] if alias else None
+
+    def _ttl(self):
+        return getattr(settings, 'RESPONSE_CACHE_TTL', 300)
+
+    def _get_local(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            expires, entry = item
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def _set_local(self, key, entry):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self._ttl(), entry)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def get(self, key):
+        entry = self._get_local(key)
+        metrics.record_cache('response_local', entry is not None)
+        if entry is not None:
+            return entry
+        
+        shared = self._shared()
+        if shared is not None:
+            entry = shared.get(key)
+            metrics.record_cache('response_shared', entry is not None)
+            if entry is not None:
+                self._set_local(key, entry)
+        return entry
+
+    def set(self, key, entry):
+        self._set_local(key, entry)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(key, entry, self._ttl())
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+response_cache = ResponseCache(getattr(settings, 'RESPONSE_CACHE_SIZE', 500))
+
+
+def cache_key(view, request, versions):
+    """Key for a list response: view, URL, normalized query params and model versions"""
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    parts = [
+        f'{view.__class__.__module__}.{view.__class__.__qualname__}',
+        request.build_absolute_uri(request.path),
+        request.accepted_media_type,
+        repr(params),
+        repr(versions),
+    ]
+    return 'response:' + hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class CachedListMixin:
+    """Serve list responses from the response cache while the underlying data is unchanged.
+
+    cache_models lists every model the list representation reads; their
+    versions are bumped after each committed write (see caching.signals).
+    Only JSON responses are cached; the browsable API is always rendered.
+    """
+    
+    cache_models = ()
+    
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not getattr(settings, 'RESPONSE_CACHE_ENABLED', False) or renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+        
+        # Versions are read before the data, from the same database
+        versions = get_versions(self.cache_models, using=read_database())
+        key = cache_key(self, request, versions)
+        entry = response_cache.get(key)
+        if entry is None:
+            response = super().list(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            content = renderer.render(response.data, request.accepted_media_type, self.get_renderer_context())
+            content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+            entry = (content, content_type)
+            response_cache.set(key, entry)
+        
+        content, content_type = entry
+        return HttpResponse(content, content_type=content_type)
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from products.models import Category, UnitOfMeasure, Product
+from products.signals import products_bulk_updated
+from warehouse.models import Warehouse, Location, StockQuant
+from .versions import bump_versions
+
+
+# Models read by cached list responses
+VERSIONED_MODELS = [Category, UnitOfMeasure, Product, Warehouse, Location, StockQuant]
+
+
+def model_written(sender, using=None, **kwargs):
+    bump_versions(sender, using=using)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(model_written, sender=model, dispatch_uid=f'caching_saved_{model._meta.label_lower}')
+    post_delete.connect(model_written, sender=model, dispatch_uid=f'caching_deleted_{model._meta.label_lower}')
+
+
+@receiver(products_bulk_updated)
+def products_bulk_written(sender, **kwargs):
+    bump_versions(Product)
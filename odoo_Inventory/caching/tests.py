@@ -0,0 +1,116 @@
+import time
+from decimal import Decimal
+from unittest import mock
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from products.models import Product
+from products.signals import products_bulk_updated
+from stock_ledger.models import StockMovement
+from users.models import User
+from warehouse.models import Location, StockQuant
+from . import versions
+from .responses import ResponseCache, response_cache
+
+
+class ResponseCacheTests(TestCase):
+    """Cached list responses are reused until a write to a model they read commits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='reader', password='secret123', role='ADMIN')
+        cls.product = Product.objects.order_by('id').first()
+        cls.location = Location.objects.order_by('id').first()
+
+    def setUp(self):
+        # Enabled per test: writes in setUpTestData never commit, so they must not bump
+        enabled = self.settings(RESPONSE_CACHE_ENABLED=True)
+        enabled.enable()
+        self.addCleanup(enabled.disable)
+        response_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _quantity(self):
+        response = self.client.get('/api/stock-quants/', {'product': self.product.id, 'location': self.location.id})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        return Decimal(results[0]['quantity']) if results else Decimal('0')
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get('/api/products/', {'is_active': 'true', 'ordering': 'sku'})
+        # Only the version lookup; the same params in another order share the entry
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/products/?ordering=sku&is_active=true')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(second.content, first.content)
+
+    def test_posted_movement_invalidates_stock_lists(self):
+        before = self._quantity()
+        with self.captureOnCommitCallbacks(execute=True):
+            StockMovement.objects.create(
+                movement_type='RECEIPT', product=self.product, quantity=4,
+                destination_location=self.location, document_reference='CACHE-1',
+                document_type='RECEIPT', created_by=self.user
+            )
+        self.assertEqual(self._quantity(), before + 4)
+
+    def test_related_model_writes_invalidate(self):
+        self.client.get('/api/locations/')
+        with self.captureOnCommitCallbacks(execute=True):
+            warehouse = self.location.warehouse
+            warehouse.name = 'Renamed warehouse'
+            warehouse.save()
+        names = {row['warehouse_name'] for row in self.client.get('/api/locations/').json()['results']}
+        self.assertIn('Renamed warehouse', names)
+
+    def test_bulk_updates_invalidate_product_list(self):
+        self.client.get('/api/products/')
+        Product.objects.filter(pk=self.product.pk).update(name='Bulk renamed')
+        products_bulk_updated.send(sender=Product, product_ids=[self.product.pk], fields=['name'])
+        names = [row['name'] for row in self.client.get('/api/products/', {'page_size': 100}).json()['results']]
+        self.assertIn('Bulk renamed', names)
+
+    def test_deletes_invalidate(self):
+        self.client.get('/api/stock-quants/')
+        with self.captureOnCommitCallbacks(execute=True):
+            StockQuant.objects.filter(product=self.product).delete()
+        self.assertEqual(self._quantity(), Decimal('0'))
+
+    @override_settings(RESPONSE_CACHE_TTL=60)
+    def test_local_entries_expire(self):
+        cache = ResponseCache(10)
+        cache.set('key', (b'[]', 'application/json'))
+        self.assertEqual(cache.get('key'), (b'[]', 'application/json'))
+        with mock.patch('caching.responses.time.monotonic', return_value=time.monotonic() + 61):
+            self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.entries, {})
+
+    def test_failed_bump_keeps_the_write_and_other_bumps(self):
+        self.client.get('/api/locations/')
+        real_bump = versions._bump
+
+        def bump(label, using):
+            if label == 'warehouse.location':
+                raise DatabaseError('connection lost')
+            real_bump(label, using)
+
+        with mock.patch('caching.versions._bump', side_effect=bump), \
+                self.assertLogs('caching.versions', 'ERROR'), \
+                self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.location.save()
+                warehouse = self.location.warehouse
+                warehouse.name = 'Renamed after a failed bump'
+                warehouse.save()
+        names = {row['warehouse_name'] for row in self.client.get('/api/locations/').json()['results']}
+        self.assertIn('Renamed after a failed bump', names)
+
+    @override_settings(RESPONSE_CACHE_ENABLED=False)
+    def test_disabled(self):
+        self.client.get('/api/stock-quants/')
+        with self.assertNumQueries(2):
+            self.client.get('/api/stock-quants/')
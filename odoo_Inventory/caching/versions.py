@@ -0,0 +1,77 @@
+import logging
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from .models import ModelVersion
+
+logger = logging.getLogger(__name__)
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+class PendingBumps:
+    """Models written in the current transaction, bumped once it commits.
+
+    Bumping after the commit keeps the version rows out of the writing
+    transaction, so concurrent postings do not queue on them. A reader reads
+    the versions before the data, so a response built in between is stored
+    under the old version and never served again. Entries read between the
+    commit and the bump, or after a bump that was lost, are at most
+    RESPONSE_CACHE_TTL seconds old.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        self.labels = set()
+
+    def flush(self):
+        labels, self.labels = self.labels, set()
+        write_bumps(labels, self.using)
+
+
+def write_bumps(labels, using=DEFAULT_DB_ALIAS):
+    # Sorted, so concurrent bumps lock the rows in the same order
+    for label in sorted(labels):
+        try:
+            _bump(label, using)
+        except DatabaseError:
+            # The write has already committed, so it must not fail because of this
+            logger.exception(f"Could not bump the response cache version of {label}")
+
+
+def _bump(label, using):
+    versions = ModelVersion.objects.using(using).filter(label=label)
+    if versions.update(version=F('version') + 1):
+        return
+    try:
+        with transaction.atomic(using=using):
+            ModelVersion.objects.using(using).create(label=label, version=1)
+    except IntegrityError:
+        versions.update(version=F('version') + 1)
+
+
+def bump_versions(*models, using=DEFAULT_DB_ALIAS):
+    """Invalidate cached responses built from these models once the write commits"""
+    if not getattr(settings, 'RESPONSE_CACHE_ENABLED', False):
+        return
+    labels = {model_label(model) for model in models}
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        write_bumps(labels, using)
+        return
+    
+    pending = getattr(connection, 'pending_version_bumps', None)
+    if pending is None or not any(entry[1] == pending.flush for entry in connection.run_on_commit):
+        pending = PendingBumps(using)
+        connection.pending_version_bumps = pending
+        transaction.on_commit(pending.flush, using=using, robust=True)
+    pending.labels.update(labels)
+
+
+def get_versions(models, using=DEFAULT_DB_ALIAS):
+    """Current versions of the models, in order, in one query"""
+    labels = [model_label(model) for model in models]
+    versions = dict(ModelVersion.objects.using(using).filter(label__in=labels).values_list('label', 'version'))
+    return tuple(versions.get(label, 0) for label in labels)
@@ -0,0 +1,122 @@
+"""
+Async dashboard views.
+
+Independent queries run concurrently, each on a worker thread with its own
+database connection, so a view takes about as long as its slowest query
+instead of the sum of all of them. /api/dashboard/summary/ returns every
+panel in one round trip.
+"""
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponseNotAllowed, JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
+from odoo_Inventory.async_auth import authenticate
+from odoo_Inventory.db_routers import is_pinned, replica_reads
+from . import panels
+
+
+def _own_connection(func):
+    """Close the worker thread's connections once the query is done.
+
+    Executor threads outlive the request, so a persistent connection
+    (CONN_MAX_AGE) left open would stay checked out by an idle thread.
+    """
+    def wrapper(**kwargs):
+        try:
+            return func(**kwargs)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+async def run_queries(calls):
+    """Run {name: (func, kwargs)} and return {name: result}.
+
+    At most DASHBOARD_MAX_CONCURRENT_QUERIES run at once per request. With a
+    limit of 1 the queries run one after another on the request's connection.
+    """
+    limit = getattr(settings, 'DASHBOARD_MAX_CONCURRENT_QUERIES', 4)
+    if limit <= 1:
+        results = [await sync_to_async(func)(**kwargs) for func, kwargs in calls.values()]
+        return dict(zip(calls, results))
+    
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run(func, kwargs):
+        async with semaphore:
+            return await sync_to_async(_own_connection(func), thread_sensitive=False)(**kwargs)
+    
+    results = await asyncio.gather(*(run(func, kwargs) for func, kwargs in calls.values()))
+    return dict(zip(calls, results))
+
+
+def dashboard_view(build):
+    """Turn an async build(params) coroutine into an authenticated GET view"""
+    async def view(request):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        user, error = await authenticate(request)
+        if error:
+            return error
+        pinned = await sync_to_async(is_pinned)(user)
+        with replica_reads(not pinned):
+            data = await build(request.GET)
+        return JsonResponse(data, encoder=JSONEncoder, safe=False)
+    view.__name__ = build.__name__
+    view.__doc__ = build.__doc__
+    return view
+
+
+def _kpi_calls(prefix=''):
+    return {prefix + name: (query, {}) for name, query in panels.KPI_QUERIES.items()}
+
+
+def _kpis_from(results, prefix=''):
+    return panels.build_kpis({name: results[prefix + name] for name in panels.KPI_QUERIES})
+
+
+@dashboard_view
+async def kpis(params):
+    """Dashboard KPIs with the sub-queries run concurrently"""
+    return _kpis_from(await run_queries(_kpi_calls()))
+
+
+def _panel_view(name):
+    async def build(params):
+        func, arguments = panels.PANELS[name]
+        results = await run_queries({name: (func, arguments(params))})
+        return results[name]
+    build.__name__ = name
+    build.__doc__ = f"Async {name.replace('_', ' ')} panel"
+    return dashboard_view(build)
+
+
+recent_movements = _panel_view('recent_movements')
+stock_levels = _panel_view('stock_levels')
+movement_trends = _panel_view('movement_trends')
+top_products = _panel_view('top_products')
+stock_value_by_category = _panel_view('stock_value_by_category')
+
+
+def _panel_params(params, name):
+    """Shared params overridden by ones prefixed with the panel name (movement_trends.days=7)"""
+    prefix = name + '.'
+    merged = {key: value for key, value in params.items() if '.' not in key}
+    merged.update({key[len(prefix):]: value for key, value in params.items() if key.startswith(prefix)})
+    return merged
+
+
+@dashboard_view
+async def summary(params):
+    """Every dashboard panel in one response"""
+    calls = _kpi_calls(prefix='kpis.')
+    for name, (func, arguments) in panels.PANELS.items():
+        calls[name] = (func, arguments(_panel_params(params, name)))
+    results = await run_queries(calls)
+    
+    data = {'kpis': _kpis_from(results, prefix='kpis.')}
+    for name in panels.PANELS:
+        data[name] = results[name]
+    return data
@@ -0,0 +1,253 @@
+"""
+Dashboard panel queries, shared by the synchronous DRF views and the async views
+"""
+from django.db.models import Sum, Count
+from django.utils import timezone
+from datetime import timedelta
+from products.models import Product
+from warehouse.models import StockQuant
+from receipts.models import Receipt
+from deliveries.models import DeliveryOrder
+from transfers.models import TransferOrder
+from stock_ledger.models import StockMovement
+
+
+PENDING_STATUSES = ['DRAFT', 'WAITING', 'READY']
+
+
+def total_products():
+    """Total products in stock"""
+    return Product.objects.filter(is_active=True).count()
+
+
+def low_stock_items():
+    low_stock = []
+    for product in Product.objects.filter(is_active=True):
+        if product.is_low_stock():
+            low_stock.append({
+                'id': product.id,
+                'sku': product.sku,
+                'name': product.name,
+                'current_stock': product.get_total_stock(),
+                'min_stock_level': product.min_stock_level
+            })
+    return low_stock
+
+
+def out_of_stock_items():
+    out_of_stock = []
+    for product in Product.objects.filter(is_active=True):
+        if product.get_total_stock() == 0:
+            out_of_stock.append({
+                'id': product.id,
+                'sku': product.sku,
+                'name': product.name
+            })
+    return out_of_stock
+
+
+def pending_receipts():
+    return Receipt.objects.filter(status__in=PENDING_STATUSES).count()
+
+
+def pending_deliveries():
+    return DeliveryOrder.objects.filter(status__in=PENDING_STATUSES).count()
+
+
+def transfers_scheduled():
+    """Internal transfers scheduled"""
+    return TransferOrder.objects.filter(status__in=PENDING_STATUSES).count()
+
+
+def total_stock_value():
+    value = 0
+    for quant in StockQuant.objects.select_related('product'):
+        value += float(quant.quantity) * float(quant.product.cost_price)
+    return value
+
+
+# Independent KPI sub-queries; the async views run them concurrently
+KPI_QUERIES = {
+    'total_products': total_products,
+    'low_stock_items': low_stock_items,
+    'out_of_stock_items': out_of_stock_items,
+    'pending_receipts': pending_receipts,
+    'pending_deliveries': pending_deliveries,
+    'transfers_scheduled': transfers_scheduled,
+    'total_stock_value': total_stock_value,
+}
+
+
+def build_kpis(results):
+    """Assemble the KPI payload from the KPI_QUERIES results"""
+    return {
+        'total_products': results['total_products'],
+        'low_stock_count': len(results['low_stock_items']),
+        'low_stock_items': results['low_stock_items'][:10],  # Top 10
+        'out_of_stock_count': len(results['out_of_stock_items']),
+        'out_of_stock_items': results['out_of_stock_items'][:10],  # Top 10
+        'pending_receipts': results['pending_receipts'],
+        'pending_deliveries': results['pending_deliveries'],
+        'transfers_scheduled': results['transfers_scheduled'],
+        'total_stock_value': round(results['total_stock_value'], 2)
+    }
+
+
+def kpis():
+    return build_kpis({name: query() for name, query in KPI_QUERIES.items()})
+
+
+def recent_movements(limit=20, movement_type=None):
+    movements = StockMovement.objects.select_related(
+        'product', 'source_location', 'destination_location', 'created_by'
+    ).all()
+    
+    if movement_type:
+        movements = movements.filter(movement_type=movement_type)
+    
+    movements = movements[:limit]
+    
+    data = []
+    for movement in movements:
+        data.append({
+            'id': movement.id,
+            'movement_type': movement.movement_type,
+            'product_sku': movement.product.sku,
+            'product_name': movement.product.name,
+            'quantity': str(movement.quantity),
+            'source_location': movement.source_location.code if movement.source_location else None,
+            'destination_location': movement.destination_location.code if movement.destination_location else None,
+            'document_reference': movement.document_reference,
+            'created_at': movement.created_at,
+            'created_by': movement.created_by.username
+        })
+    return data
+
+
+def stock_levels(warehouse_id=None):
+    quants = StockQuant.objects.select_related(
+        'product', 'location', 'location__warehouse'
+    ).filter(quantity__gt=0)
+    
+    if warehouse_id:
+        quants = quants.filter(location__warehouse_id=warehouse_id)
+    
+    data = []
+    for quant in quants:
+        data.append({
+            'warehouse': quant.location.warehouse.name,
+            'location': quant.location.code,
+            'product_sku': quant.product.sku,
+            'product_name': quant.product.name,
+            'quantity': str(quant.quantity),
+            'reserved_quantity': str(quant.reserved_quantity),
+            'available_quantity': str(quant.available_quantity())
+        })
+    return data
+
+
+def movement_trends(days=30):
+    end_date = timezone.now()
+    start_date = end_date - timedelta(days=days)
+    
+    # Get daily counts
+    daily_data = []
+    for i in range(days):
+        date = start_date + timedelta(days=i)
+        next_date = date + timedelta(days=1)
+        
+        day_movements = StockMovement.objects.filter(
+            created_at__gte=date,
+            created_at__lt=next_date
+        ).values('movement_type').annotate(count=Count('id'))
+        
+        receipts = sum(m['count'] for m in day_movements if m['movement_type'] == 'RECEIPT')
+        deliveries = sum(m['count'] for m in day_movements if m['movement_type'] == 'DELIVERY')
+        transfers = sum(m['count'] for m in day_movements if m['movement_type'] == 'TRANSFER')
+        adjustments = sum(m['count'] for m in day_movements if m['movement_type'] == 'ADJUSTMENT')
+        
+        daily_data.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'receipts': receipts,
+            'deliveries': deliveries,
+            'transfers': transfers,
+            'adjustments': adjustments,
+            'total': receipts + deliveries + transfers + adjustments
+        })
+    return daily_data
+
+
+def top_products(limit=10, days=30):
+    end_date = timezone.now()
+    start_date = end_date - timedelta(days=days)
+    
+    # Get top products by movement count
+    top = StockMovement.objects.filter(
+        created_at__gte=start_date
+    ).values('product__name', 'product__sku').annotate(
+        movement_count=Count('id'),
+        total_quantity=Sum('quantity')
+    ).order_by('-movement_count')[:limit]
+    
+    data = []
+    for item in top:
+        data.append({
+            'name': item['product__name'],
+            'sku': item['product__sku'],
+            'movements': item['movement_count'],
+            'quantity': str(item['total_quantity'] or 0)
+        })
+    return data
+
+
+def stock_value_by_category():
+    categories = {}
+    
+    for quant in StockQuant.objects.select_related('product', 'product__category').filter(quantity__gt=0):
+        category_name = quant.product.category.name if quant.product.category else 'Uncategorized'
+        
+        if category_name not in categories:
+            categories[category_name] = {
+                'category': category_name,
+                'value': 0,
+                'quantity': 0,
+                'products': 0
+            }
+        
+        value = float(quant.quantity) * float(quant.product.cost_price)
+        categories[category_name]['value'] += value
+        categories[category_name]['quantity'] += float(quant.quantity)
+        categories[category_name]['products'] += 1
+    
+    # Convert to list and sort by value
+    data = sorted(categories.values(), key=lambda x: x['value'], reverse=True)
+    
+    # Round values
+    for item in data:
+        item['value'] = round(item['value'], 2)
+        item['quantity'] = round(item['quantity'], 2)
+    return data
+
+
+# Panel functions and their keyword arguments from request query parameters
+PANELS = {
+    'recent_movements': (recent_movements, lambda params: {
+        'limit': int(params.get('limit', 20)),
+        'movement_type': params.get('movement_type', None),
+    }),
+    'stock_levels': (stock_levels, lambda params: {
+        'warehouse_id': params.get('warehouse', None),
+    }),
+    'movement_trends': (movement_trends, lambda params: {
+        'days': int(params.get('days', 30)),
+    }),
+    'top_products': (top_products, lambda params: {
+        'limit': int(params.get('limit', 10)),
+        'days': int(params.get('days', 30)),
+    }),
+    'stock_value_by_category': (stock_value_by_category, lambda params: {}),
+}
+
+
+def panel_arguments(name, params):
+    return PANELS[name][1](params)
@@ -1,3 +1,90 @@
-from django.test import TestCase
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from products.models import Product
+from users.models import User
+from .async_views import _own_connection
 
-# Create your tests here.
+
+SYNC_PANELS = {
+    'recent_movements': '/api/dashboard/recent-movements/',
+    'stock_levels': '/api/dashboard/stock-levels/',
+    'movement_trends': '/api/dashboard/movement-trends/',
+    'top_products': '/api/dashboard/top-products/',
+    'stock_value_by_category': '/api/dashboard/stock-value-by-category/',
+}
+
+
+class DashboardSummaryMixin:
+    """The async summary returns exactly what the six synchronous endpoints return"""
+
+    def create_data(self):
+        load_scale('tiny')
+        self.user = User.objects.create_user(username='viewer', password='secret123', role='ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_summary_matches_sync_views(self):
+        summary = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(summary.status_code, 200)
+        data = summary.json()
+        self.assertEqual(data['kpis'], self.client.get('/api/dashboard/kpis/').json())
+        for name, url in SYNC_PANELS.items():
+            self.assertEqual(data[name], self.client.get(url).json(), name)
+
+    def test_summary_panel_params(self):
+        data = self.client.get('/api/dashboard/summary/?days=14&movement_trends.days=7').json()
+        self.assertEqual(len(data['movement_trends']), 7)
+        self.assertEqual(
+            data['top_products'],
+            self.client.get('/api/dashboard/top-products/?days=14').json()
+        )
+
+    def test_async_kpis_match_sync_view(self):
+        self.assertEqual(
+            self.client.get('/api/dashboard/async/kpis/').json(),
+            self.client.get('/api/dashboard/kpis/').json()
+        )
+
+
+class ConcurrentDashboardSummaryTests(DashboardSummaryMixin, TransactionTestCase):
+    """Concurrent queries use their own connections, so the data must be committed"""
+
+    def setUp(self):
+        self.create_data()
+
+    def test_worker_connections_are_closed(self):
+        def query():
+            Product.objects.count()
+            return connections['default']
+
+        run = sync_to_async(_own_connection(query), thread_sensitive=False)
+        default = connections['default']
+        # A persistent connection would otherwise stay open on the executor thread
+        with mock.patch.dict(default.settings_dict, {'CONN_MAX_AGE': 60}), \
+                mock.patch.object(type(default), 'close', autospec=True) as close:
+            used = async_to_sync(run)()
+        self.assertIsNot(used, default)
+        self.assertIn(mock.call(used), close.call_args_list)
+
+
+@override_settings(DASHBOARD_MAX_CONCURRENT_QUERIES=1)
+class SequentialDashboardSummaryTests(DashboardSummaryMixin, TestCase):
+
+    def setUp(self):
+        self.create_data()
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/dashboard/summary/').status_code, 401)
+
+    def test_token_authentication(self):
+        token = Token.objects.create(user=self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.assertEqual(client.get('/api/dashboard/summary/').status_code, 200)
+        client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        self.assertEqual(client.get('/api/dashboard/summary/').status_code, 401)
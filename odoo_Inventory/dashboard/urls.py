@@ -7,6 +7,7 @@ from .views import (
     TopProductsView,
     StockValueByCategoryView
 )
+from . import async_views
 
 urlpatterns = [
     path('kpis/', DashboardKPIView.as_view(), name='dashboard-kpis'),
@@ -15,4 +16,13 @@ urlpatterns = [
     path('movement-trends/', MovementTrendsView.as_view(), name='movement-trends'),
     path('top-products/', TopProductsView.as_view(), name='top-products'),
     path('stock-value-by-category/', StockValueByCategoryView.as_view(), name='stock-value-by-category'),
+    
+    # Async versions (best served under ASGI) and all panels in one call
+    path('summary/', async_views.summary, name='dashboard-summary'),
+    path('async/kpis/', async_views.kpis, name='async-dashboard-kpis'),
+    path('async/recent-movements/', async_views.recent_movements, name='async-recent-movements'),
+    path('async/stock-levels/', async_views.stock_levels, name='async-stock-levels'),
+    path('async/movement-trends/', async_views.movement_trends, name='async-movement-trends'),
+    path('async/top-products/', async_views.top_products, name='async-top-products'),
+    path('async/stock-value-by-category/', async_views.stock_value_by_category, name='async-stock-value-by-category'),
 ]
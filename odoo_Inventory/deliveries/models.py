@@ -1,10 +1,11 @@
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from products.models import Product
 from warehouse.models import Location
 from stock_ledger.models import StockMovement
+from monitoring.metrics import timed_validation
 
 
 class DeliveryOrder(models.Model):
@@ -53,6 +54,8 @@ class DeliveryOrder(models.Model):
     def __str__(self):
         return f"{self.delivery_number} - {self.customer_name}"
     
+    @timed_validation('DELIVERY')
+    @transaction.atomic
     def validate(self, user):
         """Validate delivery and create stock movements"""
         if self.status == 'DONE':
@@ -1,3 +1,6 @@
+from decimal import Decimal
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 from .models import DeliveryOrder, DeliveryLine
 from products.serializers import ProductListSerializer
@@ -39,6 +42,34 @@ class DeliveryOrderSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'validated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'validated_at', 'validated_by']
+        expandable_fields = {'source_location': LocationSerializer}
+
+
+class DeliveryOrderListSerializer(DeliveryOrderSerializer):
+    """Delivery headers with line totals for the list; lines only come with retrieve"""
+    
+    lines = None
+    line_count = serializers.IntegerField(read_only=True)
+    total_quantity = serializers.DecimalField(max_digits=20, decimal_places=3, read_only=True)
+    total_value = serializers.DecimalField(max_digits=20, decimal_places=2, read_only=True)
+    
+    class Meta(DeliveryOrderSerializer.Meta):
+        fields = [
+            field for field in DeliveryOrderSerializer.Meta.fields if field != 'lines'
+        ] + ['line_count', 'total_quantity', 'total_value']
+
+
+DELIVERY_LIST_TOTALS = {
+    'line_count': Count('lines'),
+    'total_quantity': Coalesce(
+        Sum('lines__quantity'), Value(Decimal('0')),
+        output_field=DecimalField(max_digits=20, decimal_places=3)
+    ),
+    'total_value': Coalesce(
+        Sum(F('lines__quantity') * F('lines__unit_price')), Value(Decimal('0')),
+        output_field=DecimalField(max_digits=20, decimal_places=2)
+    ),
+}
 
 
 class DeliveryOrderCreateSerializer(serializers.ModelSerializer):
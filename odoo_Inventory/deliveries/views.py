@@ -2,19 +2,21 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from idempotency.decorators import idempotent
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
 from .models import DeliveryOrder, DeliveryLine
-from .serializers import DeliveryOrderSerializer, DeliveryOrderCreateSerializer
+from .serializers import (
+    DeliveryOrderSerializer, DeliveryOrderListSerializer, DeliveryOrderCreateSerializer, DELIVERY_LIST_TOTALS
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class DeliveryOrderViewSet(viewsets.ModelViewSet):
+class DeliveryOrderViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for DeliveryOrder model"""
     
-    queryset = DeliveryOrder.objects.select_related(
-        'source_location', 'created_by', 'validated_by'
-    ).prefetch_related('lines__product').all()
+    queryset = DeliveryOrder.objects.all()
     serializer_class = DeliveryOrderSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'source_location', 'created_by']
@@ -22,11 +24,20 @@ class DeliveryOrderViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'scheduled_date', 'delivery_date']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.annotate(**DELIVERY_LIST_TOTALS)
+        return queryset
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return DeliveryOrderCreateSerializer
+        if self.action == 'list':
+            return DeliveryOrderListSerializer
         return DeliveryOrderSerializer
     
+    @idempotent
     def create(self, request, *args, **kwargs):
         logger.info(f"Creating delivery with data: {request.data}")
         serializer = self.get_serializer(data=request.data)
@@ -43,6 +54,7 @@ class DeliveryOrderViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def validate_delivery(self, request, pk=None):
         """Validate delivery and create stock movements"""
         delivery = self.get_object()
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ExportJob
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'export_type', 'file_format', 'status', 'rows_written', 'total_rows', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['export_type', 'status', 'created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'rows_written', 'total_rows', 'worker']
+    ordering = ['-created_at']
@@ -0,0 +1,21 @@
+"""
+Management command to delete old export jobs and their files
+Run with: python manage.py prune_exports
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from exports.runner import prune_exports
+
+
+class Command(BaseCommand):
+    help = 'Delete finished export jobs and export files older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'EXPORT_RETENTION_DAYS', 7),
+            help='Keep finished exports for this many days (default: EXPORT_RETENTION_DAYS)'
+        )
+
+    def handle(self, *args, **options):
+        jobs, files = prune_exports(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {jobs} export jobs and {files} files'))
@@ -0,0 +1,39 @@
+"""
+Worker process for background export jobs
+Run with: python manage.py run_jobs
+"""
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from exports.runner import claim_next_job, run_job, worker_name
+
+
+class Command(BaseCommand):
+    help = 'Claim and run pending export jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when no pending jobs remain')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        name = worker_name()
+        self.stdout.write(self.style.SUCCESS(f'Export worker {name} started'))
+
+        while True:
+            close_old_connections()
+            job = claim_next_job(name)
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f'Running job #{job.pk} ({job.export_type})')
+            job = run_job(job)
+            if job.status == 'DONE':
+                self.stdout.write(self.style.SUCCESS(f'✓ Job #{job.pk}: {job.rows_written} rows -> {job.file.name}'))
+            elif job.status == 'RUNNING':
+                self.stdout.write(self.style.WARNING(f'Job #{job.pk} was reclaimed by another worker'))
+            else:
+                self.stdout.write(self.style.ERROR(f'✗ Job #{job.pk} failed: {job.error}'))
@@ -0,0 +1,59 @@
+from django.db import models
+from django.conf import settings
+
+
+class ExportJob(models.Model):
+    """Background export of a large dataset to a downloadable file"""
+    
+    EXPORT_TYPE_CHOICES = [
+        ('MOVEMENTS', 'Movement Ledger'),
+        ('STOCK_LEVELS', 'Stock Levels'),
+        ('VALUATION', 'Stock Valuation'),
+    ]
+    
+    FILE_FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    export_type = models.CharField(max_length=20, choices=EXPORT_TYPE_CHOICES)
+    file_format = models.CharField(max_length=10, choices=FILE_FORMAT_CHOICES, default='csv')
+    compress = models.BooleanField(default=False)
+    params = models.JSONField(default=dict, blank=True, help_text="Query parameters applied as list filters")
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to='exports/', blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    worker = models.CharField(max_length=100, blank=True, null=True)
+    
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='export_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'export_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.export_type} #{self.pk} ({self.status})"
+    
+    def progress(self):
+        """Fraction of rows written, or None while the total is unknown"""
+        if self.status == 'DONE':
+            return 1.0
+        if not self.total_rows:
+            return None
+        return min(self.rows_written / self.total_rows, 1.0)
@@ -0,0 +1,74 @@
+from django.db.models import F, DecimalField, ExpressionWrapper
+from django.http import HttpRequest, QueryDict
+from rest_framework.request import Request
+from stock_ledger.exports import MOVEMENT_EXPORT_COLUMNS
+from stock_ledger.views import StockMovementViewSet
+from warehouse.views import StockQuantViewSet
+
+
+STOCK_LEVEL_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('product', 'product_id'),
+    ('product_sku', 'product__sku'),
+    ('product_name', 'product__name'),
+    ('location', 'location_id'),
+    ('location_code', 'location__code'),
+    ('warehouse_code', 'location__warehouse__code'),
+    ('quantity', 'quantity'),
+    ('reserved_quantity', 'reserved_quantity'),
+    ('available_quantity', 'available'),
+    ('last_updated', 'last_updated'),
+]
+
+VALUATION_EXPORT_COLUMNS = [
+    ('product', 'product_id'),
+    ('product_sku', 'product__sku'),
+    ('product_name', 'product__name'),
+    ('category_name', 'product__category__name'),
+    ('location_code', 'location__code'),
+    ('warehouse_code', 'location__warehouse__code'),
+    ('quantity', 'quantity'),
+    ('cost_price', 'product__cost_price'),
+    ('value', 'value'),
+]
+
+
+def _with_available(queryset):
+    return queryset.annotate(available=F('quantity') - F('reserved_quantity'))
+
+
+def _with_value(queryset):
+    return queryset.filter(quantity__gt=0).annotate(value=ExpressionWrapper(
+        F('quantity') * F('product__cost_price'),
+        output_field=DecimalField(max_digits=25, decimal_places=5)
+    ))
+
+
+# export_type -> (viewset whose filters apply, columns, queryset hook)
+EXPORT_DEFINITIONS = {
+    'MOVEMENTS': (StockMovementViewSet, MOVEMENT_EXPORT_COLUMNS, None),
+    'STOCK_LEVELS': (StockQuantViewSet, STOCK_LEVEL_EXPORT_COLUMNS, _with_available),
+    'VALUATION': (StockQuantViewSet, VALUATION_EXPORT_COLUMNS, _with_value),
+}
+
+
+def build_export_queryset(export_type, params, user):
+    """Return (queryset, columns) for an export, filtered exactly like the list endpoint"""
+    viewset_class, columns, hook = EXPORT_DEFINITIONS[export_type]
+    
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    http_request.GET = QueryDict(mutable=True)
+    for key, value in (params or {}).items():
+        if isinstance(value, list):
+            http_request.GET.setlist(key, [str(v) for v in value])
+        else:
+            http_request.GET[key] = str(value)
+    request = Request(http_request)
+    request.user = user
+    
+    view = viewset_class(request=request, args=(), kwargs={}, format_kwarg=None, action='list')
+    queryset = view.filter_queryset(view.get_queryset())
+    if hook:
+        queryset = hook(queryset)
+    return queryset, columns
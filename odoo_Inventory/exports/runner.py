@@ -0,0 +1,134 @@
+import logging
+import os
+import socket
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from stock_ledger.exports import RENDERERS, encode_stream, iter_rows
+from odoo_Inventory.db_routers import replica_reads
+from .models import ExportJob
+from .registry import build_export_queryset
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVERY = 5000
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker=None):
+    """Atomically claim the oldest pending job, skipping rows other workers hold.
+
+    A job left RUNNING for longer than EXPORT_JOB_TIMEOUT_MINUTES belongs to
+    a worker that died, so it is claimed again and rerun from the start.
+    """
+    timeout = timedelta(minutes=getattr(settings, 'EXPORT_JOB_TIMEOUT_MINUTES', 60))
+    claimable = Q(status='PENDING') | Q(status='RUNNING', started_at__lt=timezone.now() - timeout)
+    with transaction.atomic():
+        job = (ExportJob.objects.select_for_update(skip_locked=True)
+               .filter(claimable).order_by('created_at').first())
+        if job is None:
+            return None
+        if job.status == 'RUNNING':
+            logger.warning(f"Reclaiming export job {job.pk} from {job.worker} (started {job.started_at})")
+        job.status = 'RUNNING'
+        job.worker = worker or worker_name()
+        job.started_at = timezone.now()
+        job.rows_written = 0
+        job.save(update_fields=['status', 'worker', 'started_at', 'rows_written'])
+    return job
+
+
+def _claimed(job):
+    """The job's row for as long as it is still held by this claim of it"""
+    return ExportJob.objects.filter(pk=job.pk, worker=job.worker, started_at=job.started_at)
+
+
+def _counting(rows, job):
+    """Pass rows through while periodically recording progress on the job"""
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % PROGRESS_EVERY == 0:
+            _claimed(job).update(rows_written=count)
+    job.rows_written = count
+
+
+def run_job(job):
+    """Write the job's export file into MEDIA_ROOT and mark it done or failed.
+
+    Each claim writes its own file and only finishes the job while it still
+    holds it. A run whose job was reclaimed in the meantime discards its
+    file and returns the job still RUNNING.
+    """
+    extension = job.file_format + ('.gz' if job.compress else '')
+    claim = job.started_at.strftime('%Y%m%d%H%M%S')
+    relative_name = f"exports/{job.export_type.lower()}-{job.pk}-{claim}.{extension}"
+    path = Path(settings.MEDIA_ROOT) / relative_name
+    
+    try:
+        # Export reads go to the replica; job progress is still saved on the primary
+        with replica_reads():
+            queryset, columns = build_export_queryset(job.export_type, job.params, job.created_by)
+            job.total_rows = queryset.count()
+            _claimed(job).update(total_rows=job.total_rows)
+            
+            path.parent.mkdir(parents=True, exist_ok=True)
+            rows = _counting(iter_rows(queryset, columns), job)
+            with open(path, 'wb') as fh:
+                for chunk in encode_stream(RENDERERS[job.file_format](columns, rows), compress=job.compress):
+                    fh.write(chunk)
+    except Exception as e:
+        logger.exception(f"Export job {job.pk} failed")
+        if path.exists():
+            path.unlink()
+        finished_at = timezone.now()
+        if _claimed(job).update(status='FAILED', error=str(e), finished_at=finished_at):
+            job.status = 'FAILED'
+            job.error = str(e)
+            job.finished_at = finished_at
+        return job
+    
+    finished_at = timezone.now()
+    if not _claimed(job).update(
+        file=relative_name, status='DONE', rows_written=job.rows_written, finished_at=finished_at
+    ):
+        logger.warning(f"Export job {job.pk} was reclaimed from {job.worker}, discarding {relative_name}")
+        path.unlink()
+        return job
+    job.file.name = relative_name
+    job.status = 'DONE'
+    job.finished_at = finished_at
+    return job
+
+
+def prune_exports(days):
+    """Delete finished jobs older than days with their files, then stray export files.
+
+    Stray files (left by deleted jobs or interrupted runs) are only removed
+    once they are older than the cutoff, so files being written are kept.
+    Returns (jobs deleted, files deleted).
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    files = 0
+    expired = ExportJob.objects.filter(status__in=['DONE', 'FAILED'], finished_at__lt=cutoff)
+    for job in expired.exclude(file='').exclude(file=None).iterator():
+        job.file.delete(save=False)
+        files += 1
+    jobs, _ = expired.delete()
+    
+    directory = Path(settings.MEDIA_ROOT) / 'exports'
+    if directory.is_dir():
+        kept = set(ExportJob.objects.exclude(file='').exclude(file=None).values_list('file', flat=True))
+        for path in directory.iterdir():
+            if (path.is_file() and f"exports/{path.name}" not in kept
+                    and path.stat().st_mtime < cutoff.timestamp()):
+                path.unlink()
+                files += 1
+    return jobs, files
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for ExportJob model"""
+    
+    created_by_username = serializers.CharField(source='created_by.username', read_only=True)
+    progress = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'export_type', 'file_format', 'compress', 'params', 'status',
+            'total_rows', 'rows_written', 'progress', 'download_url', 'error',
+            'created_by', 'created_by_username', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = [
+            'id', 'status', 'total_rows', 'rows_written', 'error', 'created_by',
+            'created_at', 'started_at', 'finished_at'
+        ]
+    
+    def get_progress(self, obj):
+        return obj.progress()
+    
+    def get_download_url(self, obj):
+        if obj.status != 'DONE':
+            return None
+        request = self.context.get('request')
+        url = f"/api/exports/{obj.pk}/download/"
+        return request.build_absolute_uri(url) if request else url
+    
+    def validate_params(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("params must be an object of query parameters")
+        return value
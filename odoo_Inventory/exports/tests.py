@@ -0,0 +1,133 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from stock_ledger.models import StockMovement
+from users.models import User
+from .models import ExportJob
+from .runner import claim_next_job, prune_exports, run_job
+
+
+class ExportJobTests(TestCase):
+    """Queueing, claiming, running, downloading and pruning export jobs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='exporter', password='secret123', role='ADMIN')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = Path(media_root)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_job(self, **kwargs):
+        return ExportJob.objects.create(**{'export_type': 'MOVEMENTS', 'created_by': self.user, **kwargs})
+
+    def claimed_job(self):
+        self.create_job()
+        return claim_next_job('worker-1')
+
+    def test_claims_oldest_pending_job_once(self):
+        first = self.create_job()
+        self.create_job()
+        job = claim_next_job('worker-1')
+        self.assertEqual((job.pk, job.status, job.worker), (first.pk, 'RUNNING', 'worker-1'))
+        self.assertNotEqual(claim_next_job('worker-2').pk, first.pk)
+        self.assertIsNone(claim_next_job('worker-3'))
+
+    @override_settings(EXPORT_JOB_TIMEOUT_MINUTES=30)
+    def test_reclaims_stale_running_job(self):
+        stale = self.create_job(
+            status='RUNNING', worker='dead', rows_written=500, started_at=timezone.now() - timedelta(minutes=31)
+        )
+        self.create_job(status='RUNNING', worker='alive', started_at=timezone.now() - timedelta(minutes=5))
+        with self.assertLogs('exports.runner', 'WARNING'):
+            job = claim_next_job('worker-1')
+        self.assertEqual((job.pk, job.worker, job.rows_written), (stale.pk, 'worker-1', 0))
+        self.assertIsNone(claim_next_job('worker-2'))
+
+    @override_settings(EXPORT_JOB_TIMEOUT_MINUTES=30)
+    def test_reclaimed_job_is_finished_only_by_its_new_worker(self):
+        first = self.claimed_job()
+        ExportJob.objects.filter(pk=first.pk).update(started_at=timezone.now() - timedelta(minutes=31))
+        with self.assertLogs('exports.runner', 'WARNING'):
+            second = claim_next_job('worker-2')
+        self.assertEqual(second.pk, first.pk)
+
+        with self.assertLogs('exports.runner', 'WARNING'):
+            self.assertEqual(run_job(first).status, 'RUNNING')
+        job = ExportJob.objects.get(pk=first.pk)
+        self.assertEqual((job.status, job.worker), ('RUNNING', 'worker-2'))
+        self.assertFalse(job.file)
+        self.assertEqual(list((self.media_root / 'exports').iterdir()), [])
+
+        self.assertEqual(run_job(second).status, 'DONE')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.file.name), ('DONE', second.file.name))
+        self.assertEqual(
+            [path.name for path in (self.media_root / 'exports').iterdir()], [second.file.name.rsplit('/', 1)[-1]]
+        )
+
+    def test_queue_run_and_download(self):
+        response = self.client.post(
+            '/api/exports/', {'export_type': 'MOVEMENTS', 'params': {'movement_type': 'RECEIPT'}}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        job_id = response.json()['id']
+        self.assertEqual(self.client.get(f'/api/exports/{job_id}/download/').status_code, 409)
+
+        call_command('run_jobs', once=True, stdout=io.StringIO())
+        job = ExportJob.objects.get(pk=job_id)
+        receipts = StockMovement.objects.filter(movement_type='RECEIPT').count()
+        self.assertEqual((job.status, job.total_rows, job.rows_written), ('DONE', receipts, receipts))
+        self.assertTrue((self.media_root / job.file.name).exists())
+
+        response = self.client.get(f'/api/exports/{job_id}/download/')
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        response.close()
+        self.assertTrue(lines[0].startswith('id,created_at,movement_type,'))
+        self.assertEqual(len(lines), receipts + 1)
+        self.assertTrue(all(',RECEIPT,' in line for line in lines[1:]))
+
+    def test_failed_job_keeps_no_file(self):
+        job = self.claimed_job()
+        with mock.patch('exports.runner.iter_rows', side_effect=RuntimeError('replica went away')), \
+                self.assertLogs('exports.runner', 'ERROR'):
+            job = run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('FAILED', 'replica went away'))
+        self.assertFalse(job.file)
+        self.assertEqual(list((self.media_root / 'exports').iterdir()), [])
+        self.assertEqual(self.client.get(f'/api/exports/{job.pk}/download/').status_code, 409)
+
+    def test_prune_removes_old_jobs_and_stray_files(self):
+        old = run_job(self.claimed_job())
+        recent = run_job(self.claimed_job())
+        ExportJob.objects.filter(pk=old.pk).update(finished_at=timezone.now() - timedelta(days=8))
+        stray = self.media_root / 'exports' / 'movements-999.csv'
+        stray.write_text('id\n')
+        modified = time.time() - 8 * 86400
+        os.utime(stray, (modified, modified))
+
+        self.assertEqual(prune_exports(7), (1, 2))
+        self.assertFalse(ExportJob.objects.filter(pk=old.pk).exists())
+        self.assertFalse((self.media_root / old.file.name).exists())
+        self.assertFalse(stray.exists())
+        self.assertTrue((self.media_root / recent.file.name).exists())
@@ -0,0 +1,47 @@
+from rest_framework import viewsets, mixins, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.http import FileResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
+from .models import ExportJob
+from .serializers import ExportJobSerializer
+
+
+class ExportJobViewSet(SparseFieldsetMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """ViewSet for queueing export jobs and downloading their output"""
+    
+    serializer_class = ExportJobSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['export_type', 'status']
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
+    
+    def get_queryset(self):
+        # Admins can see all jobs, others only their own
+        queryset = ExportJob.objects.all()
+        if self.request.user.role == 'ADMIN':
+            return queryset
+        return queryset.filter(created_by=self.request.user)
+    
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download the finished export file"""
+        job = self.get_object()
+        
+        if job.status != 'DONE' or not job.file:
+            return Response(
+                {'error': f"Export is not ready (status: {job.status})"},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        content_type = 'application/gzip' if job.compress else None
+        return FileResponse(
+            job.file.open('rb'),
+            as_attachment=True,
+            filename=job.file.name.rsplit('/', 1)[-1],
+            content_type=content_type
+        )
@@ -116,51 +116,47 @@ export default function Dashboard() {
 
   useEffect(() => {
     if (kpis) {
-      fetchMasterData();
+      fetchMovementTrends();
     }
-  }, [selectedDays, kpis]);
+  }, [selectedDays]);
 
   const fetchDashboardData = async () => {
     try {
       setLoading(true);
-      const [kpiResponse, movementsResponse] = await Promise.all([
-        dashboardAPI.getKPIs(),
-        dashboardAPI.getRecentMovements(),
-      ]);
-      setKpis(kpiResponse.data);
-      const movementsData = movementsResponse.data.results || movementsResponse.data;
-      const movements = Array.isArray(movementsData) ? movementsData : [];
+      // All panels in one round trip; panel-specific params are prefixed with the panel name
+      const response = await dashboardAPI.getSummary({
+        'movement_trends.days': selectedDays,
+        'top_products.limit': 10,
+        'top_products.days': 30,
+      });
+      const summary = response.data;
+      setKpis(summary.kpis);
+      const movements = Array.isArray(summary.recent_movements) ? summary.recent_movements : [];
       setRecentMovements(movements.slice(0, 10));
+      setMovementTrends(Array.isArray(summary.movement_trends) ? summary.movement_trends : []);
+      setTopProducts(Array.isArray(summary.top_products) ? summary.top_products : []);
+      setCategoryValues(Array.isArray(summary.stock_value_by_category) ? summary.stock_value_by_category : []);
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
       toast.error('Failed to load dashboard data');
       setRecentMovements([]);
+      setMovementTrends([]);
+      setTopProducts([]);
+      setCategoryValues([]);
     } finally {
       setLoading(false);
     }
   };
   
-  const fetchMasterData = async () => {
+  const fetchMovementTrends = async () => {
     try {
-      const [trendsRes, topProductsRes, categoryValuesRes] = await Promise.all([
-        dashboardAPI.getMovementTrends({ days: selectedDays }),
-        dashboardAPI.getTopProducts({ limit: 10, days: 30 }),
-        dashboardAPI.getStockValueByCategory(),
-      ]);
-      
+      const trendsRes = await dashboardAPI.getMovementTrends({ days: selectedDays });
       const trends = trendsRes.data || [];
-      const products = topProductsRes.data || [];
-      const categories = categoryValuesRes.data || [];
-      
       setMovementTrends(Array.isArray(trends) ? trends : []);
-      setTopProducts(Array.isArray(products) ? products : []);
-      setCategoryValues(Array.isArray(categories) ? categories : []);
     } catch (error) {
       console.error('Error fetching chart data:', error);
       toast.error('Failed to load chart data');
       setMovementTrends([]);
-      setTopProducts([]);
-      setCategoryValues([]);
     }
   };
 
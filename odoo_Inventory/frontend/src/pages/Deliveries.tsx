@@ -21,7 +21,7 @@ import {
   SelectValue,
 } from '@/components/ui/select';
 
-interface Delivery {
+interface DeliveryHeader {
   id: number;
   delivery_number: string;
   customer_name: string;
@@ -37,6 +37,16 @@ interface Delivery {
   responsible_username?: string;
   created_by_username: string;
   validated_by_username: string | null;
+}
+
+// The list returns headers with line totals; lines only come with GET /deliveries/{id}/
+interface DeliveryListItem extends DeliveryHeader {
+  line_count: number;
+  total_quantity: string;
+  total_value: string;
+}
+
+interface Delivery extends DeliveryHeader {
   lines: DeliveryLine[];
 }
 
@@ -66,16 +76,16 @@ interface Location {
 }
 
 export default function Deliveries() {
-  const [deliveries, setDeliveries] = useState<Delivery[]>([]);
+  const [deliveries, setDeliveries] = useState<DeliveryListItem[]>([]);
   const [products, setProducts] = useState<Product[]>([]);
   const [locations, setLocations] = useState<Location[]>([]);
   const [users, setUsers] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [showDialog, setShowDialog] = useState(false);
-  const [editingDelivery, setEditingDelivery] = useState<Delivery | null>(null);
+  const [editingDelivery, setEditingDelivery] = useState<DeliveryListItem | null>(null);
   const [showFilters, setShowFilters] = useState(false);
-  const [viewDelivery, setViewDelivery] = useState<Delivery | null>(null);
+  const [viewDelivery, setViewDelivery] = useState<DeliveryListItem | null>(null);
   const [showViewDialog, setShowViewDialog] = useState(false);
   
   const [currentPage, setCurrentPage] = useState(1);
@@ -189,9 +199,17 @@ export default function Deliveries() {
     setCurrentPage(1);
   };
 
-  const handleOpenDialog = (delivery?: Delivery) => {
-    if (delivery) {
-      setEditingDelivery(delivery);
+  const handleOpenDialog = async (summary?: DeliveryListItem) => {
+    if (summary) {
+      let delivery: Delivery;
+      try {
+        delivery = (await deliveriesAPI.getDelivery(summary.id)).data;
+      } catch (error) {
+        console.error('Error fetching delivery:', error);
+        toast.error('Failed to load delivery');
+        return;
+      }
+      setEditingDelivery(summary);
       setFormData({
         delivery_number: delivery.delivery_number,
         customer_name: delivery.customer_name,
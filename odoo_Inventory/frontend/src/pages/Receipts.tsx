@@ -22,10 +22,12 @@ import {
   SelectValue,
 } from '@/components/ui/select';
 
-interface Receipt {
+interface ReceiptHeader {
   id: number;
   receipt_number: string;
   supplier: string;
+  supplier_name?: string;
+  destination_location?: number;
   receipt_date: string;
   expected_date: string;
   status: string;
@@ -34,7 +36,17 @@ interface Receipt {
   responsible_username?: string;
   created_by_name: string;
   validated_by_name: string | null;
-  items: ReceiptItem[];
+}
+
+// The list returns headers with line totals; lines only come with GET /receipts/{id}/
+interface ReceiptListItem extends ReceiptHeader {
+  line_count: number;
+  total_quantity: string;
+  total_value: string;
+}
+
+interface Receipt extends ReceiptHeader {
+  lines: ReceiptItem[];
 }
 
 interface ReceiptItem {
@@ -64,16 +76,16 @@ interface Location {
 }
 
 export default function Receipts() {
-  const [receipts, setReceipts] = useState<Receipt[]>([]);
+  const [receipts, setReceipts] = useState<ReceiptListItem[]>([]);
   const [products, setProducts] = useState<Product[]>([]);
   const [locations, setLocations] = useState<Location[]>([]);
   const [users, setUsers] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [showDialog, setShowDialog] = useState(false);
-  const [editingReceipt, setEditingReceipt] = useState<Receipt | null>(null);
+  const [editingReceipt, setEditingReceipt] = useState<ReceiptListItem | null>(null);
   const [showFilters, setShowFilters] = useState(false);
-  const [viewReceipt, setViewReceipt] = useState<Receipt | null>(null);
+  const [viewReceipt, setViewReceipt] = useState<ReceiptListItem | null>(null);
   const [showViewDialog, setShowViewDialog] = useState(false);
   
   const [currentPage, setCurrentPage] = useState(1);
@@ -156,18 +168,26 @@ export default function Receipts() {
     setCurrentPage(1);
   };
 
-  const handleOpenDialog = (receipt?: Receipt) => {
-    if (receipt) {
-      setEditingReceipt(receipt);
+  const handleOpenDialog = async (summary?: ReceiptListItem) => {
+    if (summary) {
+      let receipt: Receipt;
+      try {
+        receipt = (await receiptsAPI.getReceipt(summary.id)).data;
+      } catch (error) {
+        console.error('Error fetching receipt:', error);
+        toast.error('Failed to load receipt');
+        return;
+      }
+      setEditingReceipt(summary);
       setFormData({
         receipt_number: receipt.receipt_number,
-        supplier_name: receipt.supplier,
+        supplier_name: receipt.supplier_name || receipt.supplier || '',
         supplier_reference: '',
-        destination_location: '', // Will need location ID from backend
+        destination_location: receipt.destination_location?.toString() || '',
         expected_date: receipt.expected_date?.split('T')[0] || new Date().toISOString().split('T')[0],
         notes: receipt.notes,
         responsible: receipt.responsible?.toString() || '',
-        lines: receipt.items.map((item) => ({
+        lines: receipt.lines.map((item) => ({
           product: item.product,
           quantity: item.quantity.toString(),
           unit_price: item.unit_price.toString(),
@@ -21,7 +21,7 @@ import {
   SelectValue,
 } from '@/components/ui/select';
 
-interface Transfer {
+interface TransferHeader {
   id: number;
   transfer_number: string;
   source_location: number;
@@ -34,6 +34,16 @@ interface Transfer {
   notes: string;
   created_by_username: string;
   validated_by_username: string | null;
+}
+
+// The list returns headers with line totals; lines only come with GET /transfers/{id}/
+interface TransferListItem extends TransferHeader {
+  line_count: number;
+  total_quantity: string;
+  total_value: string;
+}
+
+interface Transfer extends TransferHeader {
   lines: TransferLine[];
 }
 
@@ -62,15 +72,15 @@ interface Location {
 }
 
 export default function Transfers() {
-  const [transfers, setTransfers] = useState<Transfer[]>([]);
+  const [transfers, setTransfers] = useState<TransferListItem[]>([]);
   const [products, setProducts] = useState<Product[]>([]);
   const [locations, setLocations] = useState<Location[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [showDialog, setShowDialog] = useState(false);
-  const [editingTransfer, setEditingTransfer] = useState<Transfer | null>(null);
+  const [editingTransfer, setEditingTransfer] = useState<TransferListItem | null>(null);
   const [showFilters, setShowFilters] = useState(false);
-  const [viewTransfer, setViewTransfer] = useState<Transfer | null>(null);
+  const [viewTransfer, setViewTransfer] = useState<TransferListItem | null>(null);
   const [showViewDialog, setShowViewDialog] = useState(false);
   
   const [currentPage, setCurrentPage] = useState(1);
@@ -178,9 +188,17 @@ export default function Transfers() {
     setCurrentPage(1);
   };
 
-  const handleOpenDialog = (transfer?: Transfer) => {
-    if (transfer) {
-      setEditingTransfer(transfer);
+  const handleOpenDialog = async (summary?: TransferListItem) => {
+    if (summary) {
+      let transfer: Transfer;
+      try {
+        transfer = (await transfersAPI.getTransfer(summary.id)).data;
+      } catch (error) {
+        console.error('Error fetching transfer:', error);
+        toast.error('Failed to load transfer');
+        return;
+      }
+      setEditingTransfer(summary);
       setFormData({
         transfer_number: transfer.transfer_number,
         source_location: transfer.source_location?.toString() || '',
@@ -141,6 +141,8 @@ export const dashboardAPI = {
     api.get('/dashboard/top-products/', { params }),
   getStockValueByCategory: () =>
     api.get('/dashboard/stock-value-by-category/'),
+  getSummary: (params?: any) =>
+    api.get('/dashboard/summary/', { params }),
 };
 
 // Stock Movements API
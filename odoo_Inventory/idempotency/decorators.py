@@ -0,0 +1,85 @@
+import functools
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from .models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """Hash of what the request asks for; a key may not be reused for a different request"""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode('utf-8')).hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored.fingerprint != fingerprint:
+        return Response(
+            {'error': f'{IDEMPOTENCY_HEADER} was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    response = Response(stored.response_body, status=stored.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(view_method):
+    """Replay the stored response when a request is retried with the same Idempotency-Key.
+
+    The view runs in a transaction together with storing its response, so
+    a document is never created without its key being recorded. Only
+    successful responses are stored; a failed request can be retried with
+    the same key. Keys are scoped per user and expire after
+    IDEMPOTENCY_KEY_TTL_HOURS.
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {'error': f'{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        fingerprint = request_fingerprint(request)
+        now = timezone.now()
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if stored and stored.expires_at > now:
+            return _replay(stored, fingerprint)
+        
+        try:
+            with transaction.atomic():
+                if stored:
+                    stored.delete()
+                response = view_method(self, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    IdempotencyKey.objects.create(
+                        user=request.user,
+                        key=key,
+                        fingerprint=fingerprint,
+                        status_code=response.status_code,
+                        # Encoded the way the JSON renderer will, so replays match the original
+                        response_body=json.loads(json.dumps(response.data, cls=JSONEncoder)),
+                        expires_at=now + timedelta(hours=getattr(settings, 'IDEMPOTENCY_KEY_TTL_HOURS', 24)),
+                    )
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+            if stored is None:
+                raise
+            return _replay(stored, fingerprint)
+        return response
+    
+    return wrapper
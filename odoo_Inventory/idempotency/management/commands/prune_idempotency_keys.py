@@ -0,0 +1,15 @@
+"""
+Management command to delete expired idempotency keys
+Run with: python manage.py prune_idempotency_keys
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from idempotency.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete idempotency keys past their expiry'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} expired idempotency keys'))
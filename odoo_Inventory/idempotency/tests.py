@@ -0,0 +1,77 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from products.models import Product
+from receipts.models import Receipt
+from stock_ledger.models import StockMovement
+from users.models import User
+from warehouse.models import Location
+from .models import IdempotencyKey
+
+
+class IdempotencyKeyTests(TestCase):
+    """Retried document requests replay the first response instead of running again"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='clerk', password='secret123', role='WAREHOUSE_STAFF')
+        cls.product = Product.objects.order_by('id').first()
+        cls.location = Location.objects.order_by('id').first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _create(self, key, number='IDEM-R1'):
+        payload = {
+            'receipt_number': number, 'supplier_name': 'Supplier', 'destination_location': self.location.id,
+            'lines': [{'product': self.product.id, 'quantity': '2'}],
+        }
+        return self.client.post('/api/receipts/', payload, format='json', headers={'Idempotency-Key': key})
+
+    def test_retried_create_is_replayed(self):
+        first = self._create('create-1')
+        retry = self._create('create-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Receipt.objects.filter(receipt_number='IDEM-R1').count(), 1)
+
+    def test_retried_validation_posts_stock_once(self):
+        self._create('create-1')
+        receipt = Receipt.objects.get(receipt_number='IDEM-R1')
+        url = f'/api/receipts/{receipt.id}/validate_receipt/'
+        responses = [self.client.post(url, headers={'Idempotency-Key': 'validate-1'}) for _ in range(2)]
+        self.assertEqual([r.status_code for r in responses], [200, 200])
+        self.assertEqual(responses[1].json()['status'], 'DONE')
+        self.assertEqual(StockMovement.objects.filter(document_reference='IDEM-R1').count(), 1)
+
+    def test_key_reused_for_different_request(self):
+        self._create('create-1')
+        self.assertEqual(self._create('create-1', number='IDEM-R2').status_code, 422)
+
+    def test_failed_requests_are_not_stored(self):
+        response = self.client.post(
+            '/api/transfers/', {'transfer_number': 'IDEM-T1'}, format='json', headers={'Idempotency-Key': 'bad-1'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_keys_expire(self):
+        self._create('create-1')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        # The expired key no longer replays, so the duplicate number is rejected
+        self.assertEqual(self._create('create-1').status_code, 400)
+
+        call_command('prune_idempotency_keys', stdout=StringIO())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_requests_without_key_are_unchanged(self):
+        self.client.post('/api/receipts/', {}, format='json')
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -0,0 +1,83 @@
+import re
+import time
+from collections import Counter
+
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:(?:%s|\?)\s*,\s*)+(?:%s|\?)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """Normalise SQL so queries differing only in literals compare equal"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _PLACEHOLDER_LIST.sub('(?+)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() hook that counts and times every query"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.fingerprints = Counter()
+        self.fingerprint_time = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            key = fingerprint(sql)
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[key] += 1
+            self.fingerprint_time[key] += elapsed
+            try:
+                self.statements[(sql, repr(params))] += 1
+            except Exception:
+                pass
+
+    @property
+    def duplicates(self):
+        """Number of queries that repeated an identical statement and parameters"""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    @property
+    def similar(self):
+        """Number of queries sharing a fingerprint with an earlier one (N+1 patterns)"""
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def top_fingerprints(self, limit=5):
+        """Most expensive fingerprints as (fingerprint, count, milliseconds)"""
+        ranked = sorted(self.fingerprints, key=lambda key: self.fingerprint_time[key], reverse=True)
+        return [
+            (key, self.fingerprints[key], round(self.fingerprint_time[key] * 1000, 2))
+            for key in ranked[:limit]
+        ]
+
+
+class RequestStats:
+    """Cost of one request, attached to it as request.instrumentation"""
+
+    def __init__(self, recorder, total):
+        self.queries = recorder.count
+        self.db_ms = recorder.duration * 1000
+        self.total_ms = total * 1000
+        self.app_ms = max(self.total_ms - self.db_ms, 0.0)
+        self.duplicates = recorder.duplicates
+        self.similar = recorder.similar
+        self.recorder = recorder
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries, {self.duplicates} duplicate"',
+            f'app;dur={self.app_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ])
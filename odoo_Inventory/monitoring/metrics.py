@@ -0,0 +1,92 @@
+"""
+Prometheus metrics for inventory operations.
+
+prometheus_client is optional: without it every metric is a no-op. When
+PROMETHEUS_MULTIPROC_DIR is set (e.g. under gunicorn) samples are written to
+files in that directory and /metrics aggregates all worker processes.
+"""
+import os
+import time
+from functools import wraps
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def inc(self, *args, **kwargs):
+        pass
+
+
+def _metric(kind, name, documentation, labelnames=(), **kwargs):
+    if prometheus_client is None:
+        return _NoopMetric()
+    return getattr(prometheus_client, kind)(name, documentation, labelnames, **kwargs)
+
+
+REQUEST_LATENCY = _metric(
+    'Histogram', 'inventory_http_request_duration_seconds',
+    'API request latency by view', ['view', 'method', 'status'], buckets=LATENCY_BUCKETS,
+)
+VALIDATION_DURATION = _metric(
+    'Histogram', 'inventory_validation_duration_seconds',
+    'Document validate() duration by document type', ['document_type'], buckets=LATENCY_BUCKETS,
+)
+MOVEMENTS_POSTED = _metric(
+    'Counter', 'inventory_stock_movements_posted_total',
+    'Stock movements posted to the ledger', ['movement_type'],
+)
+QUANT_UPDATE_DURATION = _metric(
+    'Histogram', 'inventory_quant_update_duration_seconds',
+    'Time spent updating a stock quant in the posting path, including row lock waits',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+CACHE_REQUESTS = _metric(
+    'Counter', 'inventory_cache_requests_total',
+    'Cache lookups by cache and result (hit/miss)', ['cache', 'result'],
+)
+
+
+def enabled():
+    return prometheus_client is not None
+
+
+def record_cache(cache, hit):
+    """Count one cache lookup; hit ratio = hit / (hit + miss) in PromQL"""
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def timed_validation(document_type):
+    """Decorator observing the duration of a document's validate() method"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                VALIDATION_DURATION.labels(document_type=document_type).observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def render_latest():
+    """Return (payload, content_type) for the current process or all processes"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
@@ -0,0 +1,160 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import exceptions
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from .instrumentation import QueryRecorder, RequestStats
+from . import metrics
+from .profiling import StackSampler, is_profiling_admin, run_cprofile, store_profile, summarize_samples
+
+logger = logging.getLogger(__name__)
+
+
+class RequestInstrumentationMiddleware:
+    """Record query count, DB time, duplicate queries and view time per request.
+
+    Opt-in via INSTRUMENTATION_ENABLED. A sampled request gets a Server-Timing
+    header, and requests over the slow thresholds are logged with the SQL
+    fingerprints that cost the most.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 1.0)
+        self.slow_ms = getattr(settings, 'INSTRUMENTATION_SLOW_REQUEST_MS', 500)
+        self.slow_queries = getattr(settings, 'INSTRUMENTATION_SLOW_QUERY_COUNT', 50)
+        self.server_timing = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', True)
+
+    def __call__(self, request):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            started = time.perf_counter()
+            response = self.get_response(request)
+            total = time.perf_counter() - started
+
+        stats = RequestStats(recorder, total)
+        request.instrumentation = stats
+
+        if self.server_timing:
+            response['Server-Timing'] = stats.server_timing()
+
+        if stats.total_ms >= self.slow_ms or stats.queries >= self.slow_queries:
+            self.log_slow(request, response, stats)
+        return response
+
+    def log_slow(self, request, response, stats):
+        lines = [
+            f"Slow request {request.method} {request.path} -> {response.status_code}: "
+            f"{stats.total_ms:.0f} ms total, {stats.db_ms:.0f} ms in {stats.queries} queries "
+            f"({stats.duplicates} duplicate, {stats.similar} repeated fingerprints)"
+        ]
+        for sql, count, ms in stats.recorder.top_fingerprints():
+            lines.append(f"  {count}x {ms} ms: {sql[:300]}")
+        logger.warning('\n'.join(lines))
+
+
+class MetricsMiddleware:
+    """Observe request latency per resolved view for the /metrics endpoint"""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False) or not metrics.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        # Unresolved paths share one label so 404 scans cannot explode cardinality
+        view = match.view_name if match and match.view_name else 'unresolved'
+        if view != 'metrics':
+            metrics.REQUEST_LATENCY.labels(
+                view=view, method=request.method, status=response.status_code
+            ).observe(elapsed)
+        return response
+
+
+def authenticated_user(request):
+    """User of a request before its view runs, or None.
+
+    Session users come from the authentication middleware; API credentials
+    go through the DRF authenticators, as the view will do after us.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    api_request = Request(request)
+    for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        if issubclass(authenticator_class, SessionAuthentication):
+            continue
+        try:
+            result = authenticator_class().authenticate(api_request)
+        except exceptions.APIException:
+            return None
+        if result is not None:
+            return result[0]
+    return None
+
+
+class ProfilingMiddleware:
+    """Profile requests to tell Python hot loops apart from SQL.
+
+    Admins can add ?profile=1 to run a request under cProfile; the user is
+    authenticated before profiling starts, and anyone else gets the normal
+    sampling. Every request is otherwise stack-sampled in the background and
+    kept when it takes longer than PROFILING_SLOW_REQUEST_MS. Profiles are
+    stored with the request's SQL fingerprints and listed at
+    /api/monitoring/profiles/.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'PROFILING_SLOW_REQUEST_MS', 1000)
+        self.sampler = StackSampler(getattr(settings, 'PROFILING_SAMPLE_INTERVAL_MS', 5) / 1000)
+
+    def __call__(self, request):
+        if request.path.startswith('/api/monitoring/'):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            started = time.perf_counter()
+            if request.GET.get('profile') == '1' and is_profiling_admin(authenticated_user(request)):
+                response, summary = run_cprofile(self.get_response, request)
+                mode = 'cprofile'
+            else:
+                samples = self.sampler.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    self.sampler.stop()
+                summary = None
+                mode = 'sampling'
+            total = time.perf_counter() - started
+
+        stats = RequestStats(recorder, total)
+        if mode == 'cprofile':
+            profile = store_profile(request, response, mode, summary, stats)
+            response['X-Profile-Id'] = profile['id']
+        elif stats.total_ms >= self.slow_ms:
+            store_profile(request, response, mode, summarize_samples(samples), stats)
+        return response
@@ -0,0 +1,153 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+PROFILES_CACHE_KEY = 'monitoring:profiles'
+MAX_STACK_DEPTH = 40
+TOP_FRAMES = 30
+
+
+def _short_path(filename):
+    """Show project files relative to BASE_DIR and libraries relative to site-packages"""
+    base = str(settings.BASE_DIR)
+    if filename.startswith(base):
+        return os.path.relpath(filename, base)
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    return filename
+
+
+class StackSampler:
+    """Background thread sampling the Python stacks of registered request threads.
+
+    Only threads currently serving a request are sampled, and the thread
+    sleeps between samples, so idle workers pay nothing.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.active = {}
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        counter = Counter()
+        with self.lock:
+            self.active[threading.get_ident()] = counter
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self.thread.start()
+        return counter
+
+    def stop(self):
+        with self.lock:
+            return self.active.pop(threading.get_ident(), Counter())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                targets = list(self.active.items())
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for ident, counter in targets:
+                frame = frames.get(ident)
+                if frame is not None:
+                    counter[self._stack(frame)] += 1
+
+    @staticmethod
+    def _stack(frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            frame = frame.f_back
+        return tuple(stack)
+
+
+def summarize_samples(samples):
+    """Top frames by inclusive and self sample counts"""
+    total = sum(samples.values())
+    inclusive = Counter()
+    leaf = Counter()
+    for stack, count in samples.items():
+        if stack:
+            leaf[stack[0]] += count
+        for frame in set(stack):
+            inclusive[frame] += count
+
+    def rows(counter):
+        return [
+            {
+                'frame': f"{_short_path(filename)}:{lineno} {name}",
+                'samples': count,
+                'percent': round(count * 100 / total, 1) if total else 0,
+            }
+            for (filename, lineno, name), count in counter.most_common(TOP_FRAMES)
+        ]
+
+    return {'samples': total, 'top_frames': rows(inclusive), 'top_self_frames': rows(leaf)}
+
+
+def is_profiling_admin(user):
+    """Users who may run cProfile with ?profile=1 and read stored profiles"""
+    return user is not None and user.is_authenticated and (user.role == 'ADMIN' or user.is_staff)
+
+
+def run_cprofile(func, *args):
+    """Run func under cProfile and return (result, summary of top functions)"""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args)
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, lineno, name), (cc, nc, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f"{_short_path(filename)}:{lineno} {name}",
+            'calls': nc,
+            'tottime_ms': round(tottime * 1000, 2),
+            'cumtime_ms': round(cumtime * 1000, 2),
+        })
+    by_cumtime = sorted(rows, key=lambda row: row['cumtime_ms'], reverse=True)
+    by_tottime = sorted(rows, key=lambda row: row['tottime_ms'], reverse=True)
+    return result, {'top_functions': by_cumtime[:TOP_FRAMES], 'top_self_functions': by_tottime[:TOP_FRAMES]}
+
+
+def store_profile(request, response, mode, summary, stats):
+    """Keep the profile with its SQL log in the cache, newest first"""
+    profile = {
+        'id': uuid.uuid4().hex[:12],
+        'mode': mode,
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'user': getattr(getattr(request, 'user', None), 'username', None),
+        'created_at': timezone.now().isoformat(),
+        'total_ms': round(stats.total_ms, 2),
+        'db_ms': round(stats.db_ms, 2),
+        'queries': stats.queries,
+        'duplicate_queries': stats.duplicates,
+        'sql': [
+            {'fingerprint': sql, 'count': count, 'ms': ms}
+            for sql, count, ms in stats.recorder.top_fingerprints(limit=10)
+        ],
+        **summary,
+    }
+    keep = getattr(settings, 'PROFILING_KEEP', 20)
+    profiles = cache.get(PROFILES_CACHE_KEY) or []
+    cache.set(PROFILES_CACHE_KEY, [profile] + profiles[:keep - 1], None)
+    return profile
+
+
+def get_profiles():
+    return cache.get(PROFILES_CACHE_KEY) or []
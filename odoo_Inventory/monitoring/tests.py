@@ -0,0 +1,69 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from users.models import User
+from .profiling import get_profiles, run_cprofile
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SLOW_REQUEST_MS=60000)
+class ProfilingMiddlewareTests(TestCase):
+    """?profile=1 runs cProfile only for admins"""
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch('monitoring.middleware.run_cprofile', wraps=run_cprofile)
+        self.run_cprofile = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def token_client(self, role):
+        user = User.objects.create_user(username=role.lower(), password='secret123', role=role)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    def test_admin_request_is_profiled(self):
+        response = self.token_client('ADMIN').get('/api/products/?profile=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('X-Profile-Id', response)
+        self.run_cprofile.assert_called_once()
+        self.assertEqual([profile['mode'] for profile in get_profiles()], ['cprofile'])
+
+    def test_non_admin_request_is_not_profiled(self):
+        response = self.token_client('WAREHOUSE_STAFF').get('/api/products/?profile=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Id', response)
+        self.run_cprofile.assert_not_called()
+        self.assertEqual(get_profiles(), [])
+
+    def test_anonymous_request_is_not_profiled(self):
+        response = APIClient().get('/api/products/?profile=1')
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn('X-Profile-Id', response)
+        self.run_cprofile.assert_not_called()
+        self.assertEqual(get_profiles(), [])
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SLOW_REQUEST_MS=60000)
+class ProfileViewTests(TestCase):
+    """Whoever may trigger ?profile=1 may also read the stored profiles"""
+
+    def client_for(self, **kwargs):
+        user = User.objects.create_user(password='secret123', **kwargs)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    def test_staff_user_can_profile_and_read_profiles(self):
+        cache.clear()
+        client = self.client_for(username='staffer', role='WAREHOUSE_STAFF', is_staff=True)
+        profile_id = client.get('/api/products/?profile=1')['X-Profile-Id']
+        self.assertEqual(client.get('/api/monitoring/profiles/').status_code, 200)
+        response = client.get(f'/api/monitoring/profiles/{profile_id}/')
+        self.assertEqual((response.status_code, response.json()['mode']), (200, 'cprofile'))
+
+    def test_other_users_are_refused(self):
+        client = self.client_for(username='picker', role='WAREHOUSE_STAFF')
+        self.assertEqual(client.get('/api/monitoring/profiles/').status_code, 403)
+        self.assertEqual(client.get('/api/monitoring/profiles/missing/').status_code, 403)
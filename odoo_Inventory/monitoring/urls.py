@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import metrics_view, ProfileListView, ProfileDetailView
+
+urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
+    path('api/monitoring/profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('api/monitoring/profiles/<str:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
+]
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.http import HttpResponse, Http404
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import metrics
+from .profiling import get_profiles, is_profiling_admin
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint"""
+    if not getattr(settings, 'METRICS_ENABLED', False) or not metrics.enabled():
+        raise Http404
+    payload, content_type = metrics.render_latest()
+    return HttpResponse(payload, content_type=content_type)
+
+
+class ProfileListView(APIView):
+    """Most recent request profiles (Admin or staff only)"""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        if not is_profiling_admin(request.user):
+            return Response({'error': 'Only admins can view profiles'}, status=status.HTTP_403_FORBIDDEN)
+        
+        data = []
+        for profile in get_profiles():
+            data.append({
+                key: profile[key]
+                for key in ('id', 'mode', 'method', 'path', 'status', 'user', 'created_at', 'total_ms', 'db_ms', 'queries')
+            })
+        return Response(data)
+
+
+class ProfileDetailView(APIView):
+    """Full profile with top frames and SQL (Admin or staff only)"""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request, profile_id):
+        if not is_profiling_admin(request.user):
+            return Response({'error': 'Only admins can view profiles'}, status=status.HTTP_403_FORBIDDEN)
+        
+        for profile in get_profiles():
+            if profile['id'] == profile_id:
+                return Response(profile)
+        return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,31 @@
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def error_response(exc):
+    """JSON error response matching DRF's for an APIException"""
+    response = JsonResponse({'detail': str(exc.detail)}, status=exc.status_code)
+    if exc.status_code == 401:
+        response['WWW-Authenticate'] = 'Token'
+    return response
+
+
+async def authenticate(request):
+    """Authenticate a plain Django async view with the DRF authentication classes.
+
+    Returns (user, None) or (None, error response).
+    """
+    drf_request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    try:
+        user = await sync_to_async(lambda: drf_request.user)()
+    except exceptions.APIException as e:
+        return None, error_response(e)
+    if not user or not user.is_authenticated:
+        return None, error_response(exceptions.NotAuthenticated())
+    return user, None
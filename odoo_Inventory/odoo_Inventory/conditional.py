@@ -0,0 +1,47 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+
+def table_state(model):
+    """(row count, latest updated_at) for a table, in one aggregate query"""
+    state = model.objects.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+    return state['count'], state['last_modified']
+
+
+def list_etag(request, models):
+    """ETag for a list that only depends on the given tables.
+
+    The row count catches deletes, which leave MAX(updated_at) unchanged.
+    The URL and media type are part of the ETag because filters, pages and
+    formats of the same list are different representations.
+    """
+    states = [table_state(model) for model in models]
+    parts = [request.get_full_path(), getattr(request, 'accepted_media_type', '') or '']
+    parts += [f'{model._meta.db_table}:{count}:{modified.isoformat() if modified else ""}'
+              for model, (count, modified) in zip(models, states)]
+    return quote_etag(hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()[:32])
+
+
+class ConditionalListMixin:
+    """Answer list requests with 304 Not Modified while the client's copy is current.
+
+    conditional_models lists every table the list representation reads,
+    including related tables behind counts and names. Only ETag is sent:
+    a delete leaves MAX(updated_at) unchanged, so Last-Modified and
+    If-Modified-Since would miss it, while the ETag's row count does not.
+    """
+    
+    conditional_models = ()
+    
+    def list(self, request, *args, **kwargs):
+        etag = list_etag(request, self.conditional_models)
+        
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        # Let browsers keep the list but revalidate it on every use
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,67 @@
+"""
+orjson-based JSON renderer and parser for the API.
+
+orjson is optional: without it both classes behave exactly like DRF's
+JSONRenderer / JSONParser. With it, output matches DRF's for the default
+settings except for floats: exponents are written without a sign or
+leading zero (1e16 and 1e-7 instead of 1e+16 and 1e-07), and NaN and
+infinity render as null where DRF raises. Values orjson does not handle
+natively (Decimal, datetime, lazy strings, ...) go through DRF's encoder
+hook, so DecimalField strings are passed through untouched and raw
+Decimals and datetimes are formatted exactly as before. Data orjson
+refuses, such as integers beyond 64 bits, is rendered by DRF instead.
+When parsing, such integers may not round-trip exactly.
+"""
+import io
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_encode_default = JSONEncoder().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson when installed"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Pretty printing (browsable API, ?indent) keeps the stdlib path
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, so the output stays a JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser using orjson when installed"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Raise the usual ParseError
+            return super().parse(io.BytesIO(content), media_type, parser_context)
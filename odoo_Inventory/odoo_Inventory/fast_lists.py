@@ -0,0 +1,126 @@
+"""
+Values-based fast path for read-only list endpoints.
+
+ValuesRowMapper reads a ModelSerializer's fields once and compiles them into
+a .values() query with flattened column aliases plus a row -> dict mapping.
+List pages are then built from plain dicts of column values instead of
+model instances walked through DRF field machinery, while producing the
+same JSON as the serializer.
+"""
+from django.db.models import ForeignKey
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.response import Response
+from .fieldsets import FIELDS_PARAM, EXPAND_PARAM, parse_paths
+
+
+# Fields whose to_representation is the identity for values read from the database
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class ValuesRowMapper:
+    """Compile a ModelSerializer into a .values() query and a row mapping.
+
+    methods maps each SerializerMethodField to a function of the raw row;
+    annotations adds the expressions those functions need to the query, and
+    requires names the row keys (lookups or annotations) each method reads.
+    """
+
+    def __init__(self, serializer_class, methods=None, annotations=None, requires=None):
+        self.serializer_class = serializer_class
+        self.methods = methods or {}
+        self.annotations = annotations or {}
+        self.requires = requires or {}
+        self.extra_lookups = ()
+
+    @cached_property
+    def columns(self):
+        """(name, lookup, convert, guards) per output field, in serializer order"""
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                columns.append((name, None, self.methods[name], ()))
+                continue
+            path = field.source.split('.')
+            convert = None if isinstance(field, PASSTHROUGH_FIELDS) else field.to_representation
+            columns.append((name, '__'.join(path), convert, self._guards(model, path)))
+        return columns
+
+    def _guards(self, model, path):
+        # DRF leaves a field out when a nullable relation on its source is empty
+        guards = []
+        for depth, attr in enumerate(path[:-1]):
+            relation = model._meta.get_field(attr)
+            if isinstance(relation, ForeignKey) and relation.null:
+                guards.append('__'.join(path[:depth + 1]))
+            model = relation.related_model
+        return tuple(guards)
+
+    @cached_property
+    def lookups(self):
+        lookups = []
+        for _, lookup, _, guards in self.columns:
+            for column in (lookup, *guards):
+                if column and column not in lookups:
+                    lookups.append(column)
+        for column in self.extra_lookups:
+            if column not in lookups:
+                lookups.append(column)
+        return lookups
+
+    def only(self, names):
+        """A mapper for just the named fields, e.g. from ?fields="""
+        mapper = ValuesRowMapper(self.serializer_class, self.methods, self.annotations, self.requires)
+        mapper.columns = [column for column in self.columns if column[0] in names]
+        # Method fields still need the columns they compute from
+        required = {
+            key for name, lookup, _, _ in mapper.columns if lookup is None
+            for key in self.requires.get(name, ())
+        }
+        mapper.annotations = {key: value for key, value in self.annotations.items() if key in required}
+        mapper.extra_lookups = tuple(sorted(required - set(self.annotations)))
+        return mapper
+
+    def values(self, queryset):
+        """Queryset of raw rows for the mapped fields"""
+        return queryset.values(*self.lookups, **self.annotations)
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookup, convert, guards in self.columns:
+            if lookup is None:
+                data[name] = convert(row)
+                continue
+            if guards and any(row[guard] is None for guard in guards):
+                continue
+            value = row[lookup]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+
+class ValuesListMixin:
+    """Build list responses with a ValuesRowMapper instead of the serializer"""
+
+    values_mapper = None
+
+    def list(self, request, *args, **kwargs):
+        # Expansions nest other serializers; leave those to the serializer path
+        if request.query_params.get(EXPAND_PARAM):
+            return super().list(request, *args, **kwargs)
+        mapper = self.values_mapper
+        fields = parse_paths(request.query_params.get(FIELDS_PARAM))
+        if fields:
+            mapper = mapper.only(fields)
+        queryset = mapper.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([mapper.to_representation(row) for row in page])
+        return Response([mapper.to_representation(row) for row in queryset])
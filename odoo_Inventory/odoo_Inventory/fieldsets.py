@@ -0,0 +1,146 @@
+"""
+Sparse fieldsets and optional expansions for API reads.
+
+GET requests may pass ?fields=id,status,lines.quantity to keep only the
+named fields (dotted names reach into nested serializers) and
+?expand=destination_location to replace a foreign key with the nested
+serializer listed in the serializer's Meta.expandable_fields.
+
+The select_related and prefetch_related lookups of a view are derived from
+the fields left on its serializer, so relations behind pruned fields are
+never loaded.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_paths(value):
+    """'id,lines.quantity' -> {'id': {}, 'lines': {'quantity': {}}}; None when empty"""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree or None
+
+
+def _nested(field):
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def apply_fieldsets(serializer, fields=None, expand=None):
+    """Expand, then prune a serializer's fields in place. Unknown names are ignored."""
+    serializer = _nested(serializer) or serializer
+    fields = fields or {}
+    expand = expand or {}
+
+    expandable = getattr(getattr(serializer, 'Meta', None), 'expandable_fields', {})
+    for name in expand:
+        if name in expandable:
+            source = serializer.fields[name].source if name in serializer.fields else name
+            options = {'source': source} if source != name else {}
+            serializer.fields[name] = expandable[name](read_only=True, **options)
+
+    if fields:
+        for name in list(serializer.fields):
+            if name not in fields and name not in expand:
+                del serializer.fields[name]
+
+    for name, field in serializer.fields.items():
+        nested = _nested(field)
+        if nested is not None and (fields.get(name) or expand.get(name)):
+            apply_fieldsets(nested, fields.get(name), expand.get(name))
+    return serializer
+
+
+def _walk(model, names):
+    """Leading relation names of a source path, and whether any is to-many"""
+    relations = []
+    many = False
+    for name in names:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        relations.append(name)
+        many = many or field.many_to_many or field.one_to_many
+        model = field.related_model
+    return relations, many
+
+
+def related_lookups(serializer, prefix='', prefetching=False):
+    """(select_related, prefetch_related) lookups needed by a serializer's fields.
+
+    SerializerMethodFields are opaque; views keep whatever they need in
+    their base queryset.
+    """
+    serializer = _nested(serializer) or serializer
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    select, prefetch = [], []
+    if model is None:
+        return select, prefetch
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            continue
+        names = field.source.split('.')
+        nested = _nested(field)
+        # A plain field reads its last name as an attribute; nested serializers
+        # and to-many pk lists load the relation itself
+        if nested is None and not isinstance(field, serializers.ManyRelatedField):
+            names = names[:-1]
+        relations, many = _walk(model, names)
+        if not relations:
+            continue
+
+        lookup = prefix + '__'.join(relations)
+        to_many = prefetching or many
+        target = prefetch if to_many else select
+        if lookup not in target:
+            target.append(lookup)
+        if nested is not None:
+            nested_select, nested_prefetch = related_lookups(nested, lookup + '__', to_many)
+            select.extend(item for item in nested_select if item not in select)
+            prefetch.extend(item for item in nested_prefetch if item not in prefetch)
+    return select, prefetch
+
+
+class SparseFieldsetMixin:
+    """Honour ?fields= and ?expand= on reads and load only the relations they need"""
+
+    def get_fieldsets(self):
+        """(fields, expand) trees from the query string of a GET request"""
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return None, None
+        return (
+            parse_paths(request.query_params.get(FIELDS_PARAM)),
+            parse_paths(request.query_params.get(EXPAND_PARAM)),
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields, expand = self.get_fieldsets()
+        if fields or expand:
+            apply_fieldsets(serializer, fields, expand)
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select, prefetch = related_lookups(self.get_serializer())
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.csrf import CsrfViewMiddleware
+from rest_framework.permissions import SAFE_METHODS
+from .db_routers import pin_to_primary, replica_configured
+
+
+def is_token_api_request(request):
+    """API calls carrying a DRF token never use the session, CSRF or messages"""
+    return (
+        request.path_info.startswith('/api/')
+        and request.META.get('HTTP_AUTHORIZATION', '').startswith('Token ')
+    )
+
+
+class TokenAPISkipMixin:
+    """Pass token-authenticated API requests straight to the next middleware.
+
+    Browser and admin traffic keeps the full stack. Disable with
+    LEAN_API_MIDDLEWARE=False.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.lean_api = getattr(settings, 'LEAN_API_MIDDLEWARE', True)
+
+    def __call__(self, request):
+        if self.lean_api and is_token_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class LeanSessionMiddleware(TokenAPISkipMixin, SessionMiddleware):
+    pass
+
+
+class LeanCsrfViewMiddleware(TokenAPISkipMixin, CsrfViewMiddleware):
+    pass
+
+
+class LeanAuthenticationMiddleware(TokenAPISkipMixin, AuthenticationMiddleware):
+    pass
+
+
+class LeanMessageMiddleware(TokenAPISkipMixin, MessageMiddleware):
+    pass
+
+
+class ReplicaStickinessMiddleware:
+    """Pin users to the primary database for a few seconds after they change data"""
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            # DRF authenticates inside the view and stores the user on the request
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user)
+        return response
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -56,19 +57,34 @@ INSTALLED_APPS = [
     'transfers',
     'adjustments',
     'dashboard',
+    'exports',
+    'benchmarks',
+    'monitoring',
+    'sync',
+    'idempotency',
+    'caching',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.middleware.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'odoo_Inventory.middleware.LeanSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'odoo_Inventory.middleware.LeanCsrfViewMiddleware',
+    'odoo_Inventory.middleware.LeanAuthenticationMiddleware',
+    # After authentication, so ?profile=1 can be limited to admins up front
+    'monitoring.middleware.ProfilingMiddleware',
+    'odoo_Inventory.middleware.LeanMessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'odoo_Inventory.middleware.ReplicaStickinessMiddleware',
 ]
 
+# Token-authenticated /api/ requests skip the session, CSRF, auth and messages
+# middleware above; the admin and browser UI keep the full stack
+LEAN_API_MIDDLEWARE = os.getenv('LEAN_API_MIDDLEWARE', 'True') == 'True'
+
 ROOT_URLCONF = 'odoo_Inventory.urls'
 
 TEMPLATES = [
@@ -100,9 +116,52 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Required behind PgBouncer in transaction pooling mode (used by exports)
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True',
     }
 }
 
+# Background workers (run_jobs) get their own pool size; everything else is web
+WORKER_COMMANDS = ['run_jobs']
+DB_PROCESS_ROLE = os.getenv(
+    'DB_PROCESS_ROLE',
+    'worker' if len(sys.argv) > 1 and sys.argv[1] in WORKER_COMMANDS else 'web',
+)
+
+if os.getenv('DB_POOL', 'False') == 'True':
+    # psycopg 3 connection pool (pip install "psycopg[pool]"); replaces CONN_MAX_AGE
+    prefix = 'DB_WORKER_POOL' if DB_PROCESS_ROLE == 'worker' else 'DB_POOL'
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv(f'{prefix}_MIN_SIZE', '1' if DB_PROCESS_ROLE == 'worker' else '2')),
+            'max_size': int(os.getenv(f'{prefix}_MAX_SIZE', '2' if DB_PROCESS_ROLE == 'worker' else '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        },
+    }
+else:
+    # Persistent connections, checked before reuse
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replica for reporting endpoints (ledger, stock quants, dashboard, exports).
+# Unset values fall back to the primary's, so DB_REPLICA_HOST=localhost gives a
+# second alias on the same database for local testing.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['odoo_Inventory.db_routers.ReplicaRouter']
+
+# Seconds a user keeps reading from the primary after changing data
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -168,7 +227,7 @@ CORS_ALLOWED_ORIGINS = [
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -179,9 +238,74 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'odoo_Inventory.fast_json.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'odoo_Inventory.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
 }
 
+# Queries the async dashboard views run at once per request (each needs its
+# own connection); 1 runs them one after another
+DASHBOARD_MAX_CONCURRENT_QUERIES = int(os.getenv('DASHBOARD_MAX_CONCURRENT_QUERIES', '4'))
+
+# Stock change events for /api/stock-events/ (SSE), opt-in. 'postgres' uses
+# LISTEN/NOTIFY (one NOTIFY per posted movement) so every process sees every
+# change; 'inprocess' only sees changes posted by the same process and is
+# used automatically on other databases
+STOCK_EVENTS_ENABLED = os.getenv('STOCK_EVENTS_ENABLED', 'False') == 'True'
+STOCK_EVENTS_BACKEND = os.getenv('STOCK_EVENTS_BACKEND', 'postgres')
+STOCK_EVENTS_HEARTBEAT = int(os.getenv('STOCK_EVENTS_HEARTBEAT', '15'))
+
+# Background exports: a job RUNNING longer than the timeout is treated as
+# abandoned and claimed again; prune_exports keeps finished exports this long
+EXPORT_JOB_TIMEOUT_MINUTES = int(os.getenv('EXPORT_JOB_TIMEOUT_MINUTES', '60'))
+EXPORT_RETENTION_DAYS = int(os.getenv('EXPORT_RETENTION_DAYS', '7'))
+
+# Seconds a sync change must be committed before /api/sync/changes/ hands it out
+SYNC_SETTLE_SECONDS = int(os.getenv('SYNC_SETTLE_SECONDS', '2'))
+
+# Hours a stored Idempotency-Key response is replayed for retries
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+
+# Response cache for the product, stock quant and location lists (opt-in).
+# Entries are keyed by per-model versions bumped after every committed write
+# and expire after RESPONSE_CACHE_TTL seconds, in each process and shared.
+# RESPONSE_CACHE_SHARED_CACHE may name a CACHES alias shared by all workers.
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'False') == 'True'
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '500'))
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+RESPONSE_CACHE_SHARED_CACHE = os.getenv('RESPONSE_CACHE_SHARED_CACHE') or None
+
+# Token authentication cache: per-process LRU, plus an optional shared cache
+# alias (e.g. a Redis-backed entry in CACHES) so all workers benefit
+TOKEN_AUTH_CACHE_SIZE = int(os.getenv('TOKEN_AUTH_CACHE_SIZE', '10000'))
+TOKEN_AUTH_CACHE_TTL = int(os.getenv('TOKEN_AUTH_CACHE_TTL', '30'))
+TOKEN_AUTH_SHARED_CACHE = os.getenv('TOKEN_AUTH_SHARED_CACHE') or None
+
+# Per-request SQL and timing instrumentation (opt-in)
+INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'False') == 'True'
+INSTRUMENTATION_SAMPLE_RATE = float(os.getenv('INSTRUMENTATION_SAMPLE_RATE', '1.0'))
+INSTRUMENTATION_SLOW_REQUEST_MS = int(os.getenv('INSTRUMENTATION_SLOW_REQUEST_MS', '500'))
+INSTRUMENTATION_SLOW_QUERY_COUNT = int(os.getenv('INSTRUMENTATION_SLOW_QUERY_COUNT', '50'))
+INSTRUMENTATION_SERVER_TIMING = os.getenv('INSTRUMENTATION_SERVER_TIMING', 'True') == 'True'
+
+# Prometheus metrics at /metrics (requires prometheus-client). Set
+# PROMETHEUS_MULTIPROC_DIR to aggregate across worker processes.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+
+# Request profiling: ?profile=1 (admins) runs cProfile, slower requests are
+# stack-sampled automatically. Profiles are listed at /api/monitoring/profiles/
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SLOW_REQUEST_MS = int(os.getenv('PROFILING_SLOW_REQUEST_MS', '1000'))
+PROFILING_SAMPLE_INTERVAL_MS = int(os.getenv('PROFILING_SAMPLE_INTERVAL_MS', '5'))
+PROFILING_KEEP = int(os.getenv('PROFILING_KEEP', '20'))
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
@@ -32,6 +32,9 @@ urlpatterns = [
     path('api/transfers/', include('transfers.urls')),
     path('api/adjustments/', include('adjustments.urls')),
     path('api/dashboard/', include('dashboard.urls')),
+    path('api/exports/', include('exports.urls')),
+    path('api/sync/', include('sync.urls')),
+    path('', include('monitoring.urls')),
 ]
 
 if settings.DEBUG:
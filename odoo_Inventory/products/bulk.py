@@ -0,0 +1,84 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F, Value, IntegerField, DecimalField
+from django.db.models.functions import Cast, Greatest, Round
+from django.utils import timezone
+from .models import Product
+from .serializers import BULK_UPDATE_FIELDS
+from .signals import products_bulk_updated
+
+
+BULK_BATCH_SIZE = 1000
+
+DECIMAL_FIELDS = {'cost_price', 'selling_price'}
+
+
+def _notify(product_ids, fields):
+    transaction.on_commit(lambda: products_bulk_updated.send(
+        sender=Product, product_ids=product_ids, fields=fields
+    ))
+
+
+def apply_items(items):
+    """Apply explicit per-SKU values with bulk_update.
+
+    Raises ValueError listing unknown SKUs; nothing is written in that case.
+    """
+    products = Product.objects.in_bulk([item['sku'] for item in items], field_name='sku')
+    missing = [item['sku'] for item in items if item['sku'] not in products]
+    if missing:
+        raise ValueError(f"Unknown SKUs: {', '.join(missing[:50])}")
+    
+    now = timezone.now()
+    fields = set()
+    for item in items:
+        product = products[item['sku']]
+        for field in BULK_UPDATE_FIELDS:
+            if field in item:
+                setattr(product, field, item[field])
+                fields.add(field)
+        product.updated_at = now
+    
+    if not fields:
+        return 0
+    fields = sorted(fields)
+    
+    with transaction.atomic():
+        Product.objects.bulk_update(list(products.values()), fields + ['updated_at'], batch_size=BULK_BATCH_SIZE)
+        _notify([p.pk for p in products.values()], fields)
+    return len(products)
+
+
+def _expression(field, op, value):
+    """Build the SQL expression for one field change, rounded and clamped at zero"""
+    if field in DECIMAL_FIELDS:
+        output = DecimalField(max_digits=10, decimal_places=2)
+    else:
+        output = IntegerField()
+    
+    if op == 'set':
+        expression = Value(value, output_field=DecimalField(max_digits=12, decimal_places=4))
+    elif op == 'add':
+        expression = F(field) + Value(value, output_field=DecimalField(max_digits=12, decimal_places=4))
+    else:  # percent
+        factor = 1 + value / Decimal(100)
+        expression = F(field) * Value(factor, output_field=DecimalField(max_digits=14, decimal_places=6))
+    
+    precision = 2 if field in DECIMAL_FIELDS else 0
+    expression = Cast(Round(expression, precision), output_field=output)
+    return Greatest(expression, Value(0), output_field=output)
+
+
+def apply_changes(queryset, changes):
+    """Apply field expressions to every product in queryset with one UPDATE"""
+    updates = {
+        field: _expression(field, change['op'], change['value'])
+        for field, change in changes.items()
+    }
+    updates['updated_at'] = timezone.now()
+    
+    with transaction.atomic():
+        product_ids = list(queryset.values_list('pk', flat=True))
+        count = queryset.update(**updates)
+        _notify(product_ids, sorted(changes))
+    return count
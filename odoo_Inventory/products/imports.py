@@ -0,0 +1,263 @@
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from django.db import DataError, IntegrityError, transaction
+from .models import Category, UnitOfMeasure, Product
+from .signals import products_bulk_updated
+
+
+IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+# Columns accepted in an import file. category / uom are resolved by name.
+IMPORT_FIELDS = [
+    'sku', 'name', 'description', 'category', 'uom', 'cost_price', 'selling_price',
+    'min_stock_level', 'reorder_quantity', 'barcode', 'weight', 'is_active',
+]
+REQUIRED_FIELDS = ['sku', 'name', 'category', 'uom']
+
+PRICE_LIMIT = Decimal('100000000')  # max_digits=10, decimal_places=2
+INTEGER_LIMIT = 2147483647  # IntegerField on PostgreSQL
+
+
+def detect_format(filename):
+    """Guess the import format from a file name"""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    if name.endswith('.csv'):
+        return 'csv'
+    return None
+
+
+def iter_records(stream, file_format):
+    """Yield dicts from a binary CSV or NDJSON stream without loading it all"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if file_format == 'csv':
+        yield from csv.DictReader(text)
+    elif file_format == 'ndjson':
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            # Malformed lines are passed through as None and reported per row
+            yield record if isinstance(record, dict) else None
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and value.strip() == '')
+
+
+def _decimal(value, field, errors, limit=PRICE_LIMIT):
+    try:
+        result = Decimal(str(value).strip()).quantize(Decimal('0.01'))
+        if not result.is_finite():
+            raise InvalidOperation
+    except (InvalidOperation, ValueError):
+        errors[field] = 'A valid number is required.'
+        return None
+    if result < 0:
+        errors[field] = 'Ensure this value is greater than or equal to 0.'
+    elif result >= limit:
+        errors[field] = 'Ensure there are no more than 10 digits in total.'
+    return result
+
+
+def _integer(value, field, errors):
+    try:
+        result = int(str(value).strip())
+    except ValueError:
+        errors[field] = 'A valid integer is required.'
+        return None
+    if result < 0:
+        errors[field] = 'Ensure this value is greater than or equal to 0.'
+    elif result > INTEGER_LIMIT:
+        errors[field] = f'Ensure this value is less than or equal to {INTEGER_LIMIT}.'
+    return result
+
+
+def _boolean(value, field, errors):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'y'):
+        return True
+    if text in ('0', 'false', 'no', 'n'):
+        return False
+    errors[field] = 'Must be a valid boolean.'
+    return None
+
+
+class ProductImporter:
+    """Validate product records in chunks and upsert them by SKU.
+
+    Category and UOM names are resolved through maps loaded once up front,
+    so validation itself does not touch the database.
+    """
+
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.categories = dict(Category.objects.values_list('name', 'id'))
+        self.uoms = dict(UnitOfMeasure.objects.values_list('name', 'id'))
+        # Abbreviations are accepted too, as long as they are unambiguous
+        abbreviations = {}
+        for abbreviation, uom_id in UnitOfMeasure.objects.values_list('abbreviation', 'id'):
+            abbreviations.setdefault(abbreviation, []).append(uom_id)
+        for abbreviation, ids in abbreviations.items():
+            if len(ids) == 1:
+                self.uoms.setdefault(abbreviation, ids[0])
+
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+
+    def _add_error(self, row_number, sku, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'sku': sku, 'errors': errors})
+
+    def clean(self, record):
+        """Return (Product, errors) for a single import record"""
+        errors = {}
+        values = {}
+
+        for field in REQUIRED_FIELDS:
+            if _blank(record.get(field)):
+                errors[field] = 'This field is required.'
+
+        sku = str(record.get('sku') or '').strip()
+        name = str(record.get('name') or '').strip()
+        if len(sku) > 50:
+            errors['sku'] = 'Ensure this field has no more than 50 characters.'
+        if len(name) > 200:
+            errors['name'] = 'Ensure this field has no more than 200 characters.'
+
+        category = record.get('category')
+        if not _blank(category):
+            values['category_id'] = self.categories.get(str(category).strip())
+            if values['category_id'] is None:
+                errors['category'] = f"Unknown category '{category}'."
+
+        uom = record.get('uom')
+        if not _blank(uom):
+            values['uom_id'] = self.uoms.get(str(uom).strip())
+            if values['uom_id'] is None:
+                errors['uom'] = f"Unknown unit of measure '{uom}'."
+
+        for field in ('cost_price', 'selling_price', 'weight'):
+            if not _blank(record.get(field)):
+                values[field] = _decimal(record[field], field, errors)
+        for field in ('min_stock_level', 'reorder_quantity'):
+            if not _blank(record.get(field)):
+                values[field] = _integer(record[field], field, errors)
+        if not _blank(record.get('is_active')):
+            values['is_active'] = _boolean(record['is_active'], 'is_active', errors)
+
+        if not _blank(record.get('description')):
+            values['description'] = str(record['description'])
+        if not _blank(record.get('barcode')):
+            values['barcode'] = str(record['barcode']).strip()
+            if len(values['barcode']) > 50:
+                errors['barcode'] = 'Ensure this field has no more than 50 characters.'
+
+        if errors:
+            return None, errors
+        return Product(sku=sku, name=name, **values), None
+
+    def _present_fields(self, record):
+        """Columns this record sets; missing or blank ones keep the stored value"""
+        fields = [
+            field for field in IMPORT_FIELDS if field != 'sku' and not _blank(record.get(field))
+        ]
+        return tuple(fields + ['updated_at'])
+
+    def _upsert(self, products, update_fields):
+        existing = set(Product.objects.filter(
+            sku__in=[p.sku for p in products]
+        ).values_list('sku', flat=True))
+        Product.objects.bulk_create(
+            products,
+            update_conflicts=True,
+            unique_fields=['sku'],
+            update_fields=list(update_fields),
+        )
+        self.updated += len(existing)
+        self.created += len(products) - len(existing)
+        # bulk_create skips post_save; listeners (sync change log, caches) hear it here.
+        # Upserts set primary keys on PostgreSQL and SQLite.
+        product_ids = [product.pk for product in products if product.pk]
+        transaction.on_commit(lambda: products_bulk_updated.send(
+            sender=Product, product_ids=product_ids, fields=list(update_fields)
+        ))
+
+    def _flush(self, chunk):
+        if not chunk:
+            return
+        # Postgres rejects an upsert that touches the same row twice; later rows
+        # win, and columns only an earlier row set are carried over
+        by_sku = {}
+        for row_number, product, fields in chunk:
+            if product.sku in by_sku:
+                _, earlier, earlier_fields = by_sku[product.sku]
+                for field in set(earlier_fields) - set(fields):
+                    attname = Product._meta.get_field(field).attname
+                    setattr(product, attname, getattr(earlier, attname))
+                fields = tuple(f for f in IMPORT_FIELDS + ['updated_at'] if f in fields or f in earlier_fields)
+            by_sku[product.sku] = (row_number, product, fields)
+
+        # One upsert per set of columns, so a row never overwrites columns it left out
+        groups = {}
+        for row_number, product, fields in by_sku.values():
+            groups.setdefault(fields, []).append((row_number, product))
+
+        for fields, rows in groups.items():
+            try:
+                with transaction.atomic():
+                    self._upsert([product for _, product in rows], fields)
+            except (IntegrityError, DataError):
+                # Isolate the offending rows (e.g. a barcode used by another product)
+                for row_number, product in rows:
+                    try:
+                        with transaction.atomic():
+                            self._upsert([product], fields)
+                    except (IntegrityError, DataError) as e:
+                        self._add_error(row_number, product.sku, {'non_field_errors': str(e).strip()})
+
+    def run(self, records):
+        chunk = []
+        row_number = 0
+        for row_number, record in enumerate(records, start=1):
+            if record is None:
+                self._add_error(row_number, None, {'non_field_errors': 'Invalid JSON object.'})
+                continue
+            product, errors = self.clean(record)
+            if errors:
+                self._add_error(row_number, record.get('sku'), errors)
+                continue
+
+            chunk.append((row_number, product, self._present_fields(record)))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        self._flush(chunk)
+
+        return {
+            'total': row_number,
+            'created': self.created,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def import_products(stream, file_format, chunk_size=IMPORT_CHUNK_SIZE):
+    """Import products from a binary CSV/NDJSON stream and return a summary"""
+    return ProductImporter(chunk_size=chunk_size).run(iter_records(stream, file_format))
@@ -0,0 +1,39 @@
+"""
+Management command to bulk import products from a CSV or NDJSON file
+Run with: python manage.py import_products catalog.csv
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from products.imports import IMPORT_CHUNK_SIZE, detect_format, import_products
+
+
+class Command(BaseCommand):
+    help = 'Upsert products by SKU from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the import file')
+        parser.add_argument('--format', dest='file_format', choices=['csv', 'ndjson'],
+                            help='File format (detected from the extension by default)')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        file_format = options['file_format'] or detect_format(options['path'])
+        if not file_format:
+            raise CommandError('Cannot detect file format, pass --format csv|ndjson')
+
+        started = time.monotonic()
+        try:
+            with open(options['path'], 'rb') as fh:
+                result = import_products(fh, file_format, chunk_size=options['chunk_size'])
+        except OSError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Imported {result['total']} rows in {elapsed:.1f}s: "
+            f"{result['created']} created, {result['updated']} updated"
+        ))
+        if result['error_count']:
+            self.stdout.write(self.style.ERROR(f"✗ {result['error_count']} rows rejected"))
+            for error in result['errors'][:20]:
+                self.stdout.write(f"  row {error['row']} ({error['sku']}): {error['errors']}")
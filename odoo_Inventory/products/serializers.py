@@ -1,4 +1,7 @@
+from django.db.models import OuterRef, Subquery, Sum
 from rest_framework import serializers
+from odoo_Inventory.fast_lists import ValuesRowMapper
+from warehouse.models import StockQuant
 from .models import Category, UnitOfMeasure, Product
 
 
@@ -25,8 +28,8 @@ class UnitOfMeasureSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = UnitOfMeasure
-        fields = ['id', 'name', 'abbreviation', 'description', 'is_active', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = ['id', 'name', 'abbreviation', 'description', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -72,3 +75,88 @@ class ProductListSerializer(serializers.ModelSerializer):
     
     def get_is_low_stock(self, obj):
         return obj.is_low_stock()
+
+
+# Product list rows from one query; total stock comes from a subquery instead
+# of two aggregate queries per product
+PRODUCT_LIST_ROWS = ValuesRowMapper(
+    ProductListSerializer,
+    annotations={
+        'stock_total': Subquery(
+            StockQuant.objects.filter(product=OuterRef('pk')).order_by()
+            .values('product').annotate(total=Sum('quantity')).values('total')
+        ),
+    },
+    methods={
+        'total_stock': lambda row: row['stock_total'] or 0,
+        'is_low_stock': lambda row: (row['stock_total'] or 0) < row['min_stock_level'],
+    },
+    requires={
+        'total_stock': ('stock_total',),
+        'is_low_stock': ('stock_total', 'min_stock_level'),
+    },
+)
+
+
+BULK_UPDATE_FIELDS = ['cost_price', 'selling_price', 'min_stock_level', 'reorder_quantity']
+
+
+class ProductBulkItemSerializer(serializers.Serializer):
+    """One explicit (sku, fields) change in a bulk update"""
+    
+    sku = serializers.CharField(max_length=50)
+    cost_price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    selling_price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    min_stock_level = serializers.IntegerField(min_value=0, required=False)
+    reorder_quantity = serializers.IntegerField(min_value=0, required=False)
+
+
+class ProductBulkChangeSerializer(serializers.Serializer):
+    """Expression applied to one field, e.g. {"op": "percent", "value": 5}"""
+    
+    OP_CHOICES = ['set', 'add', 'percent']
+    
+    op = serializers.ChoiceField(choices=OP_CHOICES)
+    value = serializers.DecimalField(max_digits=12, decimal_places=4)
+
+
+class ProductBulkFilterSerializer(serializers.Serializer):
+    """Selects the products an expression update applies to; {"all": true} selects every product"""
+    
+    CRITERIA = ['category', 'is_active', 'skus']
+    
+    category = serializers.IntegerField(required=False)
+    is_active = serializers.BooleanField(required=False)
+    skus = serializers.ListField(child=serializers.CharField(max_length=50), required=False, allow_empty=False)
+    all = serializers.BooleanField(required=False, default=False)
+    
+    def validate(self, data):
+        if not data['all'] and not any(name in data for name in self.CRITERIA):
+            raise serializers.ValidationError(
+                f"Filter by {', '.join(self.CRITERIA)}, or send \"all\": true to change every product"
+            )
+        return data
+
+
+class ProductBulkUpdateSerializer(serializers.Serializer):
+    """Either a list of items or a filter plus per-field changes"""
+    
+    items = ProductBulkItemSerializer(many=True, required=False, allow_empty=False)
+    filter = ProductBulkFilterSerializer(required=False)
+    changes = serializers.DictField(child=ProductBulkChangeSerializer(), required=False, allow_empty=False)
+    
+    def validate_changes(self, value):
+        unknown = set(value) - set(BULK_UPDATE_FIELDS)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unsupported fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(BULK_UPDATE_FIELDS)}"
+            )
+        return value
+    
+    def validate(self, data):
+        if 'items' in data:
+            if 'filter' in data or 'changes' in data:
+                raise serializers.ValidationError("Send either items or filter + changes, not both")
+        elif 'filter' not in data or 'changes' not in data:
+            raise serializers.ValidationError("Send items, or both filter and changes")
+        return data
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+# Sent after a bulk price / reorder-rule update or an import commits.
+# bulk_update(), bulk_create() and queryset.update() skip post_save, so caches
+# derived from product prices (e.g. stock valuation) and the sync change log
+# listen here. Provides product_ids and fields.
+products_bulk_updated = Signal()
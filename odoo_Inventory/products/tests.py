@@ -1,3 +1,182 @@
+import io
+import json
+from decimal import Decimal
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from users.models import User
+from warehouse.models import StockQuant
+from .imports import import_products
+from .models import Category, UnitOfMeasure, Product
+from .signals import products_bulk_updated
+from .serializers import ProductListSerializer
 
-# Create your tests here.
+
+class ProductListFastPathTests(TestCase):
+    """The values-based product list matches ProductListSerializer in two queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='viewer', password='secret123', role='ADMIN')
+        # A product without any stock reports 0 and a zeroed quant reports 0 too
+        StockQuant.objects.filter(product=Product.objects.order_by('id').first()).delete()
+        StockQuant.objects.filter(product=Product.objects.order_by('-id').first()).update(quantity=0)
+
+    def test_rows_match_serializer(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(2):
+            rows = client.get('/api/products/').json()['results']
+        products = Product.objects.select_related('category', 'uom').filter(id__in=[row['id'] for row in rows])
+        expected = json.loads(JSONRenderer().render(ProductListSerializer(products, many=True).data))
+        self.assertEqual(
+            sorted(rows, key=lambda row: row['id']), sorted(expected, key=lambda row: row['id'])
+        )
+
+    def test_fields_prune_values_columns(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(2):
+            rows = client.get('/api/products/?fields=id,sku,total_stock').json()['results']
+        self.assertEqual(list(rows[0]), ['id', 'sku', 'total_stock'])
+
+    def test_fields_with_method_field_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/products/?fields=id,is_low_stock')
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['results']
+        products = Product.objects.filter(id__in=[row['id'] for row in rows])
+        expected = {product.id: product.is_low_stock() for product in products}
+        self.assertEqual({row['id']: row['is_low_stock'] for row in rows}, expected)
+
+
+class ProductImportTests(TestCase):
+    """Upserts only overwrite the columns each row actually sets"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Hardware')
+        cls.uom = UnitOfMeasure.objects.create(name='Unit', abbreviation='U')
+        Product.objects.create(sku='B', name='b', category=cls.category, uom=cls.uom, cost_price=7, min_stock_level=3)
+
+    def test_ndjson_row_without_column_keeps_value(self):
+        lines = [
+            {'sku': 'A', 'name': 'a', 'category': 'Hardware', 'uom': 'Unit', 'cost_price': '5'},
+            {'sku': 'B', 'name': 'b2', 'category': 'Hardware', 'uom': 'Unit'},
+        ]
+        stream = io.BytesIO(''.join(json.dumps(line) + '\n' for line in lines).encode())
+        with self.captureOnCommitCallbacks(execute=True):
+            result = import_products(stream, 'ndjson')
+        self.assertEqual((result['created'], result['updated'], result['error_count']), (1, 1, 0))
+        product = Product.objects.get(sku='B')
+        self.assertEqual((product.name, product.cost_price, product.min_stock_level), ('b2', Decimal('7.00'), 3))
+        self.assertEqual(Product.objects.get(sku='A').cost_price, Decimal('5.00'))
+
+    def test_blank_csv_cell_keeps_value(self):
+        stream = io.BytesIO(b'sku,name,category,uom,cost_price\nA,a3,Hardware,Unit,\nB,b3,Hardware,Unit,\n')
+        import_products(stream, 'csv')
+        self.assertEqual(Product.objects.get(sku='B').cost_price, Decimal('7.00'))
+        self.assertEqual(Product.objects.get(sku='A').cost_price, Decimal('0.00'))
+
+    def test_bulk_updated_signal_reports_row_fields(self):
+        received = []
+        handler = lambda sender, product_ids, fields, **kwargs: received.append(fields)
+        products_bulk_updated.connect(handler)
+        self.addCleanup(products_bulk_updated.disconnect, handler)
+        stream = io.BytesIO(b'{"sku": "B", "name": "b4", "category": "Hardware", "uom": "Unit"}\n')
+        with self.captureOnCommitCallbacks(execute=True):
+            import_products(stream, 'ndjson')
+        self.assertEqual(received, [['name', 'category', 'uom', 'updated_at']])
+
+    def test_non_finite_and_oversized_numbers_are_row_errors(self):
+        stream = io.BytesIO(
+            b'sku,name,category,uom,cost_price,weight,min_stock_level\n'
+            b'N1,n,Hardware,Unit,NaN,,\n'
+            b'N2,n,Hardware,Unit,,Infinity,\n'
+            b'N3,n,Hardware,Unit,,,2147483648\n'
+            b'N4,n,Hardware,Unit,1,,2147483647\n'
+        )
+        result = import_products(stream, 'csv')
+        self.assertEqual((result['created'], result['error_count']), (1, 3))
+        self.assertEqual([error['errors'] for error in result['errors']], [
+            {'cost_price': 'A valid number is required.'},
+            {'weight': 'A valid number is required.'},
+            {'min_stock_level': 'Ensure this value is less than or equal to 2147483647.'},
+        ])
+
+    def test_duplicate_sku_merges_columns(self):
+        lines = [
+            {'sku': 'B', 'name': 'b5', 'category': 'Hardware', 'uom': 'Unit', 'cost_price': '9'},
+            {'sku': 'B', 'name': 'b6', 'category': 'Hardware', 'uom': 'Unit'},
+        ]
+        stream = io.BytesIO(''.join(json.dumps(line) + '\n' for line in lines).encode())
+        import_products(stream, 'ndjson')
+        product = Product.objects.get(sku='B')
+        self.assertEqual((product.name, product.cost_price), ('b6', Decimal('9.00')))
+
+
+class ProductBulkUpdateTests(TestCase):
+    """Expression updates round like the columns they write and never go below zero"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='pricing', password='secret123', role='ADMIN')
+        category = Category.objects.create(name='Hardware')
+        uom = UnitOfMeasure.objects.create(name='Unit', abbreviation='U')
+        cls.product = Product.objects.create(
+            sku='BOLT', name='Bolt', category=category, uom=uom,
+            cost_price=Decimal('9.99'), selling_price=Decimal('10.00'), min_stock_level=7, reorder_quantity=10
+        )
+        Product.objects.create(sku='NUT', name='Nut', category=category, uom=uom, cost_price=Decimal('1.00'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk_update(self, product_filter, changes):
+        return self.client.post(
+            '/api/products/bulk_update/', {'filter': product_filter, 'changes': changes}, format='json'
+        )
+
+    def test_percent_rounds_to_column_precision(self):
+        response = self.bulk_update({'skus': ['BOLT']}, {
+            'cost_price': {'op': 'percent', 'value': '3.3'},
+            'min_stock_level': {'op': 'percent', 'value': '15'},
+        })
+        self.assertEqual(response.json(), {'updated': 1})
+        self.product.refresh_from_db()
+        # 9.99 * 1.033 = 10.31967; 7 * 1.15 = 8.05
+        self.assertEqual((self.product.cost_price, self.product.min_stock_level), (Decimal('10.32'), 8))
+
+    def test_add_rounds_to_column_precision(self):
+        self.bulk_update({'skus': ['BOLT']}, {
+            'selling_price': {'op': 'add', 'value': '0.126'},
+            'reorder_quantity': {'op': 'add', 'value': '2.6'},
+        })
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.selling_price, self.product.reorder_quantity), (Decimal('10.13'), 13))
+
+    def test_results_clamp_at_zero(self):
+        self.bulk_update({'skus': ['BOLT']}, {
+            'cost_price': {'op': 'add', 'value': '-1000'},
+            'min_stock_level': {'op': 'percent', 'value': '-150'},
+        })
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.cost_price, self.product.min_stock_level), (Decimal('0.00'), 0))
+
+    def test_empty_filter_is_rejected(self):
+        response = self.bulk_update({}, {'cost_price': {'op': 'set', 'value': '0'}})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filter', response.json())
+        self.assertFalse(Product.objects.filter(cost_price=0).exists())
+
+    def test_all_changes_every_product(self):
+        response = self.bulk_update({'all': True}, {'cost_price': {'op': 'add', 'value': '1'}})
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(
+            list(Product.objects.order_by('sku').values_list('cost_price', flat=True)),
+            [Decimal('10.99'), Decimal('2.00')]
+        )
@@ -1,13 +1,28 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.response import Response
+from django.db import DataError
 from django_filters.rest_framework import DjangoFilterBackend
+from caching.responses import CachedListMixin
+from odoo_Inventory.conditional import ConditionalListMixin
+from odoo_Inventory.fast_lists import ValuesListMixin
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
+from warehouse.models import StockQuant
 from .models import Category, UnitOfMeasure, Product
-from .serializers import CategorySerializer, UnitOfMeasureSerializer, ProductSerializer, ProductListSerializer
+from .serializers import (
+    CategorySerializer, UnitOfMeasureSerializer, ProductSerializer, ProductListSerializer,
+    ProductBulkUpdateSerializer, PRODUCT_LIST_ROWS
+)
+from .imports import import_products, detect_format
+from .bulk import apply_items, apply_changes
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Category model"""
     
     queryset = Category.objects.all()
+    conditional_models = (Category, Product)
     serializer_class = CategorySerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active', 'parent']
@@ -16,10 +31,11 @@ class CategoryViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class UnitOfMeasureViewSet(viewsets.ModelViewSet):
+class UnitOfMeasureViewSet(ConditionalListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for UnitOfMeasure model"""
     
     queryset = UnitOfMeasure.objects.all()
+    conditional_models = (UnitOfMeasure,)
     serializer_class = UnitOfMeasureSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active']
@@ -28,10 +44,12 @@ class UnitOfMeasureViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(CachedListMixin, ValuesListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Product model"""
     
     queryset = Product.objects.select_related('category', 'uom').all()
+    cache_models = (Product, Category, UnitOfMeasure, StockQuant)
+    values_mapper = PRODUCT_LIST_ROWS
     serializer_class = ProductSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'is_active']
@@ -43,3 +61,48 @@ class ProductViewSet(viewsets.ModelViewSet):
         if self.action == 'list':
             return ProductListSerializer
         return ProductSerializer
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_products(self, request):
+        """Upsert products by SKU from an uploaded CSV or NDJSON file"""
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_format = request.data.get('file_format') or detect_format(upload.name)
+        if file_format not in ('csv', 'ndjson'):
+            return Response(
+                {'error': 'Unsupported file format. Upload a .csv or .ndjson file'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = import_products(upload.file, file_format)
+        return Response(result)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """Update prices and reorder rules for many products in one transaction"""
+        serializer = ProductBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        
+        try:
+            if 'items' in data:
+                updated = apply_items(data['items'])
+            else:
+                queryset = Product.objects.all()
+                product_filter = data['filter']
+                if 'category' in product_filter:
+                    queryset = queryset.filter(category_id=product_filter['category'])
+                if 'is_active' in product_filter:
+                    queryset = queryset.filter(is_active=product_filter['is_active'])
+                if 'skus' in product_filter:
+                    queryset = queryset.filter(sku__in=product_filter['skus'])
+                updated = apply_changes(queryset, data['changes'])
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DataError:
+            return Response({'error': 'Resulting values are out of range'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({'updated': updated})
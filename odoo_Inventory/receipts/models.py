@@ -1,10 +1,11 @@
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from products.models import Product
 from warehouse.models import Location
 from stock_ledger.models import StockMovement
+from monitoring.metrics import timed_validation
 
 
 class Receipt(models.Model):
@@ -51,6 +52,8 @@ class Receipt(models.Model):
     def __str__(self):
         return f"{self.receipt_number} - {self.supplier_name}"
     
+    @timed_validation('RECEIPT')
+    @transaction.atomic
     def validate(self, user):
         """Validate receipt and create stock movements"""
         if self.status == 'DONE':
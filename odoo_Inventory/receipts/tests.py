@@ -1,3 +1,73 @@
+from decimal import Decimal
 from django.test import TestCase
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from users.models import User
+from .models import Receipt
 
-# Create your tests here.
+
+class ReceiptResponseTests(TestCase):
+    """Receipt list and detail payloads, including ?fields= and ?expand="""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='viewer', password='secret123', role='ADMIN')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_header_fields_skip_lines(self):
+        # count + receipts, without the lines and products prefetches
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/receipts/?fields=id,receipt_number,status')
+        row = response.json()['results'][0]
+        self.assertEqual(list(row), ['id', 'receipt_number', 'status'])
+
+    def test_nested_fields(self):
+        receipt = Receipt.objects.order_by('-created_at').first()
+        # receipt + lines, without the products prefetch
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/receipts/{receipt.pk}/?fields=id,lines.quantity')
+        row = response.json()
+        self.assertEqual(list(row), ['id', 'lines'])
+        self.assertTrue(row['lines'])
+        self.assertEqual(list(row['lines'][0]), ['quantity'])
+
+    def test_expand_location(self):
+        receipt = Receipt.objects.order_by('-created_at').first()
+        response = self.client.get(f'/api/receipts/{receipt.pk}/?fields=id&expand=destination_location')
+        self.assertEqual(response.json()['destination_location']['code'], receipt.destination_location.code)
+
+    def test_list_returns_headers_with_totals(self):
+        # count + receipts with their totals; no lines are loaded
+        with self.assertNumQueries(2):
+            rows = self.client.get('/api/receipts/').json()['results']
+        self.assertNotIn('lines', rows[0])
+        self.assertIsInstance(rows[0]['destination_location'], int)
+
+        receipt = Receipt.objects.get(pk=rows[0]['id'])
+        lines = list(receipt.lines.all())
+        self.assertEqual(rows[0]['line_count'], len(lines))
+        self.assertEqual(Decimal(rows[0]['total_quantity']), sum(line.quantity for line in lines))
+        self.assertEqual(
+            Decimal(rows[0]['total_value']),
+            sum(line.get_total_price() for line in lines).quantize(Decimal('0.01'))
+        )
+
+    def test_receipt_without_lines(self):
+        location = Receipt.objects.first().destination_location
+        Receipt.objects.create(
+            receipt_number='EMPTY-1', supplier_name='Nobody', destination_location=location, created_by=self.user
+        )
+        rows = self.client.get('/api/receipts/?search=EMPTY-1').json()['results']
+        self.assertEqual(
+            (rows[0]['line_count'], rows[0]['total_quantity'], rows[0]['total_value']), (0, '0.000', '0.00')
+        )
+
+    def test_retrieve_includes_lines(self):
+        receipt = Receipt.objects.order_by('-created_at').first()
+        row = self.client.get(f'/api/receipts/{receipt.pk}/').json()
+        self.assertIn('product_sku', row['lines'][0])
+        self.assertNotIn('line_count', row)
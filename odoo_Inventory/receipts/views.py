@@ -2,19 +2,21 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from idempotency.decorators import idempotent
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
 from .models import Receipt, ReceiptLine
-from .serializers import ReceiptSerializer, ReceiptCreateSerializer, ReceiptValidateSerializer
+from .serializers import (
+    ReceiptSerializer, ReceiptListSerializer, ReceiptCreateSerializer, ReceiptValidateSerializer, RECEIPT_LIST_TOTALS
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class ReceiptViewSet(viewsets.ModelViewSet):
+class ReceiptViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Receipt model"""
     
-    queryset = Receipt.objects.select_related(
-        'destination_location', 'created_by', 'validated_by'
-    ).prefetch_related('lines__product').all()
+    queryset = Receipt.objects.all()
     serializer_class = ReceiptSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'destination_location', 'created_by']
@@ -22,11 +24,20 @@ class ReceiptViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'expected_date', 'received_date']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.annotate(**RECEIPT_LIST_TOTALS)
+        return queryset
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return ReceiptCreateSerializer
+        if self.action == 'list':
+            return ReceiptListSerializer
         return ReceiptSerializer
     
+    @idempotent
     def create(self, request, *args, **kwargs):
         logger.info(f"Creating receipt with data: {request.data}")
         serializer = self.get_serializer(data=request.data)
@@ -43,6 +54,7 @@ class ReceiptViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def validate_receipt(self, request, pk=None):
         """Validate receipt and create stock movements"""
         receipt = self.get_object()
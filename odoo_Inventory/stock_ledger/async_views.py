@@ -0,0 +1,78 @@
+"""
+Server-Sent Events stream of posted stock movements and changed stock quants
+"""
+import asyncio
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from odoo_Inventory.async_auth import authenticate
+from .events import get_broker, event_matches, format_sse
+
+
+FILTER_PARAMS = ['product', 'location', 'warehouse']
+
+
+def _parse_filters(params):
+    filters = {}
+    for key in FILTER_PARAMS:
+        value = params.get(key)
+        if value:
+            try:
+                filters[key] = int(value)
+            except ValueError:
+                raise ValueError(f"{key} must be an id")
+    return filters
+
+
+async def _async_stream(subscription, filters, heartbeat):
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            event = await subscription.aget(heartbeat)
+            if event is None:
+                yield ': keepalive\n\n'
+            elif event_matches(event, filters):
+                yield format_sse(event, filters)
+    finally:
+        subscription.close()
+
+
+def _sync_stream(subscription, filters, heartbeat):
+    # Under WSGI each open stream holds a worker thread; serve with ASGI in production
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            event = subscription.get(heartbeat)
+            if event is None:
+                yield ': keepalive\n\n'
+            elif event_matches(event, filters):
+                yield format_sse(event, filters)
+    finally:
+        subscription.close()
+
+
+async def stock_events(request):
+    """Stream stock changes (?product=, ?location=, ?warehouse= to filter)"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not getattr(settings, 'STOCK_EVENTS_ENABLED', False):
+        raise Http404
+    user, error = await authenticate(request)
+    if error:
+        return error
+    try:
+        filters = _parse_filters(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    heartbeat = getattr(settings, 'STOCK_EVENTS_HEARTBEAT', 15)
+    broker = get_broker()
+    if isinstance(request, ASGIRequest):
+        stream = _async_stream(broker.subscribe(asyncio.get_running_loop()), filters, heartbeat)
+    else:
+        stream = _sync_stream(broker.subscribe(), filters, heartbeat)
+    
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering (nginx)
+    return response
@@ -0,0 +1,250 @@
+"""
+Stock change events published by the posting path and streamed to clients.
+
+Every new StockMovement publishes one event carrying the movement and the
+stock quants it changed. On PostgreSQL events travel over LISTEN/NOTIFY,
+so every process sees them; elsewhere (and in tests) they are fanned out
+in-process after the transaction commits.
+"""
+import asyncio
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'stock_changes'
+SUBSCRIBER_QUEUE_SIZE = 1000
+NOTIFY_PAYLOAD_LIMIT = 7900  # PostgreSQL rejects payloads of 8000 bytes or more
+LISTEN_POLL_SECONDS = 60
+
+
+def movement_event(movement, quants):
+    """Event payload for a posted movement and the quants it updated"""
+    # Quants come from get_or_create without their location; reuse the movement's
+    warehouses = {
+        location.id: location.warehouse_id
+        for location in (movement.source_location, movement.destination_location) if location
+    }
+    return {
+        'type': 'movement',
+        'id': movement.id,
+        'movement_type': movement.movement_type,
+        'product': movement.product_id,
+        'product_sku': movement.product.sku,
+        'quantity': str(movement.quantity),
+        'source_location': movement.source_location_id,
+        'destination_location': movement.destination_location_id,
+        'warehouses': sorted(set(warehouses.values())),
+        'document_reference': movement.document_reference,
+        'document_type': movement.document_type,
+        'created_at': movement.created_at,
+        'quants': [
+            {
+                'product': quant.product_id,
+                'location': quant.location_id,
+                'warehouse': warehouses[quant.location_id],
+                'quantity': str(quant.quantity),
+                'reserved_quantity': str(quant.reserved_quantity),
+            }
+            for quant in quants
+        ],
+    }
+
+
+def _encode(event):
+    return json.dumps(event, cls=DjangoJSONEncoder)
+
+
+class Subscription:
+    """Bounded queue of events for one client; events are dropped when it is full"""
+
+    def __init__(self, broker, loop=None):
+        self.broker = broker
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE) if loop else queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def deliver(self, event):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self._offer, event)
+        else:
+            self._offer(event)
+
+    def _offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except (asyncio.QueueFull, queue.Full):
+            self.dropped += 1
+
+    def get(self, timeout):
+        """Blocking get for WSGI; returns None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout):
+        """Async get for ASGI; returns None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Fan events out to subscribers in this process once the transaction commits"""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def publish(self, event, using=None):
+        transaction.on_commit(lambda: self.deliver(event), using=using)
+
+    def deliver(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, loop=None):
+        subscription = Subscription(self, loop)
+        with self.lock:
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscribers.discard(subscription)
+
+
+def _notifications(raw, psycopg3):
+    """Payloads arriving on a driver connection that has run LISTEN"""
+    if psycopg3:
+        for notify in raw.notifies():
+            yield notify.payload
+        return
+    # psycopg2 queues notifications on the connection after poll()
+    while True:
+        readable, _, _ = select.select([raw], [], [], LISTEN_POLL_SECONDS)
+        if not readable:
+            continue
+        raw.poll()
+        while raw.notifies:
+            yield raw.notifies.pop(0).payload
+
+
+class PostgresBroker(InProcessBroker):
+    """NOTIFY inside the posting transaction, one LISTEN connection per process.
+
+    NOTIFY is transactional, so events from rolled back postings are never
+    delivered. A background thread listens on the database the broker
+    publishes to, through the configured driver (psycopg2 or psycopg 3),
+    and fans events out to this process's subscribers.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        super().__init__()
+        self.using = using
+        self.listener = None
+
+    def publish(self, event, using=None):
+        payload = _encode(event)
+        if len(payload.encode('utf-8')) > NOTIFY_PAYLOAD_LIMIT:
+            # Too many quants to fit; clients can fetch the details by id
+            payload = _encode({**event, 'quants': [], 'truncated': True})
+        with connections[using or self.using].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+
+    def subscribe(self, loop=None):
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self._listen, name='stock-events-listener', daemon=True)
+                self.listener.start()
+        return super().subscribe(loop)
+
+    def listen_connection(self):
+        """Dedicated autocommit connection, kept out of the pool when DB_POOL is on"""
+        wrapper = connections[self.using]
+        settings_dict = dict(wrapper.settings_dict)
+        settings_dict['OPTIONS'] = {
+            key: value for key, value in settings_dict.get('OPTIONS', {}).items() if key != 'pool'
+        }
+        return type(wrapper)(settings_dict, self.using)
+
+    def _listen(self):
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        while True:
+            conn = self.listen_connection()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                for payload in _notifications(conn.connection, is_psycopg3):
+                    self.deliver(json.loads(payload))
+            except Exception:
+                logger.exception('Stock event listener lost its connection, reconnecting')
+                time.sleep(5)
+            finally:
+                conn.close()
+
+
+_brokers = {}
+
+
+def get_broker(using=None):
+    """Broker for STOCK_EVENTS_BACKEND on a database; PostgreSQL's needs a PostgreSQL database"""
+    using = using or DEFAULT_DB_ALIAS
+    backend = getattr(settings, 'STOCK_EVENTS_BACKEND', 'postgres')
+    if backend == 'postgres' and connections[using].vendor != 'postgresql':
+        backend = 'inprocess'
+    # In-process events never leave the process, so one broker serves every database
+    key = (backend, using) if backend == 'postgres' else (backend, None)
+    if key not in _brokers:
+        _brokers[key] = PostgresBroker(using) if backend == 'postgres' else InProcessBroker()
+    return _brokers[key]
+
+
+def publish_movement(movement, quants, using=None):
+    """Publish a posted movement once the transaction it was saved in commits"""
+    if getattr(settings, 'STOCK_EVENTS_ENABLED', False):
+        get_broker(using).publish(movement_event(movement, quants), using)
+
+
+def event_matches(event, filters):
+    """filters: optional product, location and warehouse ids"""
+    if filters.get('product') and event['product'] != filters['product']:
+        return False
+    if filters.get('location') and filters['location'] not in (
+        event['source_location'], event['destination_location']
+    ):
+        return False
+    if filters.get('warehouse') and filters['warehouse'] not in event['warehouses']:
+        return False
+    return True
+
+
+def quant_matches(quant, filters):
+    for key in ('product', 'location', 'warehouse'):
+        if filters.get(key) and quant[key] != filters[key]:
+            return False
+    return True
+
+
+def format_sse(event, filters):
+    """SSE frames for an event: the movement, then each changed quant"""
+    frames = [f"id: {event['id']}\nevent: movement\ndata: {_encode(event)}\n\n"]
+    for quant in event['quants']:
+        if quant_matches(quant, filters):
+            frames.append(f"event: quant\ndata: {_encode(quant)}\n\n")
+    return ''.join(frames)
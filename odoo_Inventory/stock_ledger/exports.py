@@ -0,0 +1,106 @@
+import csv
+import zlib
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+# (column name, ORM lookup) pairs for the movement ledger export.
+# Column names match StockMovementSerializer so exports and the API agree.
+MOVEMENT_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('movement_type', 'movement_type'),
+    ('product', 'product_id'),
+    ('product_sku', 'product__sku'),
+    ('product_name', 'product__name'),
+    ('quantity', 'quantity'),
+    ('source_location', 'source_location_id'),
+    ('source_location_code', 'source_location__code'),
+    ('destination_location', 'destination_location_id'),
+    ('destination_location_code', 'destination_location__code'),
+    ('document_reference', 'document_reference'),
+    ('document_type', 'document_type'),
+    ('created_by', 'created_by_id'),
+    ('created_by_username', 'created_by__username'),
+    ('notes', 'notes'),
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() returns the value instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield value tuples for the given columns using a server-side cursor"""
+    lookups = [lookup for _, lookup in columns]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def render_csv(columns, rows):
+    """Yield CSV lines (header first) as strings"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in columns])
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def render_ndjson(columns, rows):
+    """Yield one JSON object per line"""
+    names = [name for name, _ in columns]
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+RENDERERS = {
+    'csv': render_csv,
+    'ndjson': render_ndjson,
+}
+
+
+def encode_stream(lines, compress=False, flush_every=EXPORT_CHUNK_SIZE):
+    """Encode rendered lines to UTF-8 bytes, optionally gzip-compressed.
+
+    Lines are batched so the response is written in reasonably sized blocks
+    instead of one tiny chunk per row.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= flush_every:
+            data = ''.join(buffer).encode('utf-8')
+            buffer = []
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+    data = ''.join(buffer).encode('utf-8')
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def export_stream(queryset, columns, file_format='csv', compress=False):
+    """Return an iterator of bytes for exporting queryset in file_format"""
+    rows = iter_rows(queryset, columns)
+    return encode_stream(RENDERERS[file_format](columns, rows), compress=compress)
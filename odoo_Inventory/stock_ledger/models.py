@@ -1,9 +1,12 @@
+import time
 from decimal import Decimal
 from django.db import models
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from products.models import Product
 from warehouse.models import Location, StockQuant
+from monitoring import metrics
+from . import events
 
 
 class StockMovement(models.Model):
@@ -56,36 +59,43 @@ class StockMovement(models.Model):
         super().save(*args, **kwargs)
         
         if is_new:
-            self.update_stock_quants()
+            quants = self.update_stock_quants()
+            metrics.MOVEMENTS_POSTED.labels(movement_type=self.movement_type).inc()
+            events.publish_movement(self, quants, using=self._state.db)
     
     def update_stock_quants(self):
-        """Update StockQuant based on movement type"""
+        """Update StockQuant based on movement type and return the updated quants"""
+        quants = []
         if self.movement_type == 'RECEIPT':
             # Increase stock at destination
-            self._update_quant(self.destination_location, self.quantity)
+            quants.append(self._update_quant(self.destination_location, self.quantity))
             
         elif self.movement_type == 'DELIVERY':
             # Decrease stock at source
-            self._update_quant(self.source_location, -self.quantity)
+            quants.append(self._update_quant(self.source_location, -self.quantity))
             
         elif self.movement_type == 'TRANSFER':
             # Decrease at source, increase at destination
-            self._update_quant(self.source_location, -self.quantity)
-            self._update_quant(self.destination_location, self.quantity)
+            quants.append(self._update_quant(self.source_location, -self.quantity))
+            quants.append(self._update_quant(self.destination_location, self.quantity))
             
         elif self.movement_type == 'ADJUSTMENT':
             # Can be positive or negative at destination
             if self.destination_location:
-                self._update_quant(self.destination_location, self.quantity)
+                quants.append(self._update_quant(self.destination_location, self.quantity))
             if self.source_location:
-                self._update_quant(self.source_location, -self.quantity)
+                quants.append(self._update_quant(self.source_location, -self.quantity))
+        return [quant for quant in quants if quant is not None]
     
     def _update_quant(self, location, qty_change):
         """Update or create StockQuant"""
         if location:
+            started = time.perf_counter()
             quant, created = StockQuant.objects.get_or_create(
                 product=self.product,
                 location=location,
                 defaults={'quantity': 0}
             )
             quant.update_quantity(qty_change)
+            metrics.QUANT_UPDATE_DURATION.observe(time.perf_counter() - started)
+            return quant
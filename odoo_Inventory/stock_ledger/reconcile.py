@@ -0,0 +1,73 @@
+from collections import defaultdict
+from django.db.models import Sum
+from warehouse.models import StockQuant
+from .models import StockMovement
+
+
+def ledger_totals(product_ids=None):
+    """Net ledger quantity (incoming minus outgoing) per (product, location)"""
+    movements = StockMovement.objects.all()
+    if product_ids is not None:
+        movements = movements.filter(product_id__in=product_ids)
+
+    totals = defaultdict(int)
+    incoming = movements.filter(destination_location__isnull=False).values(
+        'product_id', 'destination_location_id'
+    ).annotate(total=Sum('quantity'))
+    for row in incoming:
+        totals[(row['product_id'], row['destination_location_id'])] += row['total']
+    outgoing = movements.filter(source_location__isnull=False).values(
+        'product_id', 'source_location_id'
+    ).annotate(total=Sum('quantity'))
+    for row in outgoing:
+        totals[(row['product_id'], row['source_location_id'])] -= row['total']
+    return dict(totals)
+
+
+def quant_totals(product_ids=None):
+    """StockQuant quantity per (product, location)"""
+    quants = StockQuant.objects.all()
+    if product_ids is not None:
+        quants = quants.filter(product_id__in=product_ids)
+    return {
+        (product_id, location_id): quantity
+        for product_id, location_id, quantity in quants.values_list('product_id', 'location_id', 'quantity')
+    }
+
+
+def find_quant_mismatches(product_ids=None):
+    """Compare every StockQuant with the net of its ledger movements.
+
+    Returns a list of dicts for (product, location) pairs where the quant
+    quantity differs from incoming minus outgoing movement quantities.
+    """
+    expected = ledger_totals(product_ids)
+    mismatches = []
+    for (product_id, location_id), quantity in quant_totals(product_ids).items():
+        ledger = expected.pop((product_id, location_id), 0)
+        if ledger != quantity:
+            mismatches.append({'product': product_id, 'location': location_id, 'quant': quantity, 'ledger': ledger})
+    # Ledger activity with no quant row at all
+    for (product_id, location_id), ledger in expected.items():
+        if ledger != 0:
+            mismatches.append({'product': product_id, 'location': location_id, 'quant': None, 'ledger': ledger})
+    return mismatches
+
+
+def find_change_mismatches(quants_before, ledger_before, product_ids):
+    """Compare how the quants and the ledger changed since quant_totals/ledger_totals were taken.
+
+    Unlike find_quant_mismatches this ignores differences that were already
+    there, such as seeded quants without movements behind them.
+    """
+    quants_after = quant_totals(product_ids)
+    ledger_after = ledger_totals(product_ids)
+    mismatches = []
+    for key in sorted(set(quants_before) | set(quants_after) | set(ledger_before) | set(ledger_after)):
+        quant_change = quants_after.get(key, 0) - quants_before.get(key, 0)
+        ledger_change = ledger_after.get(key, 0) - ledger_before.get(key, 0)
+        if quant_change != ledger_change:
+            mismatches.append({
+                'product': key[0], 'location': key[1], 'quant_change': quant_change, 'ledger_change': ledger_change
+            })
+    return mismatches
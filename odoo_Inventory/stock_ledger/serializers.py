@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from odoo_Inventory.fast_lists import ValuesRowMapper
 from .models import StockMovement
 from products.serializers import ProductListSerializer
 from warehouse.serializers import LocationSerializer
@@ -23,6 +24,10 @@ class StockMovementSerializer(serializers.ModelSerializer):
             'created_at', 'notes'
         ]
         read_only_fields = ['id', 'created_at']
+        expandable_fields = {'source_location': LocationSerializer, 'destination_location': LocationSerializer}
+
+
+STOCK_MOVEMENT_ROWS = ValuesRowMapper(StockMovementSerializer)
 
 
 class StockMovementDetailSerializer(serializers.ModelSerializer):
@@ -1,3 +1,343 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import socket
+from types import SimpleNamespace
+from decimal import Decimal
+from unittest import mock, skipUnless
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.test import AsyncClient, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from adjustments.models import AdjustmentEntry
+from benchmarks.scenarios import (
+    load_scale, prepare_adjustment, prepare_delivery, prepare_receipt, prepare_transfer
+)
+from deliveries.models import DeliveryOrder
+from odoo_Inventory.db_routers import REPLICA_DB_ALIAS
+from odoo_Inventory.fast_json import FastJSONRenderer, FastJSONParser
+from products.models import Product
+from receipts.models import Receipt
+from transfers.models import TransferOrder
+from users.models import User
+from warehouse.models import Location, StockQuant
+from .events import _notifications
+from .exports import MOVEMENT_EXPORT_COLUMNS
+from .models import StockMovement
+from .serializers import StockMovementSerializer
 
-# Create your tests here.
+
+@skipUnless(REPLICA_DB_ALIAS in settings.DATABASES, 'No replica database configured (set DB_REPLICA_HOST)')
+class ReplicaRoutingTests(TransactionTestCase):
+    """Ledger reads use the replica unless the user has just written data.
+
+    TransactionTestCase commits the test data, so the replica connection
+    (a test mirror of default) can see it.
+    """
+
+    databases = '__all__'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='analyst', password='secret123', role='ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _queries(self, alias, url):
+        with CaptureQueriesContext(connections[alias]) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured.captured_queries)
+
+    def test_reads_go_to_replica(self):
+        self.assertGreater(self._queries(REPLICA_DB_ALIAS, '/api/movements/'), 0)
+        self.assertEqual(self._queries('default', '/api/movements/'), 0)
+
+    def test_reads_stick_to_primary_after_a_write(self):
+        response = self.client.post('/api/categories/', {'name': 'Fasteners'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self._queries(REPLICA_DB_ALIAS, '/api/movements/'), 0)
+        self.assertGreater(self._queries('default', '/api/movements/'), 0)
+
+
+@override_settings(STOCK_EVENTS_ENABLED=True, STOCK_EVENTS_BACKEND='inprocess', STOCK_EVENTS_HEARTBEAT=1)
+class StockEventStreamTests(TestCase):
+    """Posted movements reach SSE subscribers, filtered by warehouse"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='tab', password='secret123', role='ADMIN')
+        cls.product = Product.objects.order_by('id').first()
+        locations = Location.objects.order_by('id')
+        cls.location = locations.first()
+        cls.other_location = locations.exclude(warehouse_id=cls.location.warehouse_id).first()
+
+    def _receive(self, location):
+        with self.captureOnCommitCallbacks(execute=True):
+            return StockMovement.objects.create(
+                movement_type='RECEIPT', product=self.product, quantity=3,
+                destination_location=location, document_reference='SSE-TEST',
+                document_type='RECEIPT', created_by=self.user
+            )
+
+    def test_stream_filters_by_warehouse(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get(f'/api/stock-events/?warehouse={self.location.warehouse_id}')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b'retry: 5000\n\n')
+        
+        if self.other_location:
+            self._receive(self.other_location)
+        movement = self._receive(self.location)
+        frame = next(stream).decode()
+        self.assertIn(f'id: {movement.id}\nevent: movement', frame)
+        self.assertIn('event: quant', frame)
+        self.assertEqual(next(stream), b': keepalive\n\n')
+        response.close()
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/stock-events/').status_code, 401)
+
+    def test_invalid_filter(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/stock-events/?product=abc').status_code, 400)
+
+    async def test_async_stream(self):
+        token = await sync_to_async(Token.objects.create)(user=self.user)
+        response = await AsyncClient().get('/api/stock-events/', headers={'Authorization': f'Token {token.key}'})
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        movement = await sync_to_async(self._receive)(self.location)
+        frame = (await anext(stream)).decode()
+        self.assertIn(f'id: {movement.id}\nevent: movement', frame)
+        await stream.aclose()
+
+
+class FakePsycopg2Connection:
+    """Readable socket standing in for a psycopg2 connection with queued notifies"""
+
+    def __init__(self, payloads):
+        self.reader, self.writer = socket.socketpair()
+        self.pending = list(payloads)
+        self.notifies = []
+        self.writer.send(b'x')
+
+    def fileno(self):
+        return self.reader.fileno()
+
+    def poll(self):
+        self.reader.recv(1)
+        self.notifies.extend(SimpleNamespace(payload=payload) for payload in self.pending)
+        self.pending = []
+
+    def close(self):
+        self.reader.close()
+        self.writer.close()
+
+
+class StockEventListenerTests(SimpleTestCase):
+    """The listener reads notifications through either PostgreSQL driver"""
+
+    def test_psycopg2_notifications(self):
+        raw = FakePsycopg2Connection(['{"id": 1}', '{"id": 2}'])
+        self.addCleanup(raw.close)
+        payloads = _notifications(raw, psycopg3=False)
+        self.assertEqual([next(payloads), next(payloads)], ['{"id": 1}', '{"id": 2}'])
+
+    def test_psycopg3_notifications(self):
+        raw = SimpleNamespace(notifies=lambda: iter([SimpleNamespace(payload='{"id": 3}')]))
+        self.assertEqual(list(_notifications(raw, psycopg3=True)), ['{"id": 3}'])
+
+
+class FastJSONTests(TestCase):
+    """The orjson renderer and parser are drop-in replacements for DRF's"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='ledger', password='secret123', role='ADMIN')
+
+    def test_renders_like_drf(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/movements/')
+        self.assertEqual(response.status_code, 200)
+        data = {
+            **response.data,
+            'raw_decimal': Decimal('12345678901234.567'),
+            'raw_datetime': timezone.now(),
+            'separator': 'line\u2028break',
+            7: 'non-string key',
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_falls_back_for_big_integers(self):
+        data = {'id': 2 ** 70, 'quantity': Decimal('1.5')}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parses_like_drf(self):
+        content = b'{"quantity": "1.500", "ids": [1, 2], "price": 12.5, "ok": true}'
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(content)), JSONParser().parse(io.BytesIO(content))
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"quantity": '))
+
+
+class MovementListFastPathTests(TestCase):
+    """The values-based movement list matches StockMovementSerializer exactly"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='ledger', password='secret123', role='ADMIN')
+
+    def test_rows_match_serializer(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        rows = client.get('/api/movements/').json()['results']
+        movements = StockMovement.objects.filter(id__in=[row['id'] for row in rows])
+        expected = json.loads(JSONRenderer().render(StockMovementSerializer(movements, many=True).data))
+        self.assertEqual(
+            sorted(rows, key=lambda row: row['id']), sorted(expected, key=lambda row: row['id'])
+        )
+        # Receipts have no source location, so DRF leaves out its code
+        self.assertTrue(any('source_location_code' not in row for row in rows))
+
+
+class DocumentValidationTests(TestCase):
+    """A validation that fails after posting leaves the ledger and quants untouched"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='poster', password='secret123', role='ADMIN')
+
+    def assert_rolled_back(self, prepare, model):
+        prepare(self.user)
+        document = model.objects.latest('id')
+        movements = StockMovement.objects.count()
+        quants = dict(StockQuant.objects.values_list('id', 'quantity'))
+        # The status update is the last write, after every line has posted
+        with mock.patch.object(document, 'save', side_effect=DatabaseError('connection lost')), \
+                self.assertRaises(DatabaseError):
+            document.validate(self.user)
+        self.assertEqual(StockMovement.objects.count(), movements)
+        self.assertEqual(dict(StockQuant.objects.values_list('id', 'quantity')), quants)
+        document.refresh_from_db()
+        self.assertEqual(document.status, 'DRAFT')
+
+    def test_receipt(self):
+        self.assert_rolled_back(prepare_receipt, Receipt)
+
+    def test_delivery(self):
+        self.assert_rolled_back(prepare_delivery, DeliveryOrder)
+
+    def test_transfer(self):
+        self.assert_rolled_back(prepare_transfer, TransferOrder)
+
+    def test_adjustment(self):
+        self.assert_rolled_back(prepare_adjustment, AdjustmentEntry)
+
+
+class MovementExportTests(TestCase):
+    """The streamed ledger export writes every filtered movement"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='auditor', password='secret123', role='ADMIN')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        response = self.client.get('/api/movements/export/', params)
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content)
+        response.close()
+        return response, body
+
+    def csv_rows(self, body):
+        reader = csv.DictReader(io.StringIO(body.decode()))
+        self.assertEqual(reader.fieldnames, [name for name, _ in MOVEMENT_EXPORT_COLUMNS])
+        return list(reader)
+
+    def test_csv_contains_every_movement(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="movements-\d{8}-\d{6}\.csv"')
+        rows = self.csv_rows(body)
+        self.assertEqual(
+            sorted(int(row['id']) for row in rows), sorted(StockMovement.objects.values_list('id', flat=True))
+        )
+        # Newest first, like the list endpoint
+        created = [row['created_at'] for row in rows]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+        movement = StockMovement.objects.select_related('product').get(pk=rows[0]['id'])
+        self.assertEqual(
+            (rows[0]['product_sku'], rows[0]['quantity'], rows[0]['created_at']),
+            (movement.product.sku, str(movement.quantity), movement.created_at.isoformat())
+        )
+        receipt = next(row for row in rows if row['movement_type'] == 'RECEIPT')
+        self.assertEqual((receipt['source_location'], receipt['source_location_code']), ('', ''))
+
+    def test_ndjson_rows(self):
+        response, body = self.export(file_format='ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(len(rows), StockMovement.objects.count())
+        self.assertEqual(list(rows[0]), [name for name, _ in MOVEMENT_EXPORT_COLUMNS])
+        movement = StockMovement.objects.get(pk=rows[0]['id'])
+        self.assertEqual((rows[0]['product'], rows[0]['quantity']), (movement.product_id, str(movement.quantity)))
+
+    def test_gzip_matches_plain_body(self):
+        _, plain = self.export()
+        response, body = self.export(compress='gzip')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertTrue(response['Content-Disposition'].endswith('.csv.gz"'))
+        self.assertEqual(gzip.decompress(body), plain)
+
+    def test_category_filter(self):
+        category = Product.objects.order_by('id').first().category_id
+        rows = self.csv_rows(self.export(product__category=category)[1])
+        expected = StockMovement.objects.filter(product__category=category)
+        self.assertTrue(rows)
+        self.assertEqual(
+            sorted(int(row['id']) for row in rows), sorted(expected.values_list('id', flat=True))
+        )
+
+    def test_created_at_window(self):
+        times = sorted(set(StockMovement.objects.values_list('created_at', flat=True)))
+        start, end = times[1], times[-1]
+        rows = self.csv_rows(self.export(created_at__gte=start.isoformat(), created_at__lt=end.isoformat())[1])
+        expected = StockMovement.objects.filter(created_at__gte=start, created_at__lt=end)
+        self.assertTrue(rows)
+        self.assertEqual(
+            sorted(int(row['id']) for row in rows), sorted(expected.values_list('id', flat=True))
+        )
+        # gte includes the start, lt excludes the end
+        exported = {row['created_at'] for row in rows}
+        self.assertIn(start.isoformat(), exported)
+        self.assertNotIn(end.isoformat(), exported)
+
+    def test_unknown_format(self):
+        response = self.client.get('/api/movements/export/?file_format=xml')
+        self.assertEqual(response.status_code, 400)
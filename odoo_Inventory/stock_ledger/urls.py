@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import StockMovementViewSet
+from .async_views import stock_events
 
 router = DefaultRouter()
 router.register(r'movements', StockMovementViewSet, basename='movement')
 
 urlpatterns = [
+    path('stock-events/', stock_events, name='stock-events'),
     path('', include(router.urls)),
 ]
@@ -1,18 +1,34 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import StockMovement
-from .serializers import StockMovementSerializer, StockMovementDetailSerializer
+from .serializers import StockMovementSerializer, StockMovementDetailSerializer, STOCK_MOVEMENT_ROWS
+from odoo_Inventory.db_routers import ReplicaReadMixin, read_database
+from odoo_Inventory.fast_lists import ValuesListMixin
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
+from .exports import MOVEMENT_EXPORT_COLUMNS, EXPORT_FORMATS, export_stream
 
 
-class StockMovementViewSet(viewsets.ReadOnlyModelViewSet):
+class StockMovementViewSet(ReplicaReadMixin, ValuesListMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for StockMovement model (read-only)"""
     
     queryset = StockMovement.objects.select_related(
         'product', 'source_location', 'destination_location', 'created_by'
     ).all()
     serializer_class = StockMovementSerializer
+    values_mapper = STOCK_MOVEMENT_ROWS
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['movement_type', 'product', 'document_type', 'created_by']
+    filterset_fields = {
+        'movement_type': ['exact'],
+        'product': ['exact'],
+        'product__category': ['exact'],
+        'document_type': ['exact'],
+        'created_by': ['exact'],
+        'created_at': ['gte', 'lt'],
+    }
     search_fields = ['product__sku', 'product__name', 'document_reference']
     ordering_fields = ['created_at', 'quantity']
     ordering = ['-created_at']
@@ -21,3 +37,30 @@ class StockMovementViewSet(viewsets.ReadOnlyModelViewSet):
         if self.action == 'retrieve':
             return StockMovementDetailSerializer
         return StockMovementSerializer
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream the filtered ledger as CSV or NDJSON (?file_format=, ?compress=gzip)"""
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"Unsupported file_format. Choose one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        compress = request.query_params.get('compress') == 'gzip'
+        
+        # The stream is consumed after dispatch returns, so bind the database now
+        queryset = self.filter_queryset(self.get_queryset()).using(read_database())
+        
+        filename = f"movements-{timezone.now():%Y%m%d-%H%M%S}.{file_format}"
+        content_type = EXPORT_FORMATS[file_format]
+        if compress:
+            filename += '.gz'
+            content_type = 'application/gzip'
+        
+        response = StreamingHttpResponse(
+            export_stream(queryset, MOVEMENT_EXPORT_COLUMNS, file_format, compress=compress),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
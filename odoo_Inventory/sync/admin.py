@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import SyncChange, SyncOperation
+
+
+@admin.register(SyncChange)
+class SyncChangeAdmin(admin.ModelAdmin):
+    list_display = ['id', 'entity', 'object_id', 'deleted', 'created_at']
+    list_filter = ['entity', 'deleted']
+    search_fields = ['object_id']
+    ordering = ['-id']
+
+
+@admin.register(SyncOperation)
+class SyncOperationAdmin(admin.ModelAdmin):
+    list_display = ['key', 'user', 'operation_type', 'created_at']
+    list_filter = ['operation_type']
+    search_fields = ['key', 'user__username']
+    readonly_fields = ['created_at']
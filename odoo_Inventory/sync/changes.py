@@ -0,0 +1,72 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from products.models import Product
+from warehouse.models import Location, StockQuant
+from .models import SyncChange
+
+
+SYNC_MODELS = {
+    'product': Product,
+    'location': Location,
+    'quant': StockQuant,
+}
+
+
+class PendingChanges:
+    """Changes made in the current transaction, written in one INSERT on commit.
+
+    Recording at commit time means sequence numbers follow commit order, so
+    a long transaction cannot commit changes behind a client's cursor.
+    """
+
+    def __init__(self):
+        self.changes = {}
+
+    def add(self, entity, object_id, deleted):
+        self.changes[(entity, object_id)] = deleted
+
+    def flush(self):
+        changes, self.changes = self.changes, {}
+        write_changes(changes)
+
+
+def write_changes(changes):
+    """changes: {(entity, object_id): deleted}"""
+    if not changes:
+        return
+    # A delete rolled back to a savepoint must not become a tombstone
+    for entity, model in SYNC_MODELS.items():
+        ids = [object_id for (name, object_id), deleted in changes.items() if name == entity and deleted]
+        if ids:
+            for object_id in model.objects.filter(pk__in=ids).values_list('pk', flat=True):
+                changes[(entity, object_id)] = False
+    rows = [
+        SyncChange(entity=entity, object_id=object_id, deleted=deleted)
+        for (entity, object_id), deleted in changes.items()
+    ]
+    if len(rows) == 1:
+        # Runs after commit; save() skips the transaction bulk_create opens
+        rows[0].save()
+    else:
+        SyncChange.objects.bulk_create(rows)
+
+
+def record_change(entity, object_id, deleted=False, using=DEFAULT_DB_ALIAS):
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        # Autocommit: the change is already durable, one plain INSERT records it
+        SyncChange.objects.using(using).create(entity=entity, object_id=object_id, deleted=deleted)
+        return
+
+    # One PendingChanges per transaction; a new one once the previous was
+    # flushed or discarded by a rollback
+    pending = getattr(connection, 'sync_pending_changes', None)
+    if pending is None or not any(entry[1] == pending.flush for entry in connection.run_on_commit):
+        pending = PendingChanges()
+        connection.sync_pending_changes = pending
+        transaction.on_commit(pending.flush, using=using)
+    pending.add(entity, object_id, deleted)
+
+
+def record_changes(entity, object_ids):
+    """Record many changed objects at once (bulk updates and imports)"""
+    write_changes({(entity, object_id): False for object_id in object_ids})
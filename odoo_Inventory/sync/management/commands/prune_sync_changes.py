@@ -0,0 +1,33 @@
+"""
+Management command to compact the sync change log
+Run with: python manage.py prune_sync_changes
+"""
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from sync.models import SyncChange, SyncOperation
+
+
+class Command(BaseCommand):
+    help = 'Delete superseded sync changes and expired offline operation keys'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--operation-days', type=int, default=30,
+            help='Keep offline operation keys for this many days (default: 30)'
+        )
+
+    def handle(self, *args, **options):
+        # Clients only need the latest change per object, so older ones are
+        # redundant for every cursor. Tombstones are kept.
+        newer = SyncChange.objects.filter(
+            entity=OuterRef('entity'), object_id=OuterRef('object_id'), id__gt=OuterRef('id')
+        )
+        deleted, _ = SyncChange.objects.filter(Exists(newer)).delete()
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} superseded sync changes'))
+        
+        # A replay older than this is applied again
+        cutoff = timezone.now() - timedelta(days=options['operation_days'])
+        deleted, _ = SyncOperation.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} expired offline operation keys'))
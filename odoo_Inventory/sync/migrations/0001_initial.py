@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('product', 'Product'), ('location', 'Location'), ('quant', 'Stock Quant')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'sync_changes',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['entity', 'object_id', 'id'], name='sync_change_entity_661bde_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import models
+
+
+class SyncChange(models.Model):
+    """Change log for delta sync; the id is the sync sequence number"""
+    
+    ENTITY_CHOICES = [
+        ('product', 'Product'),
+        ('location', 'Location'),
+        ('quant', 'Stock Quant'),
+    ]
+    
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'sync_changes'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['entity', 'object_id', 'id']),
+        ]
+    
+    def __str__(self):
+        action = 'deleted' if self.deleted else 'changed'
+        return f"#{self.id} {self.entity} {self.object_id} {action}"
+
+
+class SyncOperation(models.Model):
+    """Operation applied from an offline batch upload, keyed by the client's idempotency key"""
+    
+    OPERATION_TYPE_CHOICES = [
+        ('receipt', 'Receipt'),
+        ('delivery', 'Delivery'),
+        ('transfer', 'Transfer'),
+        ('adjustment', 'Adjustment'),
+    ]
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='sync_operations')
+    key = models.CharField(max_length=100)
+    operation_type = models.CharField(max_length=15, choices=OPERATION_TYPE_CHOICES)
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'sync_operations'
+        ordering = ['-created_at']
+        unique_together = [['user', 'key']]
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.operation_type})"
@@ -0,0 +1,96 @@
+from django.db import IntegrityError, transaction
+from adjustments.serializers import AdjustmentCreateSerializer
+from deliveries.serializers import DeliveryOrderCreateSerializer
+from receipts.serializers import ReceiptCreateSerializer
+from transfers.serializers import TransferOrderCreateSerializer
+from .models import SyncOperation
+
+
+MAX_BATCH_OPERATIONS = 500
+
+# Operation type -> (create serializer, document number field)
+OPERATIONS = {
+    'receipt': (ReceiptCreateSerializer, 'receipt_number'),
+    'delivery': (DeliveryOrderCreateSerializer, 'delivery_number'),
+    'transfer': (TransferOrderCreateSerializer, 'transfer_number'),
+    'adjustment': (AdjustmentCreateSerializer, 'adjustment_number'),
+}
+
+
+def _failed(operation, errors):
+    return {'key': operation['key'], 'type': operation['type'], 'status': 'failed', 'errors': errors}
+
+
+def apply_operation(user, operation):
+    """Create (and optionally validate) one document in its own savepoint"""
+    serializer_class, number_field = OPERATIONS[operation['type']]
+    serializer = serializer_class(data=operation['data'])
+    if not serializer.is_valid():
+        return _failed(operation, serializer.errors)
+    
+    try:
+        with transaction.atomic():
+            document = serializer.save(created_by=user)
+            if operation['validate']:
+                document.validate(user)
+            result = {
+                'key': operation['key'],
+                'type': operation['type'],
+                'status': 'applied',
+                'id': document.id,
+                'number': getattr(document, number_field),
+                'document_status': document.status,
+            }
+            SyncOperation.objects.create(
+                user=user, key=operation['key'], operation_type=operation['type'], result=result
+            )
+    except ValueError as e:
+        return _failed(operation, {'error': str(e)})
+    except IntegrityError as e:
+        # Another upload of the same key committed first
+        existing = SyncOperation.objects.filter(user=user, key=operation['key']).first()
+        if existing:
+            return {**existing.result, 'duplicate': True}
+        return _failed(operation, {'error': str(e).strip()})
+    return result
+
+
+def apply_batch(user, operations, atomic=False):
+    """Apply operations in order in one transaction.
+
+    Keys that were already applied are answered from the stored result
+    instead of being applied again, so a device can replay a whole batch
+    after losing the response. Failed operations are not recorded and can
+    be retried. With atomic=True the first failure rolls the batch back.
+    Returns (results, rolled_back).
+    """
+    keys = [operation['key'] for operation in operations]
+    applied = dict(SyncOperation.objects.filter(user=user, key__in=keys).values_list('key', 'result'))
+    previously_applied = set(applied)
+    results = []
+    rolled_back = False
+    
+    with transaction.atomic():
+        for operation in operations:
+            if rolled_back:
+                results.append({'key': operation['key'], 'type': operation['type'], 'status': 'skipped'})
+                continue
+            if operation['key'] in applied:
+                results.append({**applied[operation['key']], 'duplicate': True})
+                continue
+            
+            result = apply_operation(user, operation)
+            results.append(result)
+            if result['status'] == 'applied':
+                applied[operation['key']] = result
+            elif atomic:
+                transaction.set_rollback(True)
+                rolled_back = True
+    
+    if rolled_back:
+        results = [
+            {**result, 'status': 'rolled_back'}
+            if result['status'] == 'applied' and result['key'] not in previously_applied else result
+            for result in results
+        ]
+    return results, rolled_back
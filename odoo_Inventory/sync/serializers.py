@@ -0,0 +1,47 @@
+from rest_framework import serializers
+from products.models import Product
+from warehouse.models import Location, StockQuant
+from .operations import OPERATIONS, MAX_BATCH_OPERATIONS
+
+
+class ProductSyncSerializer(serializers.ModelSerializer):
+    """Compact product representation for handheld sync"""
+    
+    class Meta:
+        model = Product
+        fields = [
+            'id', 'sku', 'name', 'barcode', 'category', 'uom', 'cost_price', 'selling_price',
+            'min_stock_level', 'reorder_quantity', 'is_active', 'updated_at',
+        ]
+
+
+class LocationSyncSerializer(serializers.ModelSerializer):
+    """Compact location representation for handheld sync"""
+    
+    class Meta:
+        model = Location
+        fields = ['id', 'warehouse', 'code', 'name', 'location_type', 'parent', 'is_active', 'updated_at']
+
+
+class StockQuantSyncSerializer(serializers.ModelSerializer):
+    """Compact stock quant representation for handheld sync"""
+    
+    class Meta:
+        model = StockQuant
+        fields = ['id', 'product', 'location', 'quantity', 'reserved_quantity', 'last_updated']
+
+
+class OperationSerializer(serializers.Serializer):
+    """One offline operation: the document's create payload plus an idempotency key"""
+    
+    key = serializers.CharField(max_length=100)
+    type = serializers.ChoiceField(choices=list(OPERATIONS))
+    data = serializers.DictField()
+    validate = serializers.BooleanField(default=True)
+
+
+class OperationBatchSerializer(serializers.Serializer):
+    """Ordered batch of offline operations"""
+    
+    operations = OperationSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_OPERATIONS)
+    atomic = serializers.BooleanField(default=False)
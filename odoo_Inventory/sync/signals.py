@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from products.models import Product
+from products.signals import products_bulk_updated
+from warehouse.models import Location, StockQuant
+from .changes import record_change, record_changes
+
+
+SYNC_ENTITIES = {
+    Product: 'product',
+    Location: 'location',
+    StockQuant: 'quant',
+}
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=StockQuant)
+def record_saved(sender, instance, raw=False, using=None, **kwargs):
+    if not raw:
+        record_change(SYNC_ENTITIES[sender], instance.pk, using=using)
+
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=StockQuant)
+def record_deleted(sender, instance, using=None, **kwargs):
+    record_change(SYNC_ENTITIES[sender], instance.pk, deleted=True, using=using)
+
+
+@receiver(products_bulk_updated)
+def record_bulk_updated(sender, product_ids, **kwargs):
+    record_changes('product', product_ids)
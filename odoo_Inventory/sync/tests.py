@@ -0,0 +1,199 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from adjustments.models import AdjustmentEntry
+from benchmarks.scenarios import load_scale
+from products.models import Product
+from products.signals import products_bulk_updated
+from receipts.models import Receipt
+from users.models import User
+from warehouse.models import Location, StockQuant
+from .models import SyncChange, SyncOperation
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncChangesTests(TestCase):
+    """Handhelds download only what changed after their cursor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='scanner', password='secret123', role='WAREHOUSE_STAFF')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _changes(self, **params):
+        response = self.client.get('/api/sync/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_bootstrap_returns_cursor_only(self):
+        data = self._changes()
+        self.assertEqual(data['cursor'], 0)
+        self.assertEqual(data['products'], [])
+
+    def test_changes_since_cursor(self):
+        cursor = self._changes()['cursor']
+        product = Product.objects.order_by('id').first()
+        location = Location.objects.order_by('id').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            product.name = 'Renamed'
+            product.save()
+            product.name = 'Renamed twice'
+            product.save()
+            location.save()
+
+        data = self._changes(since=cursor)
+        self.assertEqual([p['name'] for p in data['products']], ['Renamed twice'])
+        self.assertEqual([l['id'] for l in data['locations']], [location.id])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self._changes(since=data['cursor'])['products'], [])
+
+    def test_deletes_become_tombstones(self):
+        template = Product.objects.order_by('id').first()
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(
+                sku='SYNC-DEL', name='Temporary', category_id=template.category_id, uom_id=template.uom_id
+            )
+            product_id = product.id
+            product.delete()
+
+        data = self._changes(since=0)
+        self.assertEqual(data['deleted']['products'], [product_id])
+        self.assertEqual(data['products'], [])
+
+    def test_limit_pages_through_changes(self):
+        products = list(Product.objects.order_by('id')[:3])
+        with self.captureOnCommitCallbacks(execute=True):
+            products_bulk_updated.send(sender=Product, product_ids=[p.id for p in products], fields=['name'])
+
+        first = self._changes(since=0, limit=2)
+        self.assertTrue(first['has_more'])
+        self.assertEqual(len(first['products']), 2)
+        second = self._changes(since=first['cursor'], limit=2)
+        self.assertFalse(second['has_more'])
+        self.assertEqual([p['id'] for p in second['products']], [products[2].id])
+
+    @override_settings(SYNC_SETTLE_SECONDS=3600)
+    def test_unsettled_changes_are_held_back(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.order_by('id').first().save()
+        self.assertEqual(self._changes(since=0)['products'], [])
+
+    def test_changes_are_written_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Product.objects.order_by('id').first().save()
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(SyncChange.objects.exists())
+
+    def test_validation_writes_one_batch(self):
+        location = Location.objects.order_by('id').first()
+        receipt = Receipt.objects.create(
+            receipt_number='SYNC-RCP-2', supplier_name='Supplier', destination_location=location, created_by=self.user
+        )
+        products = list(Product.objects.order_by('id')[:3])
+        for product in products:
+            receipt.lines.create(product=product, quantity=2, unit_price=1)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            receipt.validate(self.user)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(SyncChange.objects.filter(entity='quant').count(), len(products))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/sync/changes/', {'since': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_prune_keeps_latest_change(self):
+        product = Product.objects.order_by('id').first()
+        SyncChange.objects.bulk_create([
+            SyncChange(entity='product', object_id=product.id),
+            SyncChange(entity='product', object_id=product.id),
+        ])
+        call_command('prune_sync_changes', stdout=StringIO())
+        self.assertEqual(SyncChange.objects.count(), 1)
+
+
+class SyncOperationsTests(TestCase):
+    """Offline batches are applied in order and deduplicated by key"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='scanner', password='secret123', role='WAREHOUSE_STAFF')
+        cls.product = Product.objects.order_by('id').first()
+        cls.location = Location.objects.order_by('id').first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _receipt(self, key, number, quantity='5'):
+        return {'key': key, 'type': 'receipt', 'data': {
+            'receipt_number': number, 'supplier_name': 'Cold room', 'destination_location': self.location.id,
+            'lines': [{'product': self.product.id, 'quantity': quantity}],
+        }}
+
+    def _adjustment(self, key, number):
+        return {'key': key, 'type': 'adjustment', 'validate': False, 'data': {
+            'adjustment_number': number, 'location': self.location.id, 'product': self.product.id,
+            'system_quantity': '0', 'counted_quantity': '1', 'reason': 'PHYSICAL_COUNT',
+        }}
+
+    def _upload(self, operations, **extra):
+        return self.client.post('/api/sync/operations/', {'operations': operations, **extra}, format='json')
+
+    def _stock(self):
+        quant = StockQuant.objects.filter(product=self.product, location=self.location).first()
+        return quant.quantity if quant else 0
+
+    def test_batch_applies_in_order(self):
+        before = self._stock()
+        response = self._upload([self._receipt('k1', 'OFF-R1'), self._adjustment('k2', 'OFF-A1')])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['applied'], 2)
+        self.assertEqual([r['document_status'] for r in response.data['results']], ['DONE', 'DRAFT'])
+        self.assertEqual(self._stock(), before + 5)
+        self.assertTrue(AdjustmentEntry.objects.filter(adjustment_number='OFF-A1', created_by=self.user).exists())
+
+    def test_replay_is_deduplicated(self):
+        operations = [self._receipt('k1', 'OFF-R1')]
+        first = self._upload(operations).data['results'][0]
+        before = self._stock()
+        replay = self._upload(operations)
+        self.assertEqual(replay.data['duplicate'], 1)
+        self.assertEqual(replay.data['results'][0]['id'], first['id'])
+        self.assertEqual(self._stock(), before)
+        self.assertEqual(Receipt.objects.filter(receipt_number='OFF-R1').count(), 1)
+
+    def test_failed_operations_are_reported_and_retryable(self):
+        response = self._upload([self._receipt('k1', 'OFF-R1'), self._receipt('k2', 'OFF-R2', quantity='0')])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['status'] for r in response.data['results']], ['applied', 'failed'])
+        self.assertIn('lines', response.data['results'][1]['errors'])
+        self.assertFalse(SyncOperation.objects.filter(key='k2').exists())
+
+        retry = self._upload([self._receipt('k2', 'OFF-R2')])
+        self.assertEqual(retry.data['applied'], 1)
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        response = self._upload([
+            self._receipt('k1', 'OFF-R1'), self._receipt('k2', 'OFF-R2', quantity='0'), self._receipt('k3', 'OFF-R3'),
+        ], atomic=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r['status'] for r in response.data['results']], ['rolled_back', 'failed', 'skipped'])
+        self.assertFalse(Receipt.objects.filter(receipt_number__startswith='OFF-').exists())
+        self.assertFalse(SyncOperation.objects.exists())
+
+    def test_keys_are_scoped_per_user(self):
+        self._upload([self._receipt('k1', 'OFF-R1')])
+        other = User.objects.create_user(username='other', password='secret123', role='WAREHOUSE_STAFF')
+        self.client.force_authenticate(other)
+        response = self._upload([self._receipt('k1', 'OFF-R2')])
+        self.assertEqual(response.data['applied'], 1)
+
+    def test_invalid_batch(self):
+        self.assertEqual(self._upload([]).status_code, 400)
+        self.assertEqual(self._upload([{'key': 'k1', 'type': 'scrap', 'data': {}}]).status_code, 400)
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import SyncChangesView, SyncOperationsView
+
+urlpatterns = [
+    path('changes/', SyncChangesView.as_view(), name='sync-changes'),
+    path('operations/', SyncOperationsView.as_view(), name='sync-operations'),
+]
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .changes import SYNC_MODELS
+from .models import SyncChange
+from .operations import apply_batch
+from .serializers import (
+    ProductSyncSerializer, LocationSyncSerializer, StockQuantSyncSerializer, OperationBatchSerializer
+)
+
+
+SYNC_SERIALIZERS = {
+    'product': ProductSyncSerializer,
+    'location': LocationSyncSerializer,
+    'quant': StockQuantSyncSerializer,
+}
+
+# Response keys per entity
+SYNC_KEYS = {
+    'product': 'products',
+    'location': 'locations',
+    'quant': 'quants',
+}
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+
+class SyncChangesView(APIView):
+    """Products, locations and stock quants changed after a sync cursor"""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        """Get changes since ?since=<cursor> (omit since to get the current cursor)"""
+        try:
+            since = request.query_params.get('since')
+            since = int(since) if since is not None else None
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+        except ValueError:
+            return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1:
+            return Response({'error': 'limit must be positive'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Changes still being committed by concurrent requests may get lower
+        # sequence numbers; leave them a moment before handing out a cursor
+        settled = SyncChange.objects.filter(
+            created_at__lte=timezone.now() - timedelta(seconds=getattr(settings, 'SYNC_SETTLE_SECONDS', 2))
+        )
+        
+        data = {key: [] for key in SYNC_KEYS.values()}
+        data['deleted'] = {key: [] for key in SYNC_KEYS.values()}
+        
+        if since is None:
+            # Bootstrap: take the cursor first, then download the full lists
+            data['cursor'] = settled.aggregate(cursor=Max('id'))['cursor'] or 0
+            data['has_more'] = False
+            return Response(data)
+        
+        changes = list(settled.filter(id__gt=since).order_by('id').values_list(
+            'id', 'entity', 'object_id', 'deleted'
+        )[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        
+        # Latest change per object wins
+        latest = {}
+        for _, entity, object_id, deleted in changes:
+            latest[(entity, object_id)] = deleted
+        
+        for entity, model in SYNC_MODELS.items():
+            key = SYNC_KEYS[entity]
+            changed = [object_id for (name, object_id), deleted in latest.items() if name == entity and not deleted]
+            data['deleted'][key] = sorted(
+                object_id for (name, object_id), deleted in latest.items() if name == entity and deleted
+            )
+            if changed:
+                # Objects deleted since are skipped; their tombstone follows
+                objects = model.objects.filter(pk__in=changed).order_by('pk')
+                data[key] = SYNC_SERIALIZERS[entity](objects, many=True).data
+        
+        data['cursor'] = changes[-1][0] if changes else since
+        data['has_more'] = has_more
+        return Response(data)
+
+
+class SyncOperationsView(APIView):
+    """Batch upload of operations recorded offline by handheld scanners"""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        """Apply receipts, deliveries, transfers and adjustments in order, once per key"""
+        serializer = OperationBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        results, rolled_back = apply_batch(
+            request.user, serializer.validated_data['operations'], atomic=serializer.validated_data['atomic']
+        )
+        counts = {'applied': 0, 'duplicate': 0, 'failed': 0}
+        for result in results:
+            if result.get('duplicate'):
+                counts['duplicate'] += 1
+            elif result['status'] in counts:
+                counts[result['status']] += 1
+        
+        return Response(
+            {'results': results, 'rolled_back': rolled_back, **counts},
+            status=status.HTTP_400_BAD_REQUEST if rolled_back else status.HTTP_200_OK
+        )
@@ -1,10 +1,11 @@
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from django.conf import settings
 from products.models import Product
 from warehouse.models import Location
 from stock_ledger.models import StockMovement
+from monitoring.metrics import timed_validation
 
 
 class TransferOrder(models.Model):
@@ -48,6 +49,8 @@ class TransferOrder(models.Model):
     def __str__(self):
         return f"{self.transfer_number} - {self.source_location.code} to {self.destination_location.code}"
     
+    @timed_validation('TRANSFER')
+    @transaction.atomic
     def validate(self, user):
         """Validate transfer and create stock movements"""
         if self.status == 'DONE':
@@ -2,16 +2,18 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from idempotency.decorators import idempotent
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
 from .models import TransferOrder, TransferLine
-from .serializers import TransferOrderSerializer, TransferOrderCreateSerializer
+from .serializers import (
+    TransferOrderSerializer, TransferOrderListSerializer, TransferOrderCreateSerializer, TRANSFER_LIST_TOTALS
+)
 
 
-class TransferOrderViewSet(viewsets.ModelViewSet):
+class TransferOrderViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for TransferOrder model"""
     
-    queryset = TransferOrder.objects.select_related(
-        'source_location', 'destination_location', 'created_by', 'validated_by'
-    ).prefetch_related('lines__product').all()
+    queryset = TransferOrder.objects.all()
     serializer_class = TransferOrderSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'source_location', 'destination_location', 'created_by']
@@ -19,15 +21,28 @@ class TransferOrderViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'scheduled_date', 'transfer_date']
     ordering = ['-created_at']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.annotate(**TRANSFER_LIST_TOTALS)
+        return queryset
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return TransferOrderCreateSerializer
+        if self.action == 'list':
+            return TransferOrderListSerializer
         return TransferOrderSerializer
     
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def validate_transfer(self, request, pk=None):
         """Validate transfer and create stock movements"""
         transfer = self.get_object()
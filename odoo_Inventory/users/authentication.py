@@ -0,0 +1,115 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from monitoring import metrics
+
+
+class TokenCache:
+    """Bounded LRU of token key -> user with a TTL, shared by all threads of a process"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            user, expires = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return user
+
+    def set(self, key, user):
+        with self.lock:
+            self.entries[key] = (user, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self.lock:
+            for key in [key for key, (user, _) in self.entries.items() if user.pk == user_id]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache(
+    getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 10000),
+    getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 30),
+)
+
+
+def _shared_cache():
+    alias = getattr(settings, 'TOKEN_AUTH_SHARED_CACHE', None)
+    return caches[alias] if alias else None
+
+
+def _shared_key(key):
+    # Never use the raw token as a cache key
+    return 'auth:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    """Drop a token from the local and shared caches"""
+    token_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_shared_key(key))
+
+
+def invalidate_user(user):
+    """Drop every cached token of a user (logout, password change, deactivation)"""
+    token_cache.delete_user(user.pk)
+    shared = _shared_cache()
+    if shared is not None:
+        keys = Token.objects.filter(user_id=user.pk).values_list('key', flat=True)
+        shared.delete_many([_shared_key(key) for key in keys])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that caches token -> user instead of querying on every request.
+
+    Entries live in a per-process LRU for TOKEN_AUTH_CACHE_TTL seconds and,
+    when TOKEN_AUTH_SHARED_CACHE names a cache alias, in that shared cache.
+    Tokens are invalidated when deleted and when their user is saved, which
+    covers logout, password resets and deactivation.
+    """
+
+    def authenticate_credentials(self, key):
+        user = token_cache.get(key)
+        metrics.record_cache('token_auth_local', user is not None)
+        if user is not None:
+            return (copy.copy(user), key)
+
+        shared = _shared_cache()
+        if shared is not None:
+            user = shared.get(_shared_key(key))
+            metrics.record_cache('token_auth_shared', user is not None)
+            if user is not None:
+                token_cache.set(key, user)
+                return (copy.copy(user), key)
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, user)
+        if shared is not None:
+            shared.set(_shared_key(key), user, getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 30))
+        return (copy.copy(user), token)
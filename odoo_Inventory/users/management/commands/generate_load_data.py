@@ -0,0 +1,497 @@
+"""
+Management command to generate production-sized synthetic data for benchmarks
+Run with: python manage.py generate_load_data --products 100000 --locations 5000 --movements 10000000
+"""
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.utils import timezone
+from users.models import User
+from products.models import Category, UnitOfMeasure, Product
+from warehouse.models import Warehouse, Location, StockQuant
+from stock_ledger.models import StockMovement
+from receipts.models import Receipt, ReceiptLine
+from deliveries.models import DeliveryOrder, DeliveryLine
+from transfers.models import TransferOrder, TransferLine
+from adjustments.models import AdjustmentEntry
+
+
+PREFIX = 'LD'
+
+SCALES = {
+    'small': {'products': 1000, 'locations': 50, 'movements': 20000, 'users': 5},
+    'medium': {'products': 20000, 'locations': 1000, 'movements': 1000000, 'users': 20},
+    'large': {'products': 100000, 'locations': 5000, 'movements': 10000000, 'users': 50},
+}
+
+UOMS = [
+    ('Piece', 'PCS'), ('Kilogram', 'KG'), ('Liter', 'L'),
+    ('Meter', 'M'), ('Box', 'BOX'), ('Carton', 'CTN'),
+]
+
+CATEGORY_NAMES = [
+    'Electronics', 'Furniture', 'Raw Materials', 'Finished Goods', 'Office Supplies',
+    'Packaging', 'Spare Parts', 'Chemicals', 'Textiles', 'Hardware', 'Tools',
+    'Food & Beverage', 'Cleaning', 'Safety Equipment', 'Automotive', 'Medical',
+]
+
+NOUNS = [
+    'Bolt', 'Cable', 'Panel', 'Sensor', 'Valve', 'Bracket', 'Filter', 'Motor',
+    'Switch', 'Bearing', 'Gasket', 'Hinge', 'Pump', 'Relay', 'Spring', 'Tube',
+]
+
+ADJECTIVES = ['Steel', 'Copper', 'Plastic', 'Heavy', 'Compact', 'Industrial', 'Mini', 'Pro']
+
+PARTNERS = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne', 'Hooli', 'Vehement']
+
+ADJUSTMENT_REASONS = ['DAMAGED', 'LOST', 'FOUND', 'PHYSICAL_COUNT', 'QUALITY_ISSUE']
+
+# Share of generated documents per type
+DOCUMENT_WEIGHTS = [('RECEIPT', 40), ('DELIVERY', 35), ('TRANSFER', 20), ('ADJUSTMENT', 5)]
+
+HOME_LOCATIONS_PER_PRODUCT = 3
+
+
+class TableWriter:
+    """Buffered writer of raw rows into one table.
+
+    Uses COPY on PostgreSQL (psycopg 3) and executemany INSERTs elsewhere.
+    Rows bypass model save(), so StockMovement does not touch quants and
+    auto_now fields keep the generated timestamps. Writers whose rows point
+    at each other share an on_full callback that flushes them together.
+    """
+
+    def __init__(self, model, attnames, batch_size, on_full=None):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in attnames]
+        self.batch_size = batch_size
+        self.on_full = on_full
+        self.rows = []
+        self.written = 0
+
+        qn = connection.ops.quote_name
+        self.table = qn(model._meta.db_table)
+        self.columns = ', '.join(qn(field.column) for field in self.fields)
+
+    def add(self, *row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            (self.on_full or self.flush)()
+
+    def flush(self):
+        if not self.rows:
+            return
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql' and hasattr(cursor.cursor, 'copy'):
+                with cursor.cursor.copy(f"COPY {self.table} ({self.columns}) FROM STDIN") as copy:
+                    for row in self.rows:
+                        copy.write_row(row)
+            else:
+                placeholders = ', '.join(['%s'] * len(self.fields))
+                cursor.executemany(
+                    f"INSERT INTO {self.table} ({self.columns}) VALUES ({placeholders})",
+                    [
+                        [field.get_db_prep_save(value, connection) for field, value in zip(self.fields, row)]
+                        for row in self.rows
+                    ]
+                )
+        self.written += len(self.rows)
+        self.rows = []
+
+
+def next_id(model):
+    last = model.objects.order_by('-pk').values_list('pk', flat=True).first()
+    return (last or 0) + 1
+
+
+class Command(BaseCommand):
+    help = 'Generate seeded, production-sized data for performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Preset sizes (overridden by explicit counts)')
+        parser.add_argument('--products', type=int)
+        parser.add_argument('--locations', type=int)
+        parser.add_argument('--movements', type=int)
+        parser.add_argument('--users', type=int)
+        parser.add_argument('--days', type=int, default=365, help='Spread movements over this many past days')
+        parser.add_argument('--pending-ratio', type=float, default=0.02, help='Share of documents left unvalidated')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def log(self, message):
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(f'[{elapsed:7.1f}s] {message}')
+
+    def handle(self, *args, **options):
+        sizes = dict(SCALES[options['scale']])
+        for key in sizes:
+            if options[key] is not None:
+                sizes[key] = options[key]
+        for key, value in sizes.items():
+            if value < 0:
+                raise CommandError(f'--{key} cannot be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        # Every document needs a product and a location, or no line is ever generated
+        if sizes['movements'] and (sizes['products'] < 1 or sizes['locations'] < 1):
+            raise CommandError('Movements need at least one product and one location')
+
+        if Product.objects.filter(sku__startswith=f'{PREFIX}-').exists():
+            raise CommandError('Load data already present; run against a fresh database')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.started = time.monotonic()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generating {sizes['products']} products, {sizes['locations']} locations, "
+            f"{sizes['movements']} movements (seed {options['seed']})"
+        ))
+
+        self.create_users(sizes['users'])
+        self.create_master_data()
+        self.create_products(sizes['products'])
+        self.create_locations(sizes['locations'])
+        self.create_documents(sizes['movements'], options['days'], options['pending_ratio'])
+        self.reset_sequences()
+
+        self.log(self.style.SUCCESS('=== Load data generated ==='))
+
+    def create_users(self, count):
+        password = make_password('loaddata123')
+        start = next_id(User)
+        users = [
+            User(
+                id=start + i, username=f'{PREFIX.lower()}_user_{start + i}', password=password,
+                email=f'{PREFIX.lower()}_user_{start + i}@inventory.com',
+                role=self.rng.choice(['INVENTORY_MANAGER', 'WAREHOUSE_STAFF']),
+            )
+            for i in range(count)
+        ]
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+        self.user_ids = [user.id for user in users] or list(User.objects.values_list('id', flat=True)[:1])
+        if not self.user_ids:
+            raise CommandError('At least one user is required')
+        self.log(f'✓ {count} users (password: loaddata123)')
+
+    def create_master_data(self):
+        for name, abbreviation in UOMS:
+            UnitOfMeasure.objects.get_or_create(name=name, defaults={'abbreviation': abbreviation})
+        for name in CATEGORY_NAMES:
+            Category.objects.get_or_create(name=name)
+        self.uom_ids = list(UnitOfMeasure.objects.values_list('id', flat=True))
+        self.category_ids = list(Category.objects.values_list('id', flat=True))
+        self.log(f'✓ {len(self.uom_ids)} units of measure, {len(self.category_ids)} categories')
+
+    def create_products(self, count):
+        rng = self.rng
+        writer = TableWriter(Product, [
+            'id', 'sku', 'name', 'description', 'category', 'uom', 'cost_price', 'selling_price',
+            'min_stock_level', 'reorder_quantity', 'barcode', 'image', 'weight', 'is_active',
+            'created_at', 'updated_at',
+        ], self.batch_size)
+
+        start = next_id(Product)
+        self.product_ids = []
+        self.product_costs = {}
+        for i in range(count):
+            product_id = start + i
+            cost = rng.randint(50, 500000) / 100
+            created = self.now - timedelta(days=rng.randint(30, 1500))
+            writer.add(
+                product_id, f'{PREFIX}-{product_id:07d}',
+                f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {product_id}', None,
+                rng.choice(self.category_ids), rng.choice(self.uom_ids),
+                cost, round(cost * rng.uniform(1.1, 1.8), 2),
+                rng.randint(0, 100), rng.randint(0, 500), f'{PREFIX}{product_id:011d}', '',
+                None, rng.random() > 0.03, created, created,
+            )
+            self.product_ids.append(product_id)
+            self.product_costs[product_id] = cost
+        writer.flush()
+        self.log(f'✓ {writer.written} products')
+
+    def create_locations(self, count):
+        rng = self.rng
+        warehouse_count = max(1, count // 500)
+        first_warehouse = next_id(Warehouse)
+        warehouses = [
+            Warehouse(code=f'{PREFIX}-WH{first_warehouse + i:03d}', name=f'Load Warehouse {i + 1}',
+                      city=rng.choice(['Mumbai', 'Delhi', 'Pune', 'Chennai', 'Kolkata']), country='India')
+            for i in range(warehouse_count)
+        ]
+        Warehouse.objects.bulk_create(warehouses)
+        warehouse_ids = list(Warehouse.objects.filter(
+            code__startswith=f'{PREFIX}-WH').order_by('id').values_list('id', flat=True))
+
+        writer = TableWriter(Location, [
+            'id', 'warehouse', 'code', 'name', 'location_type', 'parent', 'capacity',
+            'is_active', 'created_at', 'updated_at',
+        ], self.batch_size)
+        start = next_id(Location)
+        self.location_ids = []
+        for i in range(count):
+            location_id = start + i
+            location_type = rng.choice(['ZONE', 'AREA', 'RACK', 'BIN', 'SHELF'])
+            writer.add(
+                location_id, warehouse_ids[i % len(warehouse_ids)], f'{location_type}-{location_id:06d}',
+                f'{location_type.title()} {location_id}', location_type, None,
+                rng.choice([None, 100, 500, 1000]), True, self.now, self.now,
+            )
+            self.location_ids.append(location_id)
+        writer.flush()
+
+        # Each product lives in a few home locations so quants stay realistic and bounded
+        self.products_by_location = {location_id: [] for location_id in self.location_ids}
+        for product_id in self.product_ids:
+            for location_id in rng.sample(self.location_ids, min(HOME_LOCATIONS_PER_PRODUCT, count)):
+                self.products_by_location[location_id].append(product_id)
+        self.log(f'✓ {warehouse_count} warehouses, {writer.written} locations')
+
+    def create_documents(self, movement_target, days, pending_ratio):
+        rng = self.rng
+        batch = self.batch_size
+        self.quants = {}
+
+        # Insertion order: headers before their lines, movements last
+        writers = {
+            'receipt': TableWriter(Receipt, [
+                'id', 'receipt_number', 'supplier_name', 'supplier_reference', 'destination_location',
+                'status', 'expected_date', 'received_date', 'notes', 'responsible', 'created_by',
+                'validated_by', 'created_at', 'updated_at', 'validated_at',
+            ], batch, self.flush_documents),
+            'receipt_line': TableWriter(ReceiptLine, [
+                'receipt', 'product', 'quantity', 'unit_price', 'notes', 'created_at',
+            ], batch, self.flush_documents),
+            'delivery': TableWriter(DeliveryOrder, [
+                'id', 'delivery_number', 'customer_name', 'customer_reference', 'source_location',
+                'shipping_address', 'status', 'scheduled_date', 'delivery_date', 'notes', 'responsible',
+                'created_by', 'validated_by', 'created_at', 'updated_at', 'validated_at',
+            ], batch, self.flush_documents),
+            'delivery_line': TableWriter(DeliveryLine, [
+                'delivery', 'product', 'quantity', 'unit_price', 'notes', 'created_at',
+            ], batch, self.flush_documents),
+            'transfer': TableWriter(TransferOrder, [
+                'id', 'transfer_number', 'source_location', 'destination_location', 'status',
+                'scheduled_date', 'transfer_date', 'notes', 'created_by', 'validated_by',
+                'created_at', 'updated_at', 'validated_at',
+            ], batch, self.flush_documents),
+            'transfer_line': TableWriter(TransferLine, [
+                'transfer', 'product', 'quantity', 'notes', 'created_at',
+            ], batch, self.flush_documents),
+            'adjustment': TableWriter(AdjustmentEntry, [
+                'id', 'adjustment_number', 'location', 'product', 'system_quantity', 'counted_quantity',
+                'adjustment_quantity', 'reason', 'notes', 'status', 'created_by', 'validated_by',
+                'created_at', 'updated_at', 'validated_at',
+            ], batch, self.flush_documents),
+            'movement': TableWriter(StockMovement, [
+                'id', 'movement_type', 'product', 'quantity', 'source_location', 'destination_location',
+                'document_reference', 'document_type', 'created_by', 'created_at', 'notes',
+            ], batch, self.flush_documents),
+        }
+        self.writers = writers
+        self.ids = {
+            'movement': next_id(StockMovement), 'receipt': next_id(Receipt),
+            'delivery': next_id(DeliveryOrder), 'transfer': next_id(TransferOrder),
+            'adjustment': next_id(AdjustmentEntry),
+        }
+
+        types = [name for name, _ in DOCUMENT_WEIGHTS]
+        weights = [weight for _, weight in DOCUMENT_WEIGHTS]
+        start = self.now - timedelta(days=days)
+        span = (self.now - start).total_seconds()
+        # Document lines generated so far; pending documents count towards the
+        # target even though they do not post movements
+        self.generated = 0
+        next_report = max(movement_target // 20, 1)
+
+        while self.generated < movement_target:
+            at = start + timedelta(seconds=span * self.generated / movement_target)
+            user_id = rng.choice(self.user_ids)
+            pending = rng.random() < pending_ratio
+            lines = min(rng.randint(1, 8), movement_target - self.generated)
+            document_type = rng.choices(types, weights)[0]
+
+            if document_type == 'DELIVERY' and not self.add_delivery(at, user_id, lines, pending):
+                document_type = 'RECEIPT'
+            if document_type == 'TRANSFER' and not self.add_transfer(at, user_id, lines, pending):
+                document_type = 'RECEIPT'
+            if document_type == 'ADJUSTMENT':
+                self.add_adjustment(at, user_id, pending)
+            if document_type == 'RECEIPT':
+                self.add_receipt(at, user_id, lines, pending)
+
+            if self.generated >= next_report:
+                self.log(f'  {self.generated} / {movement_target} lines')
+                next_report += max(movement_target // 20, 1)
+
+        self.flush_documents()
+        self.log(
+            f"✓ {writers['movement'].written} movements, {writers['receipt'].written} receipts, "
+            f"{writers['delivery'].written} deliveries, {writers['transfer'].written} transfers, "
+            f"{writers['adjustment'].written} adjustments"
+        )
+
+        quant_writer = TableWriter(StockQuant, [
+            'product', 'location', 'quantity', 'reserved_quantity', 'last_updated', 'created_at',
+        ], batch)
+        for (product_id, location_id), (quantity, first, last) in self.quants.items():
+            quant_writer.add(product_id, location_id, quantity, 0, last, first)
+        quant_writer.flush()
+        self.log(f'✓ {quant_writer.written} stock quants')
+
+    def flush_documents(self):
+        """Flush every document writer in insertion order, so no line lands before its header"""
+        for writer in self.writers.values():
+            writer.flush()
+
+    def move(self, product_id, location_id, quantity, at):
+        key = (product_id, location_id)
+        if key in self.quants:
+            self.quants[key][0] += quantity
+            self.quants[key][2] = at
+        else:
+            self.quants[key] = [quantity, at, at]
+
+    def stock(self, product_id, location_id):
+        quant = self.quants.get((product_id, location_id))
+        return quant[0] if quant else 0
+
+    def add_movement(self, movement_type, product_id, quantity, source, destination, reference, user_id, at, notes):
+        self.writers['movement'].add(
+            self.ids['movement'], movement_type, product_id, quantity, source, destination,
+            reference, movement_type, user_id, at, notes,
+        )
+        self.ids['movement'] += 1
+        if source:
+            self.move(product_id, source, -quantity, at)
+        if destination:
+            self.move(product_id, destination, quantity, at)
+
+    def header_status(self, at, user_id, pending):
+        if pending:
+            return self.rng.choice(['DRAFT', 'WAITING', 'READY']), None, None
+        return 'DONE', user_id, at
+
+    def add_receipt(self, at, user_id, lines, pending):
+        rng = self.rng
+        location_id = rng.choice(self.location_ids)
+        candidates = self.products_by_location[location_id] or self.product_ids
+        products = rng.sample(candidates, min(lines, len(candidates)))
+        receipt_id = self.ids['receipt']
+        self.ids['receipt'] += 1
+        number = f'{PREFIX}-RCP-{receipt_id:08d}'
+        supplier = f'{rng.choice(PARTNERS)} Supplies'
+        status, validated_by, validated_at = self.header_status(at, user_id, pending)
+
+        self.writers['receipt'].add(
+            receipt_id, number, supplier, None, location_id, status, at.date(),
+            at.date() if validated_at else None, None, None, user_id, validated_by, at, at, validated_at,
+        )
+        for product_id in products:
+            quantity = rng.randint(10, 200)
+            self.writers['receipt_line'].add(receipt_id, product_id, quantity, self.product_costs[product_id], None, at)
+            if not pending:
+                self.add_movement('RECEIPT', product_id, quantity, None, location_id, number, user_id, at,
+                                  f'Receipt from {supplier}')
+        self.generated += len(products)
+
+    def add_delivery(self, at, user_id, lines, pending):
+        rng = self.rng
+        location_id = rng.choice(self.location_ids)
+        in_stock = [p for p in self.products_by_location[location_id] if self.stock(p, location_id) > 0]
+        if not in_stock:
+            return False
+        products = rng.sample(in_stock, min(lines, len(in_stock)))
+        delivery_id = self.ids['delivery']
+        self.ids['delivery'] += 1
+        number = f'{PREFIX}-DEL-{delivery_id:08d}'
+        customer = f'{rng.choice(PARTNERS)} Retail'
+        status, validated_by, validated_at = self.header_status(at, user_id, pending)
+
+        self.writers['delivery'].add(
+            delivery_id, number, customer, None, location_id, None, status, at.date(),
+            at.date() if validated_at else None, None, None, user_id, validated_by, at, at, validated_at,
+        )
+        for product_id in products:
+            quantity = rng.randint(1, min(self.stock(product_id, location_id), 50))
+            price = round(self.product_costs[product_id] * 1.4, 2)
+            self.writers['delivery_line'].add(delivery_id, product_id, quantity, price, None, at)
+            if not pending:
+                self.add_movement('DELIVERY', product_id, quantity, location_id, None, number, user_id, at,
+                                  f'Delivery to {customer}')
+        self.generated += len(products)
+        return True
+
+    def add_transfer(self, at, user_id, lines, pending):
+        rng = self.rng
+        source_id = rng.choice(self.location_ids)
+        in_stock = [p for p in self.products_by_location[source_id] if self.stock(p, source_id) > 0]
+        if not in_stock or len(self.location_ids) < 2:
+            return False
+        # Transfers go to the neighbouring location, keeping the set of quants bounded
+        index = source_id - self.location_ids[0]
+        destination_id = self.location_ids[(index + 1) % len(self.location_ids)]
+        products = rng.sample(in_stock, min(lines, len(in_stock)))
+        transfer_id = self.ids['transfer']
+        self.ids['transfer'] += 1
+        number = f'{PREFIX}-TRF-{transfer_id:08d}'
+        status, validated_by, validated_at = self.header_status(at, user_id, pending)
+
+        self.writers['transfer'].add(
+            transfer_id, number, source_id, destination_id, status, at.date(),
+            at.date() if validated_at else None, None, user_id, validated_by, at, at, validated_at,
+        )
+        for product_id in products:
+            quantity = rng.randint(1, min(self.stock(product_id, source_id), 50))
+            self.writers['transfer_line'].add(transfer_id, product_id, quantity, None, at)
+            if not pending:
+                self.add_movement('TRANSFER', product_id, quantity, source_id, destination_id, number, user_id, at,
+                                  'Transfer between locations')
+        self.generated += len(products)
+        return True
+
+    def add_adjustment(self, at, user_id, pending):
+        rng = self.rng
+        location_id = rng.choice(self.location_ids)
+        candidates = self.products_by_location[location_id] or self.product_ids
+        product_id = rng.choice(candidates)
+        system_quantity = self.stock(product_id, location_id)
+        counted = max(system_quantity + rng.randint(-5, 5), 0)
+        difference = counted - system_quantity
+        adjustment_id = self.ids['adjustment']
+        self.ids['adjustment'] += 1
+        number = f'{PREFIX}-ADJ-{adjustment_id:08d}'
+        reason = rng.choice(ADJUSTMENT_REASONS)
+        status, validated_by, validated_at = self.header_status(at, user_id, pending)
+        if status not in ('DRAFT', 'DONE'):
+            status = 'DRAFT'
+
+        self.writers['adjustment'].add(
+            adjustment_id, number, location_id, product_id, system_quantity, counted, difference,
+            reason, None, status, user_id, validated_by, at, at, validated_at,
+        )
+        self.generated += 1
+        if pending or difference == 0:
+            return
+        if difference > 0:
+            self.add_movement('ADJUSTMENT', product_id, difference, None, location_id, number, user_id, at,
+                              f'Adjustment: {reason}')
+        else:
+            self.add_movement('ADJUSTMENT', product_id, -difference, location_id, None, number, user_id, at,
+                              f'Adjustment: {reason}')
+
+    def reset_sequences(self):
+        models = [
+            User, Product, Warehouse, Location, StockQuant, StockMovement, Receipt, ReceiptLine,
+            DeliveryOrder, DeliveryLine, TransferOrder, TransferLine, AdjustmentEntry,
+        ]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
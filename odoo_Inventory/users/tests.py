@@ -1,3 +1,89 @@
-from django.test import TestCase
+import io
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, TransactionTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from products.models import Product
+from receipts.models import Receipt, ReceiptLine
+from stock_ledger.models import StockMovement
+from warehouse.models import StockQuant
+from .authentication import token_cache
+from .models import User
 
-# Create your tests here.
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Token lookups are cached and dropped when the token or user changes"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='scanner', password='secret123', role='ADMIN')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_second_request_skips_token_query(self):
+        self.client.get('/api/users/me/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/users/me/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_invalidates_token(self):
+        self.client.get('/api/users/me/')
+        self.client.post('/api/users/logout/')
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+    def test_deactivation_invalidates_token(self):
+        self.client.get('/api/users/me/')
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+    def test_password_reset_refreshes_cached_user(self):
+        self.client.get('/api/users/me/')
+        self.user.set_password('new-secret123')
+        self.user.save()
+        self.assertEqual(token_cache.get(self.token.key), None)
+
+
+class LeanMiddlewareTests(TestCase):
+    """Token API calls bypass the session stack, browser logins keep it"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='clerk', password='secret123', role='ADMIN')
+        self.token = Token.objects.create(user=self.user)
+
+    def test_token_request_skips_session(self):
+        response = self.client.get('/api/users/me/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+
+    def test_session_request_uses_full_stack(self):
+        self.client.force_login(self.user)
+        response = self.client.get('/api/users/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['username'], 'clerk')
+
+
+class GenerateLoadDataTests(TransactionTestCase):
+    """Load data generation in autocommit, where foreign keys are checked per batch"""
+
+    def test_small_batches_flush_headers_before_lines(self):
+        call_command(
+            'generate_load_data', products=20, locations=4, movements=300, users=2,
+            batch_size=10, stdout=io.StringIO()
+        )
+        self.assertEqual(ReceiptLine.objects.exclude(receipt__in=Receipt.objects.all()).count(), 0)
+        self.assertTrue(StockMovement.objects.exists())
+        self.assertTrue(StockQuant.objects.exists())
+
+    def test_rejects_sizes_that_cannot_generate_movements(self):
+        for options, message in [
+            ({'products': 0}, 'at least one product and one location'),
+            ({'locations': 0}, 'at least one product and one location'),
+            ({'movements': -1}, '--movements cannot be negative'),
+            ({'batch_size': 0}, '--batch-size must be at least 1'),
+        ]:
+            with self.subTest(**options), self.assertRaisesMessage(CommandError, message):
+                call_command('generate_load_data', stdout=io.StringIO(), **options)
+        self.assertFalse(Product.objects.exists())
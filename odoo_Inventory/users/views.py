@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import login, logout
 from django.utils import timezone
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
 from .models import User, OTPVerification
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, LoginSerializer,
@@ -11,7 +12,7 @@ from .serializers import (
 )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for User model"""
     
     queryset = User.objects.all()
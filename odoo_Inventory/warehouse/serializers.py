@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from odoo_Inventory.fast_lists import ValuesRowMapper
 from .models import Warehouse, Location, StockQuant
 from products.serializers import ProductListSerializer
 
@@ -56,11 +57,19 @@ class StockQuantSerializer(serializers.ModelSerializer):
             'last_updated', 'created_at'
         ]
         read_only_fields = ['id', 'last_updated', 'created_at']
+        expandable_fields = {'location': LocationSerializer}
     
     def get_available_quantity(self, obj):
         return obj.available_quantity()
 
 
+STOCK_QUANT_ROWS = ValuesRowMapper(
+    StockQuantSerializer,
+    methods={'available_quantity': lambda row: row['quantity'] - row['reserved_quantity']},
+    requires={'available_quantity': ('quantity', 'reserved_quantity')},
+)
+
+
 class StockQuantDetailSerializer(serializers.ModelSerializer):
     """Detailed serializer for StockQuant with product details"""
     
@@ -1,3 +1,99 @@
+import json
 from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from benchmarks.scenarios import load_scale
+from users.models import User
+from .models import Warehouse, Location, StockQuant
+from .serializers import StockQuantSerializer
 
-# Create your tests here.
+
+class ConditionalLocationListTests(TestCase):
+    """Unchanged master data lists are answered with 304 Not Modified"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='viewer', password='secret123', role='ADMIN')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, headers={'If-None-Match': response['ETag']})
+
+    def test_unchanged_list_is_not_modified(self):
+        first = self.client.get('/api/locations/')
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn('Last-Modified', first)
+        self.assertIn('no-cache', first['Cache-Control'])
+
+        with self.assertNumQueries(2):
+            second = self._revalidate('/api/locations/', first)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_changes_invalidate_the_etag(self):
+        first = self.client.get('/api/locations/')
+        Location.objects.order_by('id').first().save()
+        self.assertEqual(self._revalidate('/api/locations/', first).status_code, 200)
+
+    def test_related_changes_invalidate_the_etag(self):
+        first = self.client.get('/api/locations/')
+        warehouse = Warehouse.objects.order_by('id').first()
+        warehouse.name = 'Renamed'
+        warehouse.save()
+        self.assertEqual(self._revalidate('/api/locations/', first).status_code, 200)
+
+    def test_deletes_invalidate_the_etag(self):
+        warehouse = Warehouse.objects.order_by('id').first()
+        location = Location.objects.create(warehouse=warehouse, code='TMP', name='Temporary', location_type='BIN')
+        first = self.client.get('/api/warehouses/')
+        location.delete()
+        self.assertEqual(self._revalidate('/api/warehouses/', first).status_code, 200)
+
+    def test_if_modified_since_alone_is_not_answered(self):
+        # A delete leaves every updated_at as it was; only the ETag notices it
+        warehouse = Warehouse.objects.order_by('id').first()
+        location = Location.objects.create(warehouse=warehouse, code='TMP', name='Temporary', location_type='BIN')
+        self.client.get('/api/warehouses/')
+        location.delete()
+        response = self.client.get('/api/warehouses/', headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_filters_have_their_own_etag(self):
+        first = self.client.get('/api/locations/')
+        response = self._revalidate('/api/locations/?is_active=true', first)
+        self.assertEqual(response.status_code, 200)
+
+
+class StockQuantListFastPathTests(TestCase):
+    """The values-based stock quant list matches StockQuantSerializer exactly"""
+
+    @classmethod
+    def setUpTestData(cls):
+        load_scale('tiny')
+        cls.user = User.objects.create_user(username='viewer', password='secret123', role='ADMIN')
+
+    def test_rows_match_serializer(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertNumQueries(2):
+            rows = client.get('/api/stock-quants/').json()['results']
+        quants = StockQuant.objects.filter(id__in=[row['id'] for row in rows])
+        expected = json.loads(JSONRenderer().render(StockQuantSerializer(quants, many=True).data))
+        self.assertEqual(
+            sorted(rows, key=lambda row: row['id']), sorted(expected, key=lambda row: row['id'])
+        )
+
+    def test_fields_with_method_field_only(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/stock-quants/?fields=id,available_quantity')
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['results']
+        quants = StockQuant.objects.filter(id__in=[row['id'] for row in rows])
+        expected = {quant.id: float(quant.available_quantity()) for quant in quants}
+        self.assertEqual(list(rows[0]), ['id', 'available_quantity'])
+        self.assertEqual({row['id']: row['available_quantity'] for row in rows}, expected)
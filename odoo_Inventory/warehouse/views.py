@@ -1,13 +1,22 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from caching.responses import CachedListMixin
+from odoo_Inventory.conditional import ConditionalListMixin
+from odoo_Inventory.db_routers import ReplicaReadMixin
+from odoo_Inventory.fast_lists import ValuesListMixin
+from odoo_Inventory.fieldsets import SparseFieldsetMixin
+from products.models import Product
 from .models import Warehouse, Location, StockQuant
-from .serializers import WarehouseSerializer, LocationSerializer, StockQuantSerializer, StockQuantDetailSerializer
+from .serializers import (
+    WarehouseSerializer, LocationSerializer, StockQuantSerializer, StockQuantDetailSerializer, STOCK_QUANT_ROWS
+)
 
 
-class WarehouseViewSet(viewsets.ModelViewSet):
+class WarehouseViewSet(ConditionalListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Warehouse model"""
     
     queryset = Warehouse.objects.all()
+    conditional_models = (Warehouse, Location)
     serializer_class = WarehouseSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['is_active', 'city', 'state']
@@ -16,10 +25,12 @@ class WarehouseViewSet(viewsets.ModelViewSet):
     ordering = ['name']
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(ConditionalListMixin, CachedListMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for Location model"""
     
     queryset = Location.objects.select_related('warehouse').all()
+    conditional_models = (Location, Warehouse)
+    cache_models = (Location, Warehouse)
     serializer_class = LocationSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['warehouse', 'location_type', 'is_active']
@@ -28,10 +39,12 @@ class LocationViewSet(viewsets.ModelViewSet):
     ordering = ['warehouse', 'code']
 
 
-class StockQuantViewSet(viewsets.ReadOnlyModelViewSet):
+class StockQuantViewSet(ReplicaReadMixin, CachedListMixin, ValuesListMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for StockQuant model (read-only)"""
     
     queryset = StockQuant.objects.select_related('product', 'location', 'location__warehouse').all()
+    cache_models = (StockQuant, Product, Location, Warehouse)
+    values_mapper = STOCK_QUANT_ROWS
     serializer_class = StockQuantSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['product', 'location', 'location__warehouse']